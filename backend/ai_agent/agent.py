@@ -2,11 +2,14 @@ import json
 import re
 from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 import asyncio
 import requests
+import numpy as np
+
 from .ai_integration import get_ai_integration
+from .memory_index import MemoryIndex, embed
 
 # Simple text processing functions (no external dependencies)
 def simple_tokenize(text: str) -> List[str]:
@@ -52,6 +55,11 @@ class Memory:
     importance: float  # 0.0 to 1.0
     context: Dict[str, Any]
     memory_type: str  # "conversation", "fact", "preference", "action"
+    embedding: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.embedding is None:
+            self.embedding = embed(self.content)
 
 @dataclass
 class Tool:
@@ -75,6 +83,9 @@ class AIAgent:
         self.name = agent_name
         self.state = AgentState.IDLE
         self.memory: List[Memory] = []
+        # Embeddings of self.memory, row for row
+        self.memory_index = MemoryIndex()
+        self._indexed_memory: List[Memory] = self.memory
         self.tools: Dict[str, Tool] = {}
         self.conversation_history: List[Dict[str, Any]] = []
         self.context: Dict[str, Any] = {}
@@ -372,29 +383,26 @@ class AIAgent:
             context=context or {},
             memory_type=memory_type
         )
+        self._sync_memory_index()
         self.memory.append(memory)
+        self.memory_index.add(memory.embedding, memory.importance)
         
         # Keep only recent memories (last 100)
         if len(self.memory) > 100:
             self.memory = sorted(self.memory, key=lambda x: x.importance, reverse=True)[:50]
+            self._sync_memory_index()
+    
+    def _sync_memory_index(self):
+        """Rebuild the embedding matrix if the memory list was replaced or changed in place"""
+        if self._indexed_memory is self.memory and self.memory_index.size == len(self.memory):
+            return
+        self.memory_index.rebuild([m.embedding for m in self.memory], [m.importance for m in self.memory])
+        self._indexed_memory = self.memory
     
     def get_relevant_memories(self, query: str, limit: int = 5) -> List[Memory]:
-        """Get memories relevant to the current query"""
-        query_lower = query.lower()
-        relevant_memories = []
-        
-        for memory in self.memory:
-            relevance = 0
-            for word in query_lower.split():
-                if word in memory.content.lower():
-                    relevance += 1
-            
-            if relevance > 0:
-                relevant_memories.append((memory, relevance))
-        
-        # Sort by relevance and importance
-        relevant_memories.sort(key=lambda x: (x[1], x[0].importance), reverse=True)
-        return [memory for memory, _ in relevant_memories[:limit]]
+        """Get memories relevant to the current query, most similar (then most important) first"""
+        self._sync_memory_index()
+        return [self.memory[row] for row, _ in self.memory_index.search(embed(query), limit)]
     
     def add_reasoning_step(self, step_type: str, content: str, confidence: float = 0.8):
         """Add a reasoning step to the chain"""
@@ -1,15 +1,82 @@
 import os
-import requests
 import json
 import asyncio
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from cache import SingleFlight
+from config import settings
+from .code_templates import CodeTemplateRegistry, code_templates
+from .inference import InferenceClient, InferenceUnavailable
+from .intents import MIN_CONFIDENCE, load_intent_classifier
+
+# Classifier intent -> responder method
+INTENT_RESPONDERS = {
+    "greeting": "_generate_greeting_response",
+    "status": "_generate_status_response",
+    "capabilities": "_generate_capabilities_response",
+    "projects": "_generate_projects_response",
+    "technologies": "_generate_technologies_response",
+    "ml_demos": "_generate_ml_demos_response",
+    "contact": "_generate_contact_response",
+    "python_experience": "_generate_python_experience_response",
+    "data_science_work": "_generate_data_science_work_response",
+    "career_tech": "_generate_career_tech_response",
+    "learning_resources": "_generate_learning_resources_response",
+    "explanation": "_generate_explanation_response",
+    "comparison": "_generate_comparison_response",
+    "recommendation": "_generate_recommendation_response",
+    "reasoning": "_generate_reasoning_response",
+    "how_to": "_generate_how_to_response",
+    "example": "_generate_example_response",
+    "future": "_generate_future_response",
+    "ml": "_generate_ml_response",
+    "data_science": "_generate_data_science_response",
+    "web_dev": "_generate_web_dev_response",
+    "cloud_devops": "_generate_cloud_devops_response",
+    "career": "_generate_career_response",
+    "learning": "_generate_learning_response",
+    "contextual": "_generate_contextual_response",
+}
+
+# Conversation turns that can influence a response; older history is ignored
+CONTEXT_TURNS = 6
+
+def normalize_prompt(text: str) -> str:
+    """Case- and whitespace-insensitive form of a prompt"""
+    return " ".join(text.lower().split())
+
+def prompt_history(message: str, context: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The earlier turns a prompt is built from: the last CONTEXT_TURNS before ``message``"""
+    history = [turn for turn in (context or {}).get("conversation_history") or [] if isinstance(turn, dict)]
+    if history and history[-1].get("message") == message:
+        # The frontend may already have appended the message being answered
+        history.pop()
+    return history[-CONTEXT_TURNS:]
+
+def context_key(message: str, context: Optional[Dict[str, Any]]) -> tuple:
+    """The parts of a request context that change the answer to ``message``
+
+    History is taken from the same turns the prompt uses.  Session ids and
+    timestamps are left out so the same suggestion chip clicked in many
+    fresh sessions maps to one key.
+    """
+    if not context:
+        return ()
+    history = tuple(
+        (turn.get("sender"), normalize_prompt(str(turn.get("message", ""))))
+        for turn in prompt_history(message, context)
+    )
+    preferences = json.dumps(context.get("user_preferences") or {}, sort_keys=True, default=str)
+    return history, preferences
+
 class AIIntegration:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None,
+                 inference: Optional[InferenceClient] = None, templates: Optional[CodeTemplateRegistry] = None):
         """Initialize AI integration with enhanced knowledge base"""
         self.api_key = api_key or os.getenv("HUGGINGFACE_API_KEY")
-        self.base_url = "https://api-inference.huggingface.co/models"
+        self.base_url = settings.inference_base_url
+        self.model = model if model is not None else settings.inference_model
         
         # Headers for API requests
         self.headers = {
@@ -17,10 +84,36 @@ class AIIntegration:
         }
         if self.api_key:
             self.headers["Authorization"] = f"Bearer {self.api_key}"
+
+        # Code snippets indexed by language and keyword
+        self.templates = templates or code_templates
+
+        # Identical prompts arriving together share one in-flight generation
+        self._flight = SingleFlight()
+
+        # Shared pooled client; only used when a remote model is configured
+        self.inference = inference
+        if self.inference is None and self.model:
+            self.inference = InferenceClient(self.base_url, self.headers)
     
     async def generate_response(self, message: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Generate a dynamic response using AI or fallback to knowledge base"""
+        """Generate a dynamic response using AI or fallback to knowledge base
+
+        Concurrent calls with the same normalized message and context share
+        one computation; each caller gets its own copy of the result.
+        """
+        key = ("response", normalize_prompt(message), context_key(message, context))
+        result = await self._flight.do(key, lambda: self._compute_response(message, context))
+        return dict(result)
+
+    async def _compute_response(self, message: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         try:
+            # Remote model first when configured; failures and an open circuit fall through
+            if self.inference is not None and self.model:
+                remote_response = await self._generate_remote_response(message, context)
+                if remote_response:
+                    return remote_response
+
             # Try to generate a dynamic response first
             dynamic_response = await self._generate_dynamic_response(message, context)
             if dynamic_response:
@@ -32,104 +125,39 @@ class AIIntegration:
         except Exception as e:
             return self._fallback_response(message, f"Error: {str(e)}")
     
+    async def _generate_remote_response(self, message: str, context: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Ask the configured inference endpoint, or None when it is unavailable"""
+        turns = [f"{'Assistant' if turn.get('sender') == 'assistant' else 'User'}: {turn.get('message', '')}"
+                 for turn in prompt_history(message, context)]
+        prompt = "\n".join(turns + [f"User: {message}", "Assistant:"])
+        try:
+            text = await self.inference.generate(self.model, prompt, {"max_new_tokens": 256, "return_full_text": False})
+        except InferenceUnavailable:
+            return None
+        text = text.strip()
+        if not text:
+            return None
+        return {
+            "response": text,
+            "confidence": 0.85,
+            "category": self._categorize_response(text, message),
+            "model": self.model,
+            "timestamp": datetime.now().isoformat()
+        }
+
     async def _generate_dynamic_response(self, message: str, context: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
-        """Generate a dynamic response based on the message content"""
+        """Generate a dynamic response for the message's most likely intent"""
         try:
-            message_lower = message.lower()
-            
-            # Handle different types of requests dynamically
-            if any(word in message_lower for word in ["hello", "hi", "hey", "greetings"]):
-                return self._generate_greeting_response(message, context)
-            
-            elif any(word in message_lower for word in ["how are you", "how do you do", "how's it going"]):
-                return self._generate_status_response(message, context)
-            
-            elif any(word in message_lower for word in ["what can you do", "help", "capabilities", "features"]):
-                return self._generate_capabilities_response(message, context)
-            
-            # Handle specific suggested prompts (exact matches first) - MUST BE BEFORE GENERAL EXPLANATION
-            elif "tell me about your projects" in message_lower:
-                return self._generate_projects_response(message, context)
-            elif "tell me about your ai projects" in message_lower:
-                return self._generate_projects_response(message, context)
-            elif "what technologies do you use" in message_lower:
-                return self._generate_technologies_response(message, context)
-            elif "show me your machine learning demos" in message_lower:
-                return self._generate_ml_demos_response(message, context)
-            elif "how can i contact you" in message_lower:
-                return self._generate_contact_response(message, context)
-            elif "what's your experience with python" in message_lower:
-                return self._generate_python_experience_response(message, context)
-            elif "tell me about your data science work" in message_lower:
-                return self._generate_data_science_work_response(message, context)
-            elif "career advice for tech" in message_lower:
-                return self._generate_career_tech_response(message, context)
-            elif "learning resources" in message_lower:
-                return self._generate_learning_resources_response(message, context)
-            
-            # Handle partial matches
-            elif "ai projects" in message_lower:
-                return self._generate_projects_response(message, context)
-            elif "projects" in message_lower and "about" in message_lower:
-                return self._generate_projects_response(message, context)
-            elif "technologies" in message_lower and "use" in message_lower:
-                return self._generate_technologies_response(message, context)
-            elif "machine learning" in message_lower and "demos" in message_lower:
-                return self._generate_ml_demos_response(message, context)
-            elif "contact" in message_lower and "you" in message_lower:
-                return self._generate_contact_response(message, context)
-            elif "python" in message_lower and "experience" in message_lower:
-                return self._generate_python_experience_response(message, context)
-            elif "data science" in message_lower and "work" in message_lower:
-                return self._generate_data_science_work_response(message, context)
-            elif "career advice" in message_lower:
-                return self._generate_career_tech_response(message, context)
-            elif "resources" in message_lower and "learning" in message_lower:
-                return self._generate_learning_resources_response(message, context)
-            
-            # General explanation (must be AFTER specific patterns)
-            elif any(word in message_lower for word in ["explain", "what is", "tell me about", "describe"]):
-                return self._generate_explanation_response(message, context)
-            
-            elif any(word in message_lower for word in ["compare", "difference", "vs", "versus"]):
-                return self._generate_comparison_response(message, context)
-            
-            elif any(word in message_lower for word in ["recommend", "suggest", "best", "top"]):
-                return self._generate_recommendation_response(message, context)
-            
-            elif any(word in message_lower for word in ["why", "reason", "because"]):
-                return self._generate_reasoning_response(message, context)
-            
-            elif any(word in message_lower for word in ["how to", "steps", "process", "method"]):
-                return self._generate_how_to_response(message, context)
-            
-            elif any(word in message_lower for word in ["example", "sample", "instance"]):
-                return self._generate_example_response(message, context)
-            
-            elif any(word in message_lower for word in ["future", "trend", "upcoming", "next"]):
-                return self._generate_future_response(message, context)
-            
-            elif any(word in message_lower for word in ["machine learning", "ml", "neural network", "deep learning"]):
-                return self._generate_ml_response(message, context)
-            
-            elif any(word in message_lower for word in ["data science", "data analysis", "statistics", "pandas"]):
-                return self._generate_data_science_response(message, context)
-            
-            elif any(word in message_lower for word in ["web development", "frontend", "backend", "react", "api"]):
-                return self._generate_web_dev_response(message, context)
-            
-            elif any(word in message_lower for word in ["cloud", "devops", "docker", "aws", "deployment"]):
-                return self._generate_cloud_devops_response(message, context)
-            
-            elif any(word in message_lower for word in ["career", "job", "interview", "resume", "portfolio"]):
-                return self._generate_career_response(message, context)
-            
-            elif any(word in message_lower for word in ["learn", "study", "course", "tutorial", "book"]):
-                return self._generate_learning_response(message, context)
-            
-            else:
-                # Try to generate a contextual response based on conversation history
+            intent = (await load_intent_classifier()).classify(message)
+            if intent.confidence < MIN_CONFIDENCE:
+                # Nothing stands out; answer from the conversation so far
                 return self._generate_contextual_response(message, context)
+
+            responder = getattr(self, INTENT_RESPONDERS.get(intent.label, "_generate_contextual_response"))
+            response = responder(message, context)
+            response["intent"] = intent.label
+            response["confidence"] = round(intent.confidence, 3)
+            return response
                 
         except Exception as e:
             return None
@@ -784,117 +812,18 @@ What would you like to explore first?"""
         }
     
     async def generate_code(self, prompt: str, language: str = "python") -> Dict[str, Any]:
-        """Generate code using enhanced knowledge base"""
-        try:
-            # Enhanced code generation with knowledge base
-            code_examples = {
-                "python": {
-                    "fibonacci": """def fibonacci(n):
-    \"\"\"Calculate the nth Fibonacci number\"\"\"
-    if n <= 1:
-        return n
-    return fibonacci(n-1) + fibonacci(n-2)
-
-# Example usage
-print(fibonacci(10))  # Output: 55""",
-                    "sort": """def bubble_sort(arr):
-    \"\"\"Sort array using bubble sort algorithm\"\"\"
-    n = len(arr)
-    for i in range(n):
-        for j in range(0, n-i-1):
-            if arr[j] > arr[j+1]:
-                arr[j], arr[j+1] = arr[j+1], arr[j]
-    return arr
-
-# Example usage
-numbers = [64, 34, 25, 12, 22, 11, 90]
-sorted_numbers = bubble_sort(numbers)
-print(sorted_numbers)""",
-                    "ml": """import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error
-
-# Load data
-data = pd.read_csv('data.csv')
-X = data.drop('target', axis=1)
-y = data['target']
-
-# Split data
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2)
+        """Generate code using enhanced knowledge base, coalescing identical concurrent prompts"""
+        key = ("code", normalize_prompt(prompt), language.strip().lower())
+        result = await self._flight.do(key, lambda: self._compute_code(prompt, language))
+        return dict(result)
 
-# Train model
-model = LinearRegression()
-model.fit(X_train, y_train)
-
-# Make predictions
-predictions = model.predict(X_test)
-mse = mean_squared_error(y_test, predictions)
-print(f'Mean Squared Error: {mse}')""",
-                    "fastapi": """from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List
-
-app = FastAPI()
-
-class Item(BaseModel):
-    name: str
-    description: str
-    price: float
-
-items = []
-
-@app.get("/")
-async def root():
-    return {"message": "Hello World"}
-
-@app.get("/items/", response_model=List[Item])
-async def get_items():
-    return items
-
-@app.post("/items/")
-async def create_item(item: Item):
-    items.append(item)
-    return item"""
-                }
-            }
-            
-            # Find relevant code example
-            prompt_lower = prompt.lower()
-            if "fibonacci" in prompt_lower or "sequence" in prompt_lower:
-                code = code_examples["python"]["fibonacci"]
-            elif "sort" in prompt_lower or "bubble" in prompt_lower:
-                code = code_examples["python"]["sort"]
-            elif "machine learning" in prompt_lower or "ml" in prompt_lower or "model" in prompt_lower:
-                code = code_examples["python"]["ml"]
-            elif "fastapi" in prompt_lower or "api" in prompt_lower or "endpoint" in prompt_lower:
-                code = code_examples["python"]["fastapi"]
-            elif "hello" in prompt_lower or "world" in prompt_lower:
-                code = """def hello_world():
-    \"\"\"Simple hello world function\"\"\"
-    return "Hello, World!"
-
-print(hello_world())"""
-            elif "calculator" in prompt_lower or "math" in prompt_lower:
-                code = """def calculator(a, b, operation):
-    \"\"\"Simple calculator function\"\"\"
-    if operation == '+':
-        return a + b
-    elif operation == '-':
-        return a - b
-    elif operation == '*':
-        return a * b
-    elif operation == '/':
-        return a / b if b != 0 else "Error: Division by zero"
-    else:
-        return "Error: Invalid operation"
+    async def _compute_code(self, prompt: str, language: str = "python") -> Dict[str, Any]:
+        try:
+            template = self.templates.match(prompt, language)
+            if template is not None:
+                return {**template.payload, "language": language, "timestamp": datetime.now().isoformat()}
 
-# Example usage
-print(calculator(10, 5, '+'))  # Output: 15
-print(calculator(10, 5, '*'))  # Output: 50"""
-            else:
-                code = f"# {prompt}\n# Code generation for: {prompt}\n# Language: {language}\n\ndef example_function():\n    \"\"\"Example function for {prompt}\"\"\"\n    pass\n\n# Add your implementation here"
-            
+            code = f"# {prompt}\n# Code generation for: {prompt}\n# Language: {language}\n\ndef example_function():\n    \"\"\"Example function for {prompt}\"\"\"\n    pass\n\n# Add your implementation here"
             return {
                 "code": code,
                 "language": language,
@@ -913,10 +842,13 @@ print(calculator(10, 5, '*'))  # Output: 50"""
     
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about available models"""
+        models = {"enhanced-knowledge-base": "Enhanced knowledge base with intelligent responses"}
+        if self.inference is not None and self.model:
+            models[self.model] = f"Remote model at {self.base_url}"
         return {
-            "models": {
-                "enhanced-knowledge-base": "Enhanced knowledge base with intelligent responses"
-            },
+            "models": models,
+            "inference": self.inference.stats() if self.inference is not None else None,
+            "code_templates": self.templates.stats(),
             "capabilities": [
                 "Natural language conversation",
                 "Code generation and examples",
@@ -936,4 +868,9 @@ def get_ai_integration() -> AIIntegration:
     global ai_integration
     if ai_integration is None:
         ai_integration = AIIntegration()
-    return ai_integration 
\ No newline at end of file
+    return ai_integration 
+
+async def close_ai_integration():
+    """Close the pooled inference connections on shutdown"""
+    if ai_integration is not None and ai_integration.inference is not None:
+        await ai_integration.inference.aclose()
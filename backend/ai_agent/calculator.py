@@ -0,0 +1,84 @@
+import ast
+import math
+import operator
+from functools import lru_cache
+from typing import Union
+
+Number = Union[int, float]
+
+MAX_EXPRESSION_LENGTH = 256
+MAX_NODES = 64
+MAX_INT_BITS = 512  # roughly 150 decimal digits
+MAX_EXPONENT = 256
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+class ExpressionError(ValueError):
+    pass
+
+def _check(value: Number) -> Number:
+    if isinstance(value, int) and value.bit_length() > MAX_INT_BITS:
+        raise ExpressionError("Result too large")
+    if isinstance(value, float) and not math.isfinite(value):
+        raise ExpressionError("Result out of range")
+    return value
+
+def _power(base: Number, exponent: Number) -> Number:
+    if abs(exponent) > MAX_EXPONENT:
+        raise ExpressionError(f"Exponent larger than {MAX_EXPONENT}")
+    # Bound the result size before computing it, so 9**9**9 is rejected at once
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0:
+        if (abs(base).bit_length() - 1) * exponent > MAX_INT_BITS:
+            raise ExpressionError("Result too large")
+    result = base ** exponent
+    if isinstance(result, complex):
+        raise ExpressionError("Complex result")
+    return result
+
+def _evaluate(node: ast.AST) -> Number:
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return _check(node.value)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_evaluate(node.operand))
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        left, right = _evaluate(node.left), _evaluate(node.right)
+        if isinstance(node.op, ast.Pow):
+            return _check(_power(left, right))
+        if isinstance(node.op, ast.Mult) and isinstance(left, int) and isinstance(right, int):
+            if left.bit_length() + right.bit_length() > MAX_INT_BITS + 1:
+                raise ExpressionError("Result too large")
+        return _check(_BINARY_OPS[type(node.op)](left, right))
+    raise ExpressionError(f"Unsupported syntax: {type(node).__name__}")
+
+@lru_cache(maxsize=1024)
+def evaluate(expression: str) -> Number:
+    """Evaluate an arithmetic expression with bounded time and memory
+
+    Only numbers, parentheses, unary +/- and + - * / // % ** are accepted.
+    The parse tree is size-checked before evaluation and every intermediate
+    result is bounded, so hostile input fails fast instead of pinning a core.
+    Results are cached per expression string.
+    """
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError:
+        raise ExpressionError("Invalid expression") from None
+    if sum(1 for _ in ast.walk(tree)) > MAX_NODES:
+        raise ExpressionError(f"Expression has more than {MAX_NODES} terms")
+    try:
+        return _evaluate(tree.body)
+    except ZeroDivisionError:
+        raise ExpressionError("Division by zero") from None
+    except OverflowError:
+        raise ExpressionError("Result out of range") from None
@@ -0,0 +1,151 @@
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+
+from config import settings
+
+SNIPPETS_DIR = Path(__file__).resolve().parent / "snippets"
+DEFAULT_LANGUAGE = "python"
+DEFAULT_PRIORITY = 100
+MODEL_NAME = "enhanced-knowledge-base"
+
+_HEADER = re.compile(r"^#\s*(keywords|priority|name):\s*(.*)$")
+
+@dataclass
+class CodeTemplate:
+    """A code snippet served when any of its keywords appears in a prompt"""
+    name: str
+    language: str
+    keywords: Tuple[str, ...]
+    code: str
+    priority: int = DEFAULT_PRIORITY
+    payload: Dict[str, Any] = field(init=False)
+
+    def __post_init__(self):
+        self.payload = {"code": self.code, "language": self.language, "model": MODEL_NAME}
+
+def parse_template(path: Path, language: str) -> CodeTemplate:
+    """Read a snippet file whose leading ``# keywords:`` / ``# priority:`` comments describe it"""
+    meta = {"name": path.stem}
+    lines = path.read_text(encoding="utf-8").splitlines()
+    body_start = 0
+    for body_start, line in enumerate(lines):
+        match = _HEADER.match(line)
+        if not match:
+            break
+        meta[match.group(1)] = match.group(2).strip()
+    else:
+        body_start = len(lines)
+    while body_start < len(lines) and not lines[body_start].strip():
+        body_start += 1
+    keywords = tuple(k.strip().lower() for k in meta.get("keywords", path.stem).split(",") if k.strip())
+    return CodeTemplate(
+        name=meta["name"],
+        language=language,
+        keywords=keywords,
+        code="\n".join(lines[body_start:]).rstrip("\n"),
+        priority=int(meta.get("priority", DEFAULT_PRIORITY)),
+    )
+
+class _LanguageIndex:
+    """Keyword -> template map plus one regex that finds every keyword occurrence in a single pass"""
+
+    def __init__(self, templates: Iterable[CodeTemplate]):
+        self.by_keyword: Dict[str, CodeTemplate] = {}
+        for template in sorted(templates, key=lambda t: t.priority, reverse=True):
+            for keyword in template.keywords:
+                self.by_keyword[keyword] = template
+        # Alternatives in precedence order, inside a lookahead so overlapping matches are all seen
+        ordered = sorted(self.by_keyword, key=lambda k: (self.by_keyword[k].priority, -len(k)))
+        self.pattern: Optional[Pattern] = (
+            re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))") if ordered else None
+        )
+
+    def match(self, prompt_lower: str) -> Optional[CodeTemplate]:
+        if self.pattern is None:
+            return None
+        best = None
+        for match in self.pattern.finditer(prompt_lower):
+            template = self.by_keyword[match.group(1)]
+            if best is None or template.priority < best.priority:
+                best = template
+        return best
+
+class CodeTemplateRegistry:
+    """Code snippets indexed by language and keyword, loaded once
+
+    A prompt is matched against every keyword of its language in one regex
+    pass; when several templates match, the lowest ``priority`` wins.  The
+    response payload of each template is built when it is registered, and
+    ``hits`` counts how often each one is served.
+    """
+
+    def __init__(self, templates: Iterable[CodeTemplate] = ()):
+        self.templates: Dict[Tuple[str, str], CodeTemplate] = {}
+        self.languages: set = set()
+        self._indexes: Dict[str, _LanguageIndex] = {}
+        self.hits: Counter = Counter()
+        self.misses = 0
+        for template in templates:
+            self.add(template)
+
+    @classmethod
+    def load(cls, *directories: Path) -> "CodeTemplateRegistry":
+        """Templates from ``directories`` (one sub-directory per language), later ones overriding"""
+        registry = cls()
+        for directory in directories:
+            registry.add_directory(directory)
+        return registry
+
+    def add(self, template: CodeTemplate):
+        self.templates[(template.language, template.name)] = template
+        self.languages.add(template.language)
+        self._indexes.pop(template.language, None)
+
+    def add_directory(self, directory: Path):
+        directory = Path(directory)
+        if not directory.is_dir():
+            return
+        for language_dir in sorted(p for p in directory.iterdir() if p.is_dir()):
+            for path in sorted(language_dir.iterdir()):
+                if path.is_file() and not path.name.startswith("."):
+                    self.add(parse_template(path, language_dir.name.lower()))
+
+    def _index(self, language: str) -> _LanguageIndex:
+        index = self._indexes.get(language)
+        if index is None:
+            index = self._indexes[language] = _LanguageIndex(
+                t for (lang, _), t in self.templates.items() if lang == language
+            )
+        return index
+
+    def match(self, prompt: str, language: str = DEFAULT_LANGUAGE) -> Optional[CodeTemplate]:
+        """Best template for the prompt; languages without templates use the default language's"""
+        language = language.strip().lower()
+        if language not in self.languages:
+            language = DEFAULT_LANGUAGE
+        template = self._index(language).match(prompt.lower())
+        if template is None:
+            self.misses += 1
+        else:
+            self.hits[(template.language, template.name)] += 1
+        return template
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        return {
+            "templates": len(self.templates),
+            "misses": self.misses,
+            "most_used": [
+                {"language": language, "name": name, "hits": hits}
+                for (language, name), hits in self.hits.most_common(top)
+            ],
+        }
+
+def _template_dirs() -> List[Path]:
+    extra = settings.code_templates_dir
+    return [SNIPPETS_DIR] + ([Path(extra)] if extra else [])
+
+# Global registry, loaded once at import
+code_templates = CodeTemplateRegistry.load(*_template_dirs())
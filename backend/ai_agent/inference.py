@@ -0,0 +1,164 @@
+import asyncio
+import random
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from config import settings
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class InferenceUnavailable(Exception):
+    """The remote model could not answer; callers fall back to the local responders"""
+
+class CircuitBreaker:
+    """Stops calling a failing dependency for ``reset_timeout`` seconds
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    calls are refused at once.  Once the timeout passes a single trial call
+    is let through (half-open): success closes the breaker, failure reopens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._clock() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.trial_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = self._clock()
+        self.trial_in_flight = False
+
+    def release(self):
+        """Give up a trial slot without recording an outcome (e.g. the call was cancelled)"""
+        self.trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures, "rejected": self.rejected}
+
+class InferenceClient:
+    """Pooled async client for a Hugging Face style text-generation endpoint
+
+    One ``httpx.AsyncClient`` per event loop keeps connections alive between
+    calls.  Transport and other httpx errors, timeouts, 429 and 5xx responses
+    are retried with exponential backoff and full jitter; a success whose body
+    is not JSON is not.  Every call goes through a circuit breaker so a dead
+    endpoint costs nothing while it is open.
+    """
+
+    def __init__(self, base_url: str, headers: Optional[Dict[str, str]] = None,
+                 connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None,
+                 retries: Optional[int] = None, backoff: float = 0.2, max_backoff: float = 2.0,
+                 max_connections: Optional[int] = None, breaker: Optional[CircuitBreaker] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = base_url.rstrip("/")
+        self.headers = headers or {}
+        self.timeout = httpx.Timeout(
+            read_timeout if read_timeout is not None else settings.inference_read_timeout,
+            connect=connect_timeout if connect_timeout is not None else settings.inference_connect_timeout,
+        )
+        self.retries = retries if retries is not None else settings.inference_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        connections = max_connections or settings.inference_max_connections
+        self.limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections,
+                                   keepalive_expiry=30)
+        self.breaker = breaker or CircuitBreaker(settings.inference_breaker_failures,
+                                                 settings.inference_breaker_reset_seconds)
+        self.transport = transport
+        self.requests = 0
+        self.retried = 0
+        self._loop_client: Tuple[Any, Optional[httpx.AsyncClient]] = (None, None)
+
+    def _client(self) -> httpx.AsyncClient:
+        # Pooled connections belong to the loop that opened them
+        loop = asyncio.get_running_loop()
+        if self._loop_client[0] is not loop:
+            client = httpx.AsyncClient(base_url=self.base_url, headers=self.headers, timeout=self.timeout,
+                                       limits=self.limits, transport=self.transport)
+            self._loop_client = (loop, client)
+        return self._loop_client[1]
+
+    def _delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Any:
+        client = self._client()
+        for attempt in range(self.retries + 1):
+            self.requests += 1
+            try:
+                response = await client.post(path, json=payload)
+            except httpx.HTTPError as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if response.status_code < 400:
+                    try:
+                        return response.json()
+                    except ValueError:
+                        raise InferenceUnavailable("Invalid JSON") from None
+                error = f"HTTP {response.status_code}"
+                if response.status_code not in RETRY_STATUS_CODES:
+                    break
+            if attempt < self.retries:
+                self.retried += 1
+                await asyncio.sleep(self._delay(attempt))
+        raise InferenceUnavailable(error)
+
+    async def generate(self, model: str, inputs: str, parameters: Optional[Dict[str, Any]] = None) -> str:
+        """Generated text for ``inputs``; raises InferenceUnavailable when the model cannot answer"""
+        if not self.breaker.allow():
+            raise InferenceUnavailable("Circuit open")
+        try:
+            data = await self._post(f"/{model}", {"inputs": inputs, "parameters": parameters or {}})
+            if isinstance(data, list) and data:
+                data = data[0]
+            text = data.get("generated_text") if isinstance(data, dict) else None
+            if not isinstance(text, str):
+                raise InferenceUnavailable("Unexpected response shape")
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return text
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "retried": self.retried, "breaker": self.breaker.stats()}
+
+    async def aclose(self):
+        loop, client = self._loop_client
+        if client is not None and loop is asyncio.get_running_loop():
+            await client.aclose()
+        self._loop_client = (None, None)
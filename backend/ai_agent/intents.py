@@ -0,0 +1,166 @@
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+EXAMPLES_PATH = DATA_DIR / "intents.json"
+WEIGHTS_PATH = DATA_DIR / "intent_weights.npz"
+
+N_FEATURES = 1 << 12
+CHAR_NGRAM = 3
+# Below this calibrated probability a message gets the contextual fallback
+MIN_CONFIDENCE = 0.4
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+@dataclass
+class Intent:
+    label: str
+    confidence: float
+
+def _bucket(feature: str) -> int:
+    # crc32 rather than hash(): bucket ids must be stable across processes
+    return zlib.crc32(feature.encode("utf-8")) & (N_FEATURES - 1)
+
+def features(text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Hashed word unigrams, word bigrams and in-word character trigrams, L2-normalized"""
+    words = _WORD.findall(text.lower())
+    grams = [f"w:{w}" for w in words]
+    grams += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f"<{word}>"
+        grams += [f"c:{padded[i:i + CHAR_NGRAM]}" for i in range(len(padded) - CHAR_NGRAM + 1)]
+    if not grams:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    indices, counts = np.unique(np.fromiter((_bucket(g) for g in grams), dtype=np.int64, count=len(grams)),
+                                return_counts=True)
+    values = 1.0 + np.log(counts.astype(np.float32))
+    return indices, values / np.linalg.norm(values)
+
+def vectorize(texts: Sequence[str]) -> np.ndarray:
+    """Dense (len(texts), N_FEATURES) feature matrix"""
+    matrix = np.zeros((len(texts), N_FEATURES), dtype=np.float32)
+    for row, text in enumerate(texts):
+        indices, values = features(text)
+        matrix[row, indices] = values
+    return matrix
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    scores = scores - scores.max(axis=-1, keepdims=True)
+    exp = np.exp(scores)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+def _fit(X: np.ndarray, y: np.ndarray, n_classes: int, epochs: int = 300, lr: float = 2.0,
+         l2: float = 1e-4) -> Tuple[np.ndarray, np.ndarray]:
+    """Multinomial logistic regression by full-batch gradient descent"""
+    weights = np.zeros((n_classes, X.shape[1]), dtype=np.float32)
+    bias = np.zeros(n_classes, dtype=np.float32)
+    targets = np.eye(n_classes, dtype=np.float32)[y]
+    for _ in range(epochs):
+        error = (_softmax(X @ weights.T + bias) - targets) / len(X)
+        weights -= lr * (error.T @ X + l2 * weights)
+        bias -= lr * error.sum(axis=0)
+    return weights, bias
+
+def _fit_temperature(logits: np.ndarray, y: np.ndarray) -> float:
+    """Temperature minimizing the negative log-likelihood of held-out predictions"""
+    best, best_nll = 1.0, np.inf
+    for temperature in np.geomspace(0.05, 10, 120):
+        probs = _softmax(logits / temperature)
+        nll = -np.log(probs[np.arange(len(y)), y] + 1e-12).mean()
+        if nll < best_nll:
+            best, best_nll = float(temperature), nll
+    return best
+
+def examples_digest(examples: Dict[str, List[str]]) -> str:
+    return hashlib.sha256(json.dumps(examples, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+class IntentClassifier:
+    """Linear intent model over hashed n-grams
+
+    Scoring a message is one product of the (intents x features) weight
+    matrix with its sparse feature vector; a batch is one matrix product.
+    Probabilities are temperature-scaled so that confidence tracks accuracy
+    on examples held out during training.
+    """
+
+    def __init__(self, labels: Sequence[str], weights: np.ndarray, bias: np.ndarray,
+                 temperature: float = 1.0, digest: str = ""):
+        self.labels = list(labels)
+        self.weights = np.ascontiguousarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.temperature = temperature
+        self.digest = digest
+
+    @classmethod
+    def train(cls, examples: Dict[str, List[str]], holdout_every: int = 4) -> "IntentClassifier":
+        labels = sorted(examples)
+        texts = [text for label in labels for text in examples[label]]
+        y = np.array([i for i, label in enumerate(labels) for _ in examples[label]])
+        X = vectorize(texts)
+
+        # Calibrate the temperature on every holdout_every-th example, then refit on everything
+        held_out = np.arange(len(texts)) % holdout_every == 0
+        weights, bias = _fit(X[~held_out], y[~held_out], len(labels))
+        temperature = _fit_temperature(X[held_out] @ weights.T + bias, y[held_out])
+        weights, bias = _fit(X, y, len(labels))
+        return cls(labels, weights, bias, temperature, examples_digest(examples))
+
+    @classmethod
+    def load(cls, path: Path = WEIGHTS_PATH, examples_path: Path = EXAMPLES_PATH) -> "IntentClassifier":
+        """Stored weights, or a model trained now if they are missing or older than the examples"""
+        examples = json.loads(Path(examples_path).read_text(encoding="utf-8"))
+        if Path(path).exists():
+            with np.load(path) as data:
+                if int(data["n_features"]) == N_FEATURES and str(data["digest"]) == examples_digest(examples):
+                    return cls(data["labels"].tolist(), data["weights"], data["bias"],
+                               float(data["temperature"]), str(data["digest"]))
+        return cls.train(examples)
+
+    def save(self, path: Path = WEIGHTS_PATH):
+        np.savez_compressed(
+            path, labels=np.array(self.labels), weights=self.weights.astype(np.float16), bias=self.bias,
+            temperature=np.float32(self.temperature), n_features=N_FEATURES, digest=np.array(self.digest),
+        )
+
+    def probabilities(self, message: str) -> np.ndarray:
+        indices, values = features(message)
+        return _softmax((self.weights[:, indices] @ values + self.bias) / self.temperature)
+
+    def classify(self, message: str) -> Intent:
+        probs = self.probabilities(message)
+        best = int(probs.argmax())
+        return Intent(self.labels[best], float(probs[best]))
+
+    def classify_batch(self, messages: Sequence[str]) -> List[Intent]:
+        if not messages:
+            return []
+        probs = _softmax((vectorize(messages) @ self.weights.T + self.bias) / self.temperature)
+        best = probs.argmax(axis=1)
+        return [Intent(self.labels[i], float(probs[row, i])) for row, i in enumerate(best)]
+
+_classifier: Optional[IntentClassifier] = None
+_classifier_lock = threading.Lock()
+
+def get_intent_classifier() -> IntentClassifier:
+    """Shared classifier, loaded on first use; blocks while stale weights are retrained"""
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                _classifier = IntentClassifier.load()
+    return _classifier
+
+async def load_intent_classifier() -> IntentClassifier:
+    """Shared classifier, loaded (or retrained) in a worker thread so the event loop keeps serving"""
+    if _classifier is not None:
+        return _classifier
+    return await asyncio.to_thread(get_intent_classifier)
@@ -0,0 +1,110 @@
+import os
+import re
+import tempfile
+import weakref
+import zlib
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import settings
+
+EMBEDDING_DIM = 256
+CHAR_NGRAM = 3
+# Memories less similar than this to the query are not recalled
+MIN_SIMILARITY = 0.2
+# Ranking nudge so that, at equal similarity, important memories come first
+IMPORTANCE_WEIGHT = 0.1
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+def embed(text: str) -> np.ndarray:
+    """Unit-length signed hashed embedding of a text's words and character trigrams
+
+    Paraphrases and inflections ("deploying" / "deployment") share most of
+    their trigrams, so they land close together without any trained model.
+    """
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    words = _WORD.findall(text.lower())
+    grams = [f"w:{word}" for word in words]
+    for word in words:
+        padded = f"<{word}>"
+        grams += [padded[i:i + CHAR_NGRAM] for i in range(len(padded) - CHAR_NGRAM + 1)]
+    for gram in grams:
+        h = zlib.crc32(gram.encode("utf-8"))
+        vector[h % EMBEDDING_DIM] += 1.0 if h & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+def _remove(path: str):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+class MemoryIndex:
+    """Contiguous (capacity x EMBEDDING_DIM) matrix of memory embeddings, one row per memory
+
+    Rows are kept in the same order as the agent's memory list.  With
+    ``mmap_dir`` set the matrix is an ``np.memmap`` file there (for example on
+    /dev/shm), so the embeddings of many resident agents live in the page
+    cache rather than on the Python heap; the file is removed with the index.
+    """
+
+    def __init__(self, capacity: int = 16, mmap_dir: Optional[str] = None):
+        self.size = 0
+        self.mmap_dir = mmap_dir if mmap_dir is not None else settings.agent_memory_mmap_dir
+        self.path: Optional[str] = None
+        if self.mmap_dir:
+            Path(self.mmap_dir).mkdir(parents=True, exist_ok=True)
+            fd, self.path = tempfile.mkstemp(prefix="agent-memory-", suffix=".f32", dir=self.mmap_dir)
+            os.close(fd)
+            weakref.finalize(self, _remove, self.path)
+        self.vectors = self._allocate(max(1, capacity))
+        self.importance = np.zeros(len(self.vectors), dtype=np.float32)
+
+    def _allocate(self, capacity: int) -> np.ndarray:
+        if self.path is None:
+            return np.zeros((capacity, EMBEDDING_DIM), dtype=np.float32)
+        return np.memmap(self.path, dtype=np.float32, mode="w+", shape=(capacity, EMBEDDING_DIM))
+
+    def _grow(self, needed: int):
+        capacity = len(self.vectors)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        # Copy out first: re-creating a memmap truncates the file under the old mapping
+        vectors = np.array(self.vectors[:self.size])
+        self.vectors = self._allocate(capacity)
+        self.vectors[:self.size] = vectors
+        importance = np.zeros(capacity, dtype=np.float32)
+        importance[:self.size] = self.importance[:self.size]
+        self.importance = importance
+
+    def add(self, vector: np.ndarray, importance: float):
+        self._grow(self.size + 1)
+        self.vectors[self.size] = vector
+        self.importance[self.size] = importance
+        self.size += 1
+
+    def rebuild(self, vectors: Sequence[np.ndarray], importance: Sequence[float]):
+        """Replace every row, e.g. after the memory list was trimmed or reassigned"""
+        self.size = 0
+        self._grow(len(vectors))
+        if len(vectors):
+            self.vectors[:len(vectors)] = np.stack(vectors)
+            self.importance[:len(vectors)] = importance
+        self.size = len(vectors)
+
+    def search(self, query: np.ndarray, k: int, min_similarity: float = MIN_SIMILARITY) -> List[Tuple[int, float]]:
+        """Top ``k`` rows as (row, similarity): one matrix-vector product plus argpartition"""
+        if self.size == 0 or k <= 0:
+            return []
+        similarity = self.vectors[:self.size] @ query
+        scores = np.where(similarity >= min_similarity, similarity + IMPORTANCE_WEIGHT * self.importance[:self.size], -np.inf)
+        k = min(k, self.size)
+        top = np.argpartition(-scores, k - 1)[:k] if k < self.size else np.arange(self.size)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(row), float(similarity[row])) for row in top if np.isfinite(scores[row])]
@@ -0,0 +1,30 @@
+"""Local stand-in for the Hugging Face inference API
+
+    uvicorn ai_agent.mock_inference:app --port 8001
+    INFERENCE_BASE_URL=http://127.0.0.1:8001 INFERENCE_MODEL=mock uvicorn main:app
+
+Tests mount it in-process with ``httpx.ASGITransport(app=create_mock_inference_app(...))``.
+"""
+import asyncio
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+def create_mock_inference_app(fail_first: int = 0, status_code: int = 503, delay: float = 0.0) -> FastAPI:
+    """Echoing text-generation server; the first ``fail_first`` requests get ``status_code``"""
+    app = FastAPI()
+    app.state.requests = 0
+
+    @app.post("/{model:path}")
+    async def generate(model: str, request: Request):
+        app.state.requests += 1
+        if delay:
+            await asyncio.sleep(delay)
+        if app.state.requests <= fail_first:
+            return JSONResponse({"error": "Model is currently loading"}, status_code=status_code)
+        payload = await request.json()
+        return [{"generated_text": f"[{model}] {payload['inputs']}"}]
+
+    return app
+
+app = create_mock_inference_app()
@@ -0,0 +1,19 @@
+# keywords: calculator, math
+# priority: 60
+
+def calculator(a, b, operation):
+    """Simple calculator function"""
+    if operation == '+':
+        return a + b
+    elif operation == '-':
+        return a - b
+    elif operation == '*':
+        return a * b
+    elif operation == '/':
+        return a / b if b != 0 else "Error: Division by zero"
+    else:
+        return "Error: Invalid operation"
+
+# Example usage
+print(calculator(10, 5, '+'))  # Output: 15
+print(calculator(10, 5, '*'))  # Output: 50
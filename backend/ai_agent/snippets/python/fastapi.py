@@ -0,0 +1,28 @@
+# keywords: fastapi, api, endpoint
+# priority: 40
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+from typing import List
+
+app = FastAPI()
+
+class Item(BaseModel):
+    name: str
+    description: str
+    price: float
+
+items = []
+
+@app.get("/")
+async def root():
+    return {"message": "Hello World"}
+
+@app.get("/items/", response_model=List[Item])
+async def get_items():
+    return items
+
+@app.post("/items/")
+async def create_item(item: Item):
+    items.append(item)
+    return item
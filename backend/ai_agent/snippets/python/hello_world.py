@@ -0,0 +1,8 @@
+# keywords: hello, world
+# priority: 50
+
+def hello_world():
+    """Simple hello world function"""
+    return "Hello, World!"
+
+print(hello_world())
@@ -0,0 +1,16 @@
+# keywords: sort, bubble
+# priority: 20
+
+def bubble_sort(arr):
+    """Sort array using bubble sort algorithm"""
+    n = len(arr)
+    for i in range(n):
+        for j in range(0, n-i-1):
+            if arr[j] > arr[j+1]:
+                arr[j], arr[j+1] = arr[j+1], arr[j]
+    return arr
+
+# Example usage
+numbers = [64, 34, 25, 12, 22, 11, 90]
+sorted_numbers = bubble_sort(numbers)
+print(sorted_numbers)
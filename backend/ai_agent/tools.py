@@ -1,23 +1,143 @@
+import asyncio
+import functools
+import inspect
 import requests
 import json
-from typing import Dict, Any, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import re
 
+from .calculator import evaluate
+from cache import SingleFlight, TTLCache
+from config import settings
+from metrics import LatencyHistogram
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+def _thread_pool() -> ThreadPoolExecutor:
+    """Shared bounded pool for sync tools, so they never block the event loop"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.tool_thread_pool_size, thread_name_prefix="tool")
+    return _executor
+
+class ToolTimeout(Exception):
+    pass
+
+class Tool:
+    """A registered tool with its own timeout, concurrency cap, result cache and latency metrics"""
+
+    def __init__(self, name: str, function: callable, description: str, parameters: Dict[str, Any],
+                 is_async: Optional[bool] = None, timeout: Optional[float] = None,
+                 max_concurrency: int = 4, cache_ttl: float = 0):
+        self.name = name
+        self.function = function
+        self.description = description
+        self.parameters = parameters
+        self.is_async = inspect.iscoroutinefunction(function) if is_async is None else is_async
+        self.timeout = timeout if timeout is not None else settings.tool_timeout_seconds
+        self.max_concurrency = max_concurrency
+        self.cache = TTLCache(cache_ttl) if cache_ttl > 0 else None
+        self.latency = LatencyHistogram()
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self._flight = SingleFlight()
+        self._loop_semaphore: Tuple[Any, Optional[asyncio.Semaphore]] = (None, None)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # One semaphore per event loop; a semaphore bound to a finished loop cannot be reused
+        loop = asyncio.get_running_loop()
+        if self._loop_semaphore[0] is not loop:
+            self._loop_semaphore = (loop, asyncio.Semaphore(self.max_concurrency))
+        return self._loop_semaphore[1]
+
+    async def _run(self, kwargs: Dict[str, Any]) -> Any:
+        semaphore = self._semaphore()
+        await semaphore.acquire()
+        self.in_flight += 1
+        start = time.perf_counter()
+        if self.is_async:
+            future = asyncio.ensure_future(self.function(**kwargs))
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(_thread_pool(), functools.partial(self.function, **kwargs))
+        # The slot is held until the call really ends: a timed-out thread keeps running
+        future.add_done_callback(functools.partial(self._finished, semaphore, start))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Coroutines can be stopped on timeout; threads cannot, so their future is left to finish
+            if self.is_async:
+                future.cancel()
+            raise
+
+    def _finished(self, semaphore: asyncio.Semaphore, start: float, future: asyncio.Future):
+        semaphore.release()
+        self.in_flight -= 1
+        self.latency.record_seconds(time.perf_counter() - start)
+        if not future.cancelled():
+            # Retrieved so an error from a call nobody waits for any more is not logged as unhandled
+            future.exception()
+
+    async def _call(self, kwargs: Dict[str, Any]) -> Any:
+        self.calls += 1
+        try:
+            # The timeout covers waiting for a concurrency slot as well as the call itself
+            return await asyncio.wait_for(self._run(kwargs), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise ToolTimeout(f"Tool '{self.name}' timed out after {self.timeout}s") from None
+        except Exception:
+            self.errors += 1
+            raise
+
+    async def execute(self, **kwargs) -> Any:
+        """Run the tool, serving repeat calls from the result cache while they are fresh"""
+        if self.cache is None:
+            return await self._call(kwargs)
+        key = json.dumps(kwargs, sort_keys=True, default=str)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        result = await self._flight.do(key, lambda: self._call(kwargs))
+        if not (isinstance(result, dict) and "error" in result):
+            self.cache.put(key, result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "async": self.is_async,
+            "timeout_seconds": self.timeout,
+            "max_concurrency": self.max_concurrency,
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "in_flight": self.in_flight,
+            "latency": self.latency.summary(),
+            "cache": self.cache.stats() if self.cache else None,
+        }
+
 class ToolRegistry:
     """Registry for AI agent tools"""
     
     def __init__(self):
-        self.tools = {}
+        self.tools: Dict[str, Tool] = {}
         self._register_default_tools()
     
-    def register_tool(self, name: str, function: callable, description: str, parameters: Dict[str, Any]):
-        """Register a new tool"""
-        self.tools[name] = {
-            "function": function,
-            "description": description,
-            "parameters": parameters
-        }
+    def register_tool(self, name: str, function: callable, description: str, parameters: Dict[str, Any],
+                      **options) -> Tool:
+        """Register a new tool
+
+        ``options`` are passed to :class:`Tool`: ``is_async`` (detected from the
+        function by default), ``timeout``, ``max_concurrency`` and ``cache_ttl``.
+        """
+        tool = self.tools[name] = Tool(name, function, description, parameters, **options)
+        return tool
     
     def get_tool(self, name: str):
         """Get a tool by name"""
@@ -82,12 +202,12 @@ class ToolRegistry:
         def calculate(expression: str) -> Dict[str, Any]:
             """Evaluate mathematical expressions"""
             try:
-                # Safe evaluation of mathematical expressions
+                # Cheap pre-check; the evaluator itself only accepts arithmetic on numbers
                 allowed_chars = set('0123456789+-*/(). ')
                 if not all(c in allowed_chars for c in expression):
                     return {"error": "Invalid characters in expression"}
                 
-                result = eval(expression)
+                result = evaluate(expression)
                 return {
                     "expression": expression,
                     "result": result,
@@ -130,14 +250,16 @@ class ToolRegistry:
             "get_weather",
             get_weather,
             "Get weather information for a city",
-            {"city": "string"}
+            {"city": "string"},
+            cache_ttl=600
         )
         
         self.register_tool(
             "get_news",
             get_news,
             "Get latest news on a topic",
-            {"topic": "string", "limit": "integer"}
+            {"topic": "string", "limit": "integer"},
+            cache_ttl=300
         )
         
         self.register_tool(
@@ -164,15 +286,16 @@ class ToolRegistry:
 # Global tool registry
 tool_registry = ToolRegistry()
 
-def execute_tool(tool_name: str, **kwargs) -> Dict[str, Any]:
+async def execute_tool(tool_name: str, **kwargs) -> Dict[str, Any]:
     """Execute a tool by name with given parameters"""
     tool = tool_registry.get_tool(tool_name)
     if not tool:
         return {"error": f"Tool '{tool_name}' not found"}
     
     try:
-        result = tool["function"](**kwargs)
-        return result
+        return await tool.execute(**kwargs)
+    except ToolTimeout as e:
+        return {"error": str(e)}
     except Exception as e:
         return {"error": f"Tool execution error: {str(e)}"}
 
@@ -182,7 +305,11 @@ def get_available_tools() -> List[Dict[str, Any]]:
     for name, tool in tool_registry.tools.items():
         tools.append({
             "name": name,
-            "description": tool["description"],
-            "parameters": tool["parameters"]
+            "description": tool.description,
+            "parameters": tool.parameters
         })
-    return tools 
\ No newline at end of file
+    return tools
+
+def get_tool_metrics() -> List[Dict[str, Any]]:
+    """Per-tool call counts, latency percentiles and cache counters"""
+    return [tool.stats() for tool in tool_registry.tools.values()]
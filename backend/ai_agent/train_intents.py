@@ -0,0 +1,33 @@
+"""Train the chatbot intent classifier from ai_agent/data/intents.json
+
+    python -m ai_agent.train_intents
+
+Writes ai_agent/data/intent_weights.npz.  Run it after editing the examples;
+until then the app notices the stale weights and retrains in memory on every
+boot, in a worker thread started with the app.
+"""
+import argparse
+import json
+from pathlib import Path
+
+from ai_agent.intents import EXAMPLES_PATH, WEIGHTS_PATH, IntentClassifier
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the chatbot intent classifier")
+    parser.add_argument("--examples", default=str(EXAMPLES_PATH))
+    parser.add_argument("--output", default=str(WEIGHTS_PATH))
+    args = parser.parse_args()
+
+    examples = json.loads(Path(args.examples).read_text(encoding="utf-8"))
+    classifier = IntentClassifier.train(examples)
+    texts = [text for label in examples for text in examples[label]]
+    predicted = classifier.classify_batch(texts)
+    expected = [label for label in examples for _ in examples[label]]
+    accuracy = sum(p.label == e for p, e in zip(predicted, expected)) / len(expected)
+
+    classifier.save(Path(args.output))
+    print(f"{len(classifier.labels)} intents, {len(texts)} examples, training accuracy {accuracy:.3f}, "
+          f"temperature {classifier.temperature:.3f} -> {args.output}")
+
+if __name__ == "__main__":
+    main()
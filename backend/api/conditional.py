@@ -0,0 +1,88 @@
+import hashlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+from repositories.pagination import as_utc
+from serialization import dumps
+
+# Cache-Control policies for read-mostly routes
+CACHE_SHORT = "public, max-age=60, stale-while-revalidate=300"
+CACHE_STATIC = "public, max-age=3600, stale-while-revalidate=86400"
+
+# Rendered bodies by ETag, so repeat 200s for unchanged content skip serialization
+_rendered: "OrderedDict[str, bytes]" = OrderedDict()
+_RENDERED_MAX = 256
+
+def _encode(content: Any) -> bytes:
+    return dumps(content)
+
+def content_etag(*parts: Any) -> str:
+    """Strong ETag derived from a content version (or the content itself) and any variant keys"""
+    digest = hashlib.sha256(_encode(parts)).hexdigest()[:32]
+    return f'"{digest}"'
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison function (RFC 9110 13.1.2)
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+def _not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # asctime dates and the -0000 zone parse as naive; HTTP dates are always GMT
+        return _to_utc(last_modified).replace(microsecond=0) <= as_utc(since)
+    return False
+
+def _to_utc(value: datetime) -> datetime:
+    return as_utc(value).astimezone(timezone.utc)
+
+def _validator_headers(etag: str, last_modified: Optional[datetime], cache_control: str,
+                       headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    headers = {**(headers or {}), "ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_to_utc(last_modified), usegmt=True)
+    return headers
+
+def not_modified_response(request: Request, etag: str, last_modified: Optional[datetime] = None,
+                          cache_control: str = CACHE_SHORT) -> Optional[Response]:
+    """Empty 304 when the client copy is current, checked before the content is loaded"""
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=_validator_headers(etag, last_modified, cache_control))
+    return None
+
+def conditional_response(request: Request, content: Any, etag: str,
+                         last_modified: Optional[datetime] = None,
+                         cache_control: str = CACHE_SHORT,
+                         headers: Optional[Dict[str, str]] = None) -> Response:
+    """JSON response with validators, or an empty 304 when the client copy is current"""
+    headers = _validator_headers(etag, last_modified, cache_control, headers)
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    body = _rendered.get(etag)
+    if body is None:
+        body = _encode(content)
+        _rendered[etag] = body
+        if len(_rendered) > _RENDERED_MAX:
+            _rendered.popitem(last=False)
+    else:
+        _rendered.move_to_end(etag)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,21 @@
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request
+
+from repositories.pagination import InvalidCursor, Position, decode_cursor
+
+def cursor_position(cursor: Optional[str]) -> Optional[Position]:
+    """Decode a ``cursor`` query parameter, rejecting tampered values with a 400"""
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def next_page_headers(request: Request, next_cursor: Optional[str]) -> Dict[str, str]:
+    """X-Next-Cursor and a Link rel="next" header when there is another page"""
+    if next_cursor is None:
+        return {}
+    next_url = request.url.include_query_params(cursor=next_cursor)
+    return {"X-Next-Cursor": next_cursor, "Link": f'<{next_url}>; rel="next"'}
@@ -1,176 +1,203 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, desc, event, inspect, select
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
 import json
 
-from database import get_db
+from cache import TimeBucketCache
+from compression import compressed_cache
+from ratelimit import rate_limiters
+from config import settings
+from database import AsyncSessionLocal
+from metrics import request_metrics
 from models.contact import Contact
 
-router = APIRouter(prefix="/analytics", tags=["analytics"])
+router = APIRouter()
 
-@router.get("/overview")
-async def get_analytics_overview(
-    time_range: str = "7d",
-    db: Session = Depends(get_db)
-):
-    """Get analytics overview for the specified time range"""
-    try:
-        # Calculate date range
-        end_date = datetime.now()
-        if time_range == "7d":
-            start_date = end_date - timedelta(days=7)
-        elif time_range == "30d":
-            start_date = end_date - timedelta(days=30)
-        elif time_range == "90d":
-            start_date = end_date - timedelta(days=90)
-        else:
-            start_date = end_date - timedelta(days=7)
-
-        # Get contact submissions
-        contacts = db.query(Contact).filter(
-            Contact.created_at >= start_date,
-            Contact.created_at <= end_date
-        ).all()
-
-        # Calculate metrics
-        total_contacts = len(contacts)
-        read_contacts = len([c for c in contacts if getattr(c, 'is_read', False)])
-        unread_contacts = total_contacts - read_contacts
-        
-        # Calculate response rate (assuming emails were sent)
-        response_rate = (read_contacts / total_contacts * 100) if total_contacts > 0 else 0
-
-        # Get daily contact trends
-        daily_contacts = db.query(
+TIME_RANGES = {"7d": 7, "30d": 30, "90d": 90}
+
+# Shared by every dashboard viewer; one recompute per (endpoint, range, bucket).
+# Invalidation is per process: other workers keep serving their cached
+# results for up to one bucket after a contact is written.
+analytics_cache = TimeBucketCache(bucket_seconds=settings.analytics_cache_bucket_seconds)
+
+# The shared computation outlives the request that started it, so it opens
+# its own session instead of borrowing that request's (closed if it is cancelled)
+session_factory = AsyncSessionLocal
+
+def invalidate_analytics_cache():
+    """Drop cached analytics so the next request sees fresh contact data"""
+    analytics_cache.invalidate()
+
+@event.listens_for(Contact, "after_insert")
+def _mark_contact_inserted(mapper, connection, target):
+    session = inspect(target).session
+    if session is not None:
+        session.info["analytics_dirty"] = True
+
+@event.listens_for(Contact, "after_update")
+def _mark_contact_read(mapper, connection, target):
+    state = inspect(target)
+    if state.session is not None and state.attrs.is_read.history.has_changes():
+        state.session.info["analytics_dirty"] = True
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    # Invalidate only once the change is visible to other connections
+    if session.info.pop("analytics_dirty", False):
+        invalidate_analytics_cache()
+
+def _resolve_time_range(time_range: str) -> Tuple[str, datetime, datetime]:
+    """Normalize a time range label and return it with its start and end dates"""
+    if time_range not in TIME_RANGES:
+        time_range = "7d"
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=TIME_RANGES[time_range])
+    return time_range, start_date, end_date
+
+async def _build_overview(db: AsyncSession, time_range: str) -> Dict[str, Any]:
+    """Run the overview queries for a normalized time range"""
+    time_range, start_date, end_date = _resolve_time_range(time_range)
+    in_range = (Contact.created_at >= start_date, Contact.created_at <= end_date)
+
+    # Count submissions in the database instead of loading every row
+    totals = (await db.execute(
+        select(
+            func.count(Contact.id).label('total'),
+            func.count(Contact.id).filter(Contact.is_read.is_(True)).label('read')
+        ).where(*in_range)
+    )).one()
+
+    # Calculate metrics
+    total_contacts = totals.total
+    read_contacts = totals.read
+    unread_contacts = total_contacts - read_contacts
+
+    # Calculate response rate (assuming emails were sent)
+    response_rate = (read_contacts / total_contacts * 100) if total_contacts > 0 else 0
+
+    # Get daily contact trends
+    daily_contacts = (await db.execute(
+        select(
             func.date(Contact.created_at).label('date'),
             func.count(Contact.id).label('count')
-        ).filter(
-            Contact.created_at >= start_date,
-            Contact.created_at <= end_date
-        ).group_by(func.date(Contact.created_at)).order_by('date').all()
+        ).where(*in_range).group_by(func.date(Contact.created_at)).order_by('date')
+    )).all()
 
-        # Get contact sources
-        source_stats = db.query(
+    # Get contact sources
+    source_stats = (await db.execute(
+        select(
             Contact.source,
             func.count(Contact.id).label('count')
-        ).filter(
-            Contact.created_at >= start_date,
-            Contact.created_at <= end_date
-        ).group_by(Contact.source).all()
-
-        return {
-            "time_range": time_range,
-            "period": {
-                "start": start_date.isoformat(),
-                "end": end_date.isoformat()
-            },
-            "metrics": {
-                "total_contacts": total_contacts,
-                "read_contacts": read_contacts,
-                "unread_contacts": unread_contacts,
-                "response_rate": round(response_rate, 1),
-                "avg_daily_contacts": round(total_contacts / max(1, (end_date - start_date).days), 1)
-            },
-            "trends": {
-                "daily_contacts": [
-                    {"date": str(row.date), "count": row.count}
-                    for row in daily_contacts
-                ]
-            },
-            "sources": [
-                {"source": row.source, "count": row.count}
-                for row in source_stats
+        ).where(*in_range).group_by(Contact.source)
+    )).all()
+
+    return {
+        "time_range": time_range,
+        "period": {
+            "start": start_date.isoformat(),
+            "end": end_date.isoformat()
+        },
+        "metrics": {
+            "total_contacts": total_contacts,
+            "read_contacts": read_contacts,
+            "unread_contacts": unread_contacts,
+            "response_rate": round(response_rate, 1),
+            "avg_daily_contacts": round(total_contacts / max(1, (end_date - start_date).days), 1)
+        },
+        "trends": {
+            "daily_contacts": [
+                {"date": str(row.date), "count": row.count}
+                for row in daily_contacts
             ]
-        }
+        },
+        "sources": [
+            {"source": row.source, "count": row.count}
+            for row in source_stats
+        ]
+    }
+
+async def _build_contact_analytics(db: AsyncSession, time_range: str) -> Dict[str, Any]:
+    """Run the contact detail queries for a normalized time range"""
+    time_range, start_date, end_date = _resolve_time_range(time_range)
+    in_range = (Contact.created_at >= start_date, Contact.created_at <= end_date)
+
+    # Get recent contacts
+    recent_contacts = (await db.execute(
+        select(Contact).where(*in_range).order_by(desc(Contact.created_at)).limit(10)
+    )).scalars().all()
+
+    # Get contact by hour of day
+    hourly_stats = (await db.execute(
+        select(
+            func.extract('hour', Contact.created_at).label('hour'),
+            func.count(Contact.id).label('count')
+        ).where(*in_range).group_by(func.extract('hour', Contact.created_at)).order_by('hour')
+    )).all()
+
+    return {
+        "recent_contacts": [
+            {
+                "id": contact.id,
+                "name": contact.name,
+                "email": contact.email,
+                "subject": contact.subject,
+                "created_at": contact.created_at.isoformat(),
+                "is_read": getattr(contact, 'is_read', False),
+                "source": contact.source
+            }
+            for contact in recent_contacts
+        ],
+        "hourly_distribution": [
+            {"hour": int(row.hour), "count": row.count}
+            for row in hourly_stats
+        ]
+    }
+
+async def _compute(build: Callable[[AsyncSession, str], Awaitable[Dict[str, Any]]],
+                   time_range: str) -> Dict[str, Any]:
+    async with session_factory() as db:
+        return await build(db, time_range)
+
+@router.get("/")
+async def get_analytics_index():
+    """List the analytics endpoints"""
+    return {"analytics": "enabled", "endpoints": ["/overview", "/contacts", "/performance"]}
+
+@router.get("/overview")
+async def get_analytics_overview(time_range: str = "7d"):
+    """Get analytics overview for the specified time range"""
+    try:
+        time_range = _resolve_time_range(time_range)[0]
+
+        return await analytics_cache.get_or_compute(
+            ("overview", time_range), lambda: _compute(_build_overview, time_range)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching analytics: {str(e)}")
 
 @router.get("/contacts")
-async def get_contact_analytics(
-    time_range: str = "7d",
-    db: Session = Depends(get_db)
-):
+async def get_contact_analytics(time_range: str = "7d"):
     """Get detailed contact analytics"""
     try:
-        # Calculate date range
-        end_date = datetime.now()
-        if time_range == "7d":
-            start_date = end_date - timedelta(days=7)
-        elif time_range == "30d":
-            start_date = end_date - timedelta(days=30)
-        elif time_range == "90d":
-            start_date = end_date - timedelta(days=90)
-        else:
-            start_date = end_date - timedelta(days=7)
-
-        # Get recent contacts
-        recent_contacts = db.query(Contact).filter(
-            Contact.created_at >= start_date,
-            Contact.created_at <= end_date
-        ).order_by(desc(Contact.created_at)).limit(10).all()
-
-        # Get contact by hour of day
-        hourly_stats = db.query(
-            func.extract('hour', Contact.created_at).label('hour'),
-            func.count(Contact.id).label('count')
-        ).filter(
-            Contact.created_at >= start_date,
-            Contact.created_at <= end_date
-        ).group_by(func.extract('hour', Contact.created_at)).order_by('hour').all()
-
-        return {
-            "recent_contacts": [
-                {
-                    "id": contact.id,
-                    "name": contact.name,
-                    "email": contact.email,
-                    "subject": contact.subject,
-                    "created_at": contact.created_at.isoformat(),
-                    "is_read": getattr(contact, 'is_read', False),
-                    "source": contact.source
-                }
-                for contact in recent_contacts
-            ],
-            "hourly_distribution": [
-                {"hour": int(row.hour), "count": row.count}
-                for row in hourly_stats
-            ]
-        }
+        time_range = _resolve_time_range(time_range)[0]
+
+        return await analytics_cache.get_or_compute(
+            ("contacts", time_range), lambda: _compute(_build_contact_analytics, time_range)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching contact analytics: {str(e)}")
 
 @router.get("/performance")
 async def get_performance_metrics():
-    """Get performance metrics (simulated data for now)"""
+    """Get request latency percentiles, status codes and in-flight counts per route"""
     try:
-        # Simulated performance data
-        return {
-            "page_load_times": {
-                "home": 1.2,
-                "projects": 1.8,
-                "blog": 2.1,
-                "contact": 1.5
-            },
-            "device_distribution": {
-                "desktop": 45,
-                "mobile": 40,
-                "tablet": 15
-            },
-            "browser_distribution": {
-                "chrome": 60,
-                "safari": 25,
-                "firefox": 10,
-                "edge": 5
-            },
-            "geographic_data": [
-                {"country": "United States", "visitors": 1200},
-                {"country": "India", "visitors": 800},
-                {"country": "United Kingdom", "visitors": 450},
-                {"country": "Canada", "visitors": 300},
-                {"country": "Germany", "visitors": 250}
-            ]
-        }
+        snapshot = request_metrics.snapshot()
+        snapshot["analytics_cache"] = analytics_cache.stats()
+        snapshot["compressed_cache"] = compressed_cache.stats()
+        snapshot["rate_limits"] = [limiter.stats() for limiter in rate_limiters]
+        return snapshot
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching performance metrics: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error fetching performance metrics: {str(e)}")
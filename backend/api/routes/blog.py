@@ -1,8 +1,16 @@
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import List, Optional, Union
 from pydantic import BaseModel
 from datetime import datetime
 
+from api.conditional import CACHE_SHORT, conditional_response, content_etag, not_modified_response
+from api.pagination import cursor_position, next_page_headers
+from repositories.blog import BlogRepository, DuplicatePost
+from repositories.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from repositories.project import RepositoryUnavailable
+from rendering import render_post
+from serialization import trusted
+
 router = APIRouter()
 
 # Pydantic models
@@ -23,11 +31,45 @@ class BlogPost(BlogPostBase):
     created_at: datetime
     updated_at: datetime
     read_time: int  # in minutes
+    word_count: int = 0
+    content_html: Optional[str] = None  # rendered from content at write time
 
     class Config:
         from_attributes = True
 
-# Sample blog posts
+class BlogPostSummary(BaseModel):
+    """Listing projection of a post, without content"""
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    tags: List[str]
+    author: str
+    featured_image: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    read_time: int
+    word_count: int = 0
+
+class BlogSearchHit(BaseModel):
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    tags: List[str]
+    author: str
+    created_at: datetime
+    rank: float
+    snippet: str  # matching fragment with terms wrapped in <mark>
+
+class BlogSearchResults(BaseModel):
+    query: str
+    page: int
+    page_size: int
+    total: int
+    results: List[BlogSearchHit]
+
+# Seed blog posts, inserted into an empty blog_posts table and served if the database is down
 sample_posts = [
     {
         "id": 1,
@@ -70,34 +112,64 @@ sample_posts = [
     }
 ]
 
-@router.get("/", response_model=List[BlogPost])
-async def get_blog_posts(tag: Optional[str] = None, limit: Optional[int] = None):
-    """Get all blog posts, optionally filtered by tag and limited in number"""
-    posts = sample_posts
-    
-    if tag:
-        posts = [post for post in posts if tag in post["tags"]]
-    
-    if limit:
-        posts = posts[:limit]
-    
-    return posts
+blog_repository = BlogRepository(seed=sample_posts)
+
+@router.get("/", response_model=List[Union[BlogPostSummary, BlogPost]])
+async def get_blog_posts(
+    request: Request,
+    tag: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_content: bool = False
+):
+    """Get blog post summaries a page at a time, optionally filtered by tag"""
+    after = cursor_position(cursor)
+    # Validate against the table's version first so a 304 never loads or serializes the page
+    count, last_modified = await blog_repository.list_version()
+    etag = content_etag("posts", count, last_modified, tag, limit, cursor, include_content)
+    not_modified = not_modified_response(request, etag, last_modified, cache_control=CACHE_SHORT)
+    if not_modified is not None:
+        return not_modified
+
+    posts, next_cursor = await blog_repository.list(
+        tag=tag, limit=limit, after=after, include_content=include_content
+    )
+    return conditional_response(
+        request,
+        posts,
+        etag=etag,
+        last_modified=last_modified,
+        cache_control=CACHE_SHORT,
+        headers=next_page_headers(request, next_cursor)
+    )
+
+@router.get("/search", response_model=BlogSearchResults)
+async def search_blog_posts(
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=50)
+):
+    """Full-text search over post titles and content, best matches first"""
+    return await blog_repository.search(q, page=page, page_size=page_size)
 
 @router.get("/{post_slug}", response_model=BlogPost)
 async def get_blog_post(post_slug: str):
     """Get a specific blog post by slug"""
-    for post in sample_posts:
-        if post["slug"] == post_slug:
-            return post
-    raise HTTPException(status_code=404, detail="Blog post not found")
+    post = await blog_repository.get(post_slug)
+    if post is None:
+        raise HTTPException(status_code=404, detail="Blog post not found")
+    return trusted(post)
 
 @router.get("/tags/list")
-async def get_blog_tags():
-    """Get all available blog tags"""
-    all_tags = set()
-    for post in sample_posts:
-        all_tags.update(post["tags"])
-    return {"tags": list(all_tags)}
+async def get_blog_tags(request: Request):
+    """Get all available blog tags and how many posts use each"""
+    tag_index = await blog_repository.tag_index()
+    return conditional_response(
+        request,
+        tag_index.snapshot(),
+        etag=content_etag("tags", tag_index.version),
+        cache_control=CACHE_SHORT
+    )
 
 @router.post("/", response_model=BlogPost)
 async def create_blog_post(post: BlogPostCreate):
@@ -105,13 +177,14 @@ async def create_blog_post(post: BlogPostCreate):
     # Generate slug from title
     slug = post.title.lower().replace(" ", "-").replace(":", "").replace(",", "")
     
-    new_post = {
-        "id": len(sample_posts) + 1,
-        **post.dict(),
-        "slug": slug,
-        "created_at": datetime.now(),
-        "updated_at": datetime.now(),
-        "read_time": len(post.content.split()) // 200  # Rough estimate: 200 words per minute
-    }
-    sample_posts.append(new_post)
-    return new_post 
\ No newline at end of file
+    try:
+        # HTML, excerpt, word count and reading time are rendered once here, not per view
+        return await blog_repository.create({
+            **post.dict(),
+            **render_post(post.content, post.excerpt),
+            "slug": slug
+        })
+    except DuplicatePost:
+        raise HTTPException(status_code=409, detail=f"A blog post with slug '{slug}' already exists")
+    except RepositoryUnavailable as e:
+        raise HTTPException(status_code=503, detail=f"Blog database unavailable: {str(e)}")
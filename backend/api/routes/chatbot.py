@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
@@ -11,8 +11,10 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from ai_agent.manager import agent_manager
-from ai_agent.tools import execute_tool, get_available_tools
+from ai_agent.tools import execute_tool, get_available_tools, get_tool_metrics
 from ai_agent.ai_integration import get_ai_integration
+from api.conditional import CACHE_STATIC, conditional_response, content_etag
+from serialization import trusted
 
 router = APIRouter()
 
@@ -139,6 +141,11 @@ def get_suggestions(category: str) -> List[str]:
     }
     return suggestions_map.get(category, ["Explore projects", "Try demos", "Learn about skills"])
 
+@router.get("/")
+async def get_chatbot_index():
+    """Chatbot greeting and entry points"""
+    return {"chatbot": "AI assistant ready to help!", "endpoints": ["/chat", "/suggestions", "/capabilities"]}
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat_with_ai(request: ChatMessage):
     """Chat with the AI assistant using the enhanced AI agent"""
@@ -178,16 +185,17 @@ async def chat_with_ai(request: ChatMessage):
                 }
             })
         
-        response = ChatResponse(
-            message=request.message,
-            response=result["response"],
-            timestamp=datetime.now(),
-            confidence=result.get("confidence", 0.8),
-            suggestions=result.get("suggestions", [])
-        )
+        # Built here from the agent's result, so it skips ChatResponse re-validation
+        response = {
+            "message": request.message,
+            "response": result["response"],
+            "timestamp": datetime.now(),
+            "confidence": float(result.get("confidence", 0.8)),
+            "suggestions": list(result.get("suggestions", []))
+        }
         
         print(f"🎯 Returning response with {len(result['response'])} characters")
-        return response
+        return trusted(response)
         
     except Exception as e:
         print(f"❌ Error in chat_with_ai: {str(e)}")
@@ -195,22 +203,26 @@ async def chat_with_ai(request: ChatMessage):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error processing chat: {str(e)}")
 
+# Initial chat suggestions
+CHAT_SUGGESTIONS = {
+    "suggestions": [
+        "Tell me about your projects",
+        "Tell me about your AI projects",
+        "What technologies do you use?",
+        "Show me your machine learning demos",
+        "How can I contact you?",
+        "What's your experience with Python?",
+        "Tell me about your data science work",
+        "Career advice for tech",
+        "Learning resources"
+    ]
+}
+CHAT_SUGGESTIONS_ETAG = content_etag(CHAT_SUGGESTIONS)
+
 @router.get("/suggestions")
-async def get_chat_suggestions():
+async def get_chat_suggestions(request: Request):
     """Get initial chat suggestions"""
-    return {
-        "suggestions": [
-            "Tell me about your projects",
-            "Tell me about your AI projects",
-            "What technologies do you use?",
-            "Show me your machine learning demos",
-            "How can I contact you?",
-            "What's your experience with Python?",
-            "Tell me about your data science work",
-            "Career advice for tech",
-            "Learning resources"
-        ]
-    }
+    return conditional_response(request, CHAT_SUGGESTIONS, etag=CHAT_SUGGESTIONS_ETAG, cache_control=CACHE_STATIC)
 
 @router.get("/session/{session_id}")
 async def get_chat_session(session_id: str):
@@ -301,6 +313,11 @@ async def get_tools():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting tools: {str(e)}")
 
+@router.get("/tools/metrics")
+async def get_tools_metrics():
+    """Per-tool latency, error, timeout and cache statistics"""
+    return {"tools": get_tool_metrics()}
+
 @router.post("/tools/execute")
 async def execute_tool_endpoint(tool_request: dict):
     """Execute a tool"""
@@ -311,7 +328,7 @@ async def execute_tool_endpoint(tool_request: dict):
         if not tool_name:
             raise HTTPException(status_code=400, detail="Tool name is required")
         
-        result = execute_tool(tool_name, **parameters)
+        result = await execute_tool(tool_name, **parameters)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error executing tool: {str(e)}")
@@ -347,24 +364,30 @@ async def generate_code(request: dict):
 
 
 
+# What the chatbot can do
+CHATBOT_CAPABILITIES = {
+    "capabilities": [
+        "Answer questions about portfolio projects",
+        "Explain data science and AI concepts",
+        "Guide users through interactive demos",
+        "Provide information about skills and technologies",
+        "Share contact and professional information",
+        "Maintain conversation context across sessions"
+    ],
+    "topics": list(KNOWLEDGE_BASE.keys()),
+    "features": [
+        "Natural language understanding",
+        "Contextual responses",
+        "Interactive suggestions",
+        "Session management",
+        "Real-time chat"
+    ]
+}
+CHATBOT_CAPABILITIES_ETAG = content_etag(CHATBOT_CAPABILITIES)
+
 @router.get("/capabilities")
-async def get_chatbot_capabilities():
+async def get_chatbot_capabilities(request: Request):
     """Get information about what the chatbot can do"""
-    return {
-        "capabilities": [
-            "Answer questions about portfolio projects",
-            "Explain data science and AI concepts",
-            "Guide users through interactive demos",
-            "Provide information about skills and technologies",
-            "Share contact and professional information",
-            "Maintain conversation context across sessions"
-        ],
-        "topics": list(KNOWLEDGE_BASE.keys()),
-        "features": [
-            "Natural language understanding",
-            "Contextual responses",
-            "Interactive suggestions",
-            "Session management",
-            "Real-time chat"
-        ]
-    } 
\ No newline at end of file
+    return conditional_response(
+        request, CHATBOT_CAPABILITIES, etag=CHATBOT_CAPABILITIES_ETAG, cache_control=CACHE_STATIC
+    )
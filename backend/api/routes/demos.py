@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File, Request
 from typing import List, Optional
 from pydantic import BaseModel
 import json
@@ -6,6 +6,9 @@ import io
 import base64
 from datetime import datetime
 
+from api.conditional import CACHE_STATIC, conditional_response, content_etag
+from serialization import loads, trusted
+
 # Try to import optional dependencies
 try:
     from PIL import Image
@@ -77,10 +80,12 @@ available_demos = [
     }
 ]
 
+DEMOS_ETAG = content_etag(available_demos)
+
 @router.get("/", response_model=List[DemoInfo])
-async def get_available_demos():
+async def get_available_demos(request: Request):
     """Get list of available AI demos"""
-    return available_demos
+    return conditional_response(request, available_demos, etag=DEMOS_ETAG, cache_control=CACHE_STATIC)
 
 def simple_sentiment_analysis(text: str) -> tuple[float, float]:
     """Simple sentiment analysis without external dependencies"""
@@ -201,11 +206,12 @@ async def create_visualization(request: DataVisualizationRequest):
             # Convert to JSON for frontend
             chart_json = fig.to_json()
             if chart_json:
-                return {
-                    "chart_data": json.loads(chart_json),
+                # Plotly output can reach megabytes; skip jsonable_encoder's walk over it
+                return trusted({
+                    "chart_data": loads(chart_json),
                     "chart_type": request.chart_type,
                     "title": request.title or "Data Visualization"
-                }
+                })
             else:
                 return {
                     "chart_data": {"error": "Failed to generate chart"},
@@ -285,18 +291,21 @@ async def classify_image(file: UploadFile = File(..., alias="image")):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing image: {str(e)}")
 
+# Sample data for visualization demos
+SAMPLE_DATA = {
+    "sales_data": {
+        "months": ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
+        "sales": [12000, 15000, 18000, 14000, 22000, 25000],
+        "expenses": [8000, 9000, 11000, 8500, 13000, 15000]
+    },
+    "user_data": {
+        "age": [25, 30, 35, 40, 45, 50, 55, 60],
+        "salary": [45000, 55000, 65000, 75000, 85000, 95000, 105000, 115000]
+    }
+}
+SAMPLE_DATA_ETAG = content_etag(SAMPLE_DATA)
+
 @router.get("/sample-data")
-async def get_sample_data():
+async def get_sample_data(request: Request):
     """Get sample data for visualization demos"""
-    sample_data = {
-        "sales_data": {
-            "months": ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
-            "sales": [12000, 15000, 18000, 14000, 22000, 25000],
-            "expenses": [8000, 9000, 11000, 8500, 13000, 15000]
-        },
-        "user_data": {
-            "age": [25, 30, 35, 40, 45, 50, 55, 60],
-            "salary": [45000, 55000, 65000, 75000, 85000, 95000, 105000, 115000]
-        }
-    }
-    return sample_data 
\ No newline at end of file
+    return conditional_response(request, SAMPLE_DATA, etag=SAMPLE_DATA_ETAG, cache_control=CACHE_STATIC)
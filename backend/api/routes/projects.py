@@ -1,8 +1,14 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
+from api.conditional import CACHE_SHORT, conditional_response, content_etag
+from api.pagination import cursor_position, next_page_headers
+from repositories.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from repositories.project import ProjectRepository, RepositoryUnavailable
+from serialization import trusted
+
 router = APIRouter()
 
 # Pydantic models for request/response
@@ -14,6 +20,7 @@ class ProjectBase(BaseModel):
     live_url: Optional[str] = None
     image_url: Optional[str] = None
     category: str  # e.g., "machine-learning", "data-analysis", "nlp", "computer-vision"
+    featured: bool = False
 
 class ProjectCreate(ProjectBase):
     pass
@@ -26,7 +33,7 @@ class Project(ProjectBase):
     class Config:
         from_attributes = True
 
-# Sample projects data (in a real app, this would come from a database)
+# Seed projects, inserted into an empty projects table and served if the database is down
 sample_projects = [
     {
         "id": 1,
@@ -37,6 +44,7 @@ sample_projects = [
         "live_url": "https://house-price-demo.herokuapp.com",
         "image_url": "/images/house-price-prediction.jpg",
         "category": "machine-learning",
+        "featured": True,
         "created_at": datetime.now(),
         "updated_at": datetime.now()
     },
@@ -66,36 +74,54 @@ sample_projects = [
     }
 ]
 
+project_repository = ProjectRepository(seed=sample_projects)
+
 @router.get("/", response_model=List[Project])
-async def get_projects(category: Optional[str] = None):
-    """Get all projects, optionally filtered by category"""
-    if category:
-        filtered_projects = [p for p in sample_projects if p["category"] == category]
-        return filtered_projects
-    return sample_projects
+async def get_projects(
+    request: Request,
+    category: Optional[str] = None,
+    featured: Optional[bool] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    """Get projects a page at a time, optionally filtered by category and featured flag"""
+    after = cursor_position(cursor)
+    read_model = await project_repository.read_model()
+    projects, next_cursor = read_model.page(category=category, featured=featured, after=after, limit=limit)
+    return conditional_response(
+        request,
+        projects,
+        etag=content_etag("projects", read_model.version, category, featured, limit, cursor),
+        last_modified=read_model.last_modified,
+        cache_control=CACHE_SHORT,
+        headers=next_page_headers(request, next_cursor)
+    )
 
 @router.get("/{project_id}", response_model=Project)
 async def get_project(project_id: int):
     """Get a specific project by ID"""
-    for project in sample_projects:
-        if project["id"] == project_id:
-            return project
-    raise HTTPException(status_code=404, detail="Project not found")
+    project = (await project_repository.read_model()).get(project_id)
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    # Read model rows are built from validated columns
+    return trusted(project)
 
 @router.post("/", response_model=Project)
 async def create_project(project: ProjectCreate):
     """Create a new project"""
-    new_project = {
-        "id": len(sample_projects) + 1,
-        **project.dict(),
-        "created_at": datetime.now(),
-        "updated_at": datetime.now()
-    }
-    sample_projects.append(new_project)
-    return new_project
+    try:
+        return await project_repository.create(project.dict())
+    except RepositoryUnavailable as e:
+        raise HTTPException(status_code=503, detail=f"Project database unavailable: {str(e)}")
 
 @router.get("/categories/list")
-async def get_categories():
+async def get_categories(request: Request):
     """Get all available project categories"""
-    categories = list(set(project["category"] for project in sample_projects))
-    return {"categories": categories} 
\ No newline at end of file
+    read_model = await project_repository.read_model()
+    return conditional_response(
+        request,
+        {"categories": read_model.categories()},
+        etag=content_etag("project-categories", read_model.version),
+        last_modified=read_model.last_modified,
+        cache_control=CACHE_SHORT
+    )
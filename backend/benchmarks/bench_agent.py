@@ -0,0 +1,133 @@
+"""Microbenchmarks for the agent and intent-matching hot paths
+
+    python -m pytest benchmarks/bench_agent.py
+    python -m pytest benchmarks/bench_agent.py --benchmark-compare --benchmark-compare-fail=mean:15%
+
+Runs are saved as JSON under benchmarks/results (see conftest.py).
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import ai_agent.agent as agent_module
+from ai_agent.agent import AIAgent, Memory
+from ai_agent.ai_integration import AIIntegration
+from ai_agent.intents import get_intent_classifier
+from ai_agent.manager import AgentManager
+from api.routes.chatbot import analyze_message
+
+MESSAGES = [
+    "Tell me about your machine learning projects",
+    "What technologies do you use for web development?",
+    "How can I contact you about a data science role?",
+    "Explain the difference between supervised and unsupervised learning",
+]
+MEMORY_SIZES = [10, 100, 1_000, 10_000]
+SESSIONS = 10_000
+
+@pytest.fixture(scope="module")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest.fixture(scope="module")
+def agent():
+    return AIAgent("Bench")
+
+@pytest.fixture(scope="module")
+def integration():
+    return AIIntegration()
+
+def _memories(count: int):
+    topics = ["python", "machine learning", "react", "postgres", "career", "docker", "nlp", "pandas"]
+    return [
+        Memory(
+            content=f"User asked about {topics[i % len(topics)]} example {i}",
+            timestamp=datetime.now(),
+            importance=(i % 10) / 10,
+            context={},
+            memory_type="conversation",
+        )
+        for i in range(count)
+    ]
+
+def _reset(agent: AIAgent):
+    agent.conversation_history.clear()
+    agent.reasoning_chain.clear()
+    agent.memory.clear()
+
+def test_agent_init(benchmark):
+    benchmark(AIAgent, "Bench")
+
+def test_process_message_knowledge_base(benchmark, agent, loop, monkeypatch):
+    # Without an AI integration the agent answers from its knowledge base
+    monkeypatch.setattr(agent_module, "get_ai_integration", lambda: None)
+
+    def run():
+        _reset(agent)
+        return loop.run_until_complete(agent.process_message("Tell me about your machine learning projects", "bench"))
+
+    assert benchmark(run)["response"]
+
+def test_process_message_integration(benchmark, agent, loop):
+    def run():
+        _reset(agent)
+        return loop.run_until_complete(agent.process_message("What is your experience with Python?", "bench"))
+
+    assert benchmark(run)["response"]
+
+def test_process_message_code(benchmark, agent, loop):
+    def run():
+        _reset(agent)
+        return loop.run_until_complete(agent.process_message("Write a python function for fibonacci", "bench"))
+
+    assert benchmark(run)["category"] == "coding"
+
+def test_search_knowledge(benchmark, agent):
+    search = agent.tools["search_knowledge"].function
+    benchmark(lambda: [search(message) for message in MESSAGES])
+
+@pytest.mark.parametrize("size", MEMORY_SIZES)
+def test_get_relevant_memories(benchmark, size):
+    agent = AIAgent("Bench")
+    agent.memory = _memories(size)
+    agent.get_relevant_memories("warm up the index")
+    benchmark(agent.get_relevant_memories, "python machine learning example", 5)
+
+def test_generate_dynamic_response(benchmark, integration, loop):
+    context = {"conversation_history": [], "user_preferences": {}, "session_id": "bench"}
+
+    def run():
+        return [loop.run_until_complete(integration._generate_dynamic_response(m, context)) for m in MESSAGES]
+
+    benchmark(run)
+
+def test_classify_intent_batch(benchmark):
+    classifier = get_intent_classifier()
+    benchmark(classifier.classify_batch, MESSAGES * 64)
+
+def test_categorize_response(benchmark, integration):
+    response = "Machine learning models like random forests and neural networks power the projects. " * 20
+    benchmark(lambda: [integration._categorize_response(response, message) for message in MESSAGES])
+
+def test_analyze_message(benchmark):
+    benchmark(lambda: [analyze_message(message) for message in MESSAGES])
+
+@pytest.fixture(scope="module")
+def populated_manager():
+    manager = AgentManager()
+    for i in range(SESSIONS):
+        manager.get_or_create_agent(f"session-{i}")
+    return manager
+
+def test_get_or_create_agent_existing(benchmark, populated_manager):
+    assert len(populated_manager.session_agents) >= SESSIONS
+    benchmark(populated_manager.get_or_create_agent, f"session-{SESSIONS // 2}")
+
+def test_get_or_create_agent_new(benchmark, populated_manager):
+    counter = iter(range(10 ** 9))
+    benchmark(lambda: populated_manager.get_or_create_agent(f"new-{next(counter)}"))
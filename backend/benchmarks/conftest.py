@@ -0,0 +1,12 @@
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+def pytest_configure(config):
+    # Save every benchmark run as JSON under benchmarks/results, so later runs can
+    # be checked with --benchmark-compare (and --benchmark-compare-fail=mean:10%)
+    if not config.pluginmanager.hasplugin("benchmark") or config.getoption("benchmark_json", None):
+        return
+    config.option.benchmark_autosave = True
+    if config.getoption("benchmark_storage") == "file://./.benchmarks":
+        config.option.benchmark_storage = f"file://{RESULTS_DIR}"
@@ -0,0 +1,277 @@
+"""Asyncio load generator for the chat, demo and analytics endpoints
+
+Starts the app locally on a SQLite stand-in (or targets --base-url, e.g. an
+instance backed by a local Postgres), drives a weighted scenario mix from
+--concurrency workers for --duration seconds, and reports RPS and latency
+percentiles per scenario.
+
+    python -m benchmarks.loadtest --duration 20 --concurrency 32 --mix chat=4,demos=3,analytics=3
+    python -m benchmarks.loadtest --baseline benchmarks/baselines/loadtest.json --tolerance 0.25
+    python -m benchmarks.loadtest --save-baseline benchmarks/baselines/loadtest.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from metrics import LatencyHistogram
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+CHAT_MESSAGES = [
+    "Tell me about your projects",
+    "What technologies do you use?",
+    "Explain machine learning",
+    "Write a python function for fibonacci",
+    "How can I contact you?",
+    "Career advice for tech",
+]
+SENTIMENT_TEXTS = [
+    "I love how fast this portfolio loads!",
+    "The demo was confusing and slow.",
+    "It works as expected.",
+]
+TIME_RANGES = ["1d", "7d", "30d", "90d"]
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    json: Optional[Dict[str, Any]] = None
+
+@dataclass
+class Scenario:
+    """A weighted group of endpoints; each pick sends one request built by ``build``"""
+    name: str
+    build: Callable[[random.Random, int], Request]
+
+def _chat(rng: random.Random, n: int) -> Request:
+    return Request("POST", "/api/chatbot/chat", {
+        "message": rng.choice(CHAT_MESSAGES),
+        "session_id": f"load-{n % 64}",
+    })
+
+def _demos(rng: random.Random, n: int) -> Request:
+    choice = rng.random()
+    if choice < 0.4:
+        return Request("POST", "/api/demos/sentiment-analysis", {"text": rng.choice(SENTIMENT_TEXTS)})
+    if choice < 0.6:
+        return Request("POST", "/api/demos/data-visualization", {
+            "chart_type": rng.choice(["bar", "line", "scatter"]),
+            "data": [{"x": i, "y": rng.randint(0, 100)} for i in range(50)],
+            "title": "Load test",
+        })
+    if choice < 0.8:
+        return Request("GET", "/api/demos/sample-data")
+    return Request("GET", "/api/demos/")
+
+def _analytics(rng: random.Random, n: int) -> Request:
+    choice = rng.random()
+    if choice < 0.5:
+        return Request("GET", f"/api/analytics/overview?time_range={rng.choice(TIME_RANGES)}")
+    if choice < 0.8:
+        return Request("GET", f"/api/analytics/contacts?time_range={rng.choice(TIME_RANGES)}")
+    return Request("GET", "/api/analytics/performance")
+
+SCENARIOS = {
+    "chat": Scenario("chat", _chat),
+    "demos": Scenario("demos", _demos),
+    "analytics": Scenario("analytics", _analytics),
+}
+
+def parse_mix(mix: str) -> List[Tuple[Scenario, float]]:
+    """``chat=4,demos=3`` -> weighted scenarios"""
+    weighted = []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        weighted.append((SCENARIOS[name], float(weight or 1)))
+    return weighted
+
+@dataclass
+class ScenarioResult:
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        summary = self.latency.summary()
+        return {
+            "requests": summary["count"],
+            "errors": self.errors,
+            "rps": round(summary["count"] / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": summary["p50_ms"],
+            "p95_ms": summary["p95_ms"],
+            "p99_ms": summary["p99_ms"],
+            "max_ms": summary["max_ms"],
+        }
+
+async def run_load(client: httpx.AsyncClient, mix: List[Tuple[Scenario, float]], duration: float,
+                   concurrency: int, seed: int = 0) -> Dict[str, Any]:
+    """Drive the mix for ``duration`` seconds and return per-scenario and total results"""
+    results = {scenario.name: ScenarioResult() for scenario, _ in mix}
+    total = ScenarioResult()
+    scenarios = [scenario for scenario, _ in mix]
+    weights = [weight for _, weight in mix]
+    deadline = time.perf_counter() + duration
+    sent = 0
+
+    async def worker(worker_id: int):
+        nonlocal sent
+        rng = random.Random(seed * 1000 + worker_id)
+        while time.perf_counter() < deadline:
+            scenario = rng.choices(scenarios, weights)[0]
+            request = scenario.build(rng, sent)
+            sent += 1
+            start = time.perf_counter()
+            try:
+                response = await client.request(request.method, request.path, json=request.json)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            elapsed = time.perf_counter() - start
+            for result in (results[scenario.name], total):
+                result.latency.record_seconds(elapsed)
+                result.errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "duration_seconds": round(elapsed, 3),
+        "concurrency": concurrency,
+        "scenarios": {name: result.report(elapsed) for name, result in results.items()},
+        "total": total.report(elapsed),
+    }
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regressions past ``tolerance``: lower RPS, or higher p95/p99, than the stored baseline"""
+    regressions = []
+    current = {**report["scenarios"], "total": report["total"]}
+    for name, expected in {**baseline.get("scenarios", {}), "total": baseline.get("total", {})}.items():
+        actual = current.get(name)
+        if not actual or not expected:
+            continue
+        if expected.get("rps") and actual["rps"] < expected["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {actual['rps']} < baseline {expected['rps']}")
+        for key in ("p95_ms", "p99_ms"):
+            if expected.get(key) and actual[key] > expected[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {actual[key]} > baseline {expected[key]}")
+        if actual["errors"] > expected.get("errors", 0) * (1 + tolerance):
+            regressions.append(f"{name}: errors {actual['errors']} > baseline {expected.get('errors', 0)}")
+    return regressions
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@asynccontextmanager
+async def local_app(database_url: Optional[str] = None, startup_timeout: float = 60.0):
+    """Run uvicorn in a subprocess against ``database_url`` (a temporary SQLite file by default)"""
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": database_url or f"sqlite:///{Path(tmp) / 'loadtest.db'}",
+            "APP_ENV": os.environ.get("APP_ENV", "production"),
+            # One client IP generates all the load, so per-IP limits would cap every scenario
+            "RATE_LIMIT_ENABLED": os.environ.get("RATE_LIMIT_ENABLED", "false"),
+        }
+        env.pop("ASYNC_DATABASE_URL", None)
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--log-level", "warning", "--no-access-log"],
+            cwd=BACKEND_DIR, env=env,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            async with httpx.AsyncClient(base_url=base_url, timeout=2) as probe:
+                deadline = time.perf_counter() + startup_timeout
+                while True:
+                    if process.poll() is not None:
+                        raise RuntimeError(f"App exited during startup with code {process.returncode}")
+                    try:
+                        if (await probe.get("/api/health/ready")).status_code == 200:
+                            break
+                    except httpx.HTTPError:
+                        pass
+                    if time.perf_counter() > deadline:
+                        raise RuntimeError(f"App not ready after {startup_timeout}s")
+                    await asyncio.sleep(0.25)
+            yield base_url
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+def print_report(report: Dict[str, Any]):
+    print(f"{'scenario':<12}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, row in [*report["scenarios"].items(), ("total", report["total"])]:
+        print(f"{name:<12}{row['requests']:>10}{row['errors']:>8}{row['rps']:>10}"
+              f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}")
+
+async def main_async(args) -> int:
+    mix = parse_mix(args.mix)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async def drive(base_url: str) -> Dict[str, Any]:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+            if args.warmup:
+                await run_load(client, mix, args.warmup, args.concurrency, seed=args.seed + 1)
+            return await run_load(client, mix, args.duration, args.concurrency, seed=args.seed)
+
+    if args.base_url:
+        report = await drive(args.base_url)
+    else:
+        async with local_app(args.database_url) as base_url:
+            report = await drive(base_url)
+
+    report["mix"] = args.mix
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        Path(args.save_baseline).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.save_baseline).write_text(json.dumps(report, indent=2))
+        print(f"Saved baseline to {args.save_baseline}")
+    if args.baseline:
+        regressions = compare_to_baseline(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the chat, demo and analytics endpoints")
+    parser.add_argument("--base-url", help="target a running app instead of starting one")
+    parser.add_argument("--database-url", help="database for the locally started app (default: temporary SQLite)")
+    parser.add_argument("--mix", default="chat=4,demos=3,analytics=3", help="scenario weights")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report as JSON")
+    parser.add_argument("--baseline", help="fail if results regress past this stored report")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression fraction")
+    parser.add_argument("--save-baseline", help="store this run as the new baseline")
+    sys.exit(asyncio.run(main_async(parser.parse_args())))
+
+if __name__ == "__main__":
+    main()
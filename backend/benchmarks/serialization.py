@@ -0,0 +1,94 @@
+"""Serialization cost of the chat, project-list and visualization payloads
+
+Compares FastAPI's default path (response_model validation where the route
+declares one, jsonable_encoder, stdlib json) with the trusted orjson path.
+
+    python -m benchmarks.serialization [--repeat 5] [--output results.json]
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+import serialization
+from api.routes.chatbot import ChatResponse
+from api.routes.projects import Project, sample_projects
+
+def chat_payload() -> Dict[str, Any]:
+    section = (
+        "### 🤖 **AI Portfolio** *(Featured)*\n**Description:** A modern, AI-powered data science "
+        "portfolio featuring interactive demos, analytics, a chatbot, and a blog.\n\n**Key Features:**\n"
+        "• Interactive AI demos and analytics dashboard\n• Real-time chatbot with natural language processing\n"
+        "**Technologies:** React, FastAPI, PostgreSQL, AI/ML\n\n---\n\n"
+    )
+    return {
+        "message": "Tell me about your projects",
+        "response": "## 🚀 **My Portfolio Projects**\n\n" + section * 20,
+        "timestamp": datetime.now(),
+        "confidence": 0.92,
+        "suggestions": ["Tell me about your AI projects", "Show me your demos", "How can I contact you?"],
+    }
+
+def project_list_payload(copies: int = 50) -> List[Dict[str, Any]]:
+    return [
+        {**project, "id": i * len(sample_projects) + project["id"], "featured": False, "created_at": datetime.now()}
+        for i in range(copies) for project in sample_projects
+    ]
+
+def visualization_payload(points: int = 20_000) -> Dict[str, Any]:
+    import numpy as np
+    import pandas as pd
+    import plotly.express as px
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"x": rng.normal(size=points), "y": rng.normal(size=points)})
+    chart = px.scatter(df, x="x", y="y", title="Scatter").to_json()
+    return {"chart_data": json.loads(chart), "chart_type": "scatter", "title": "Scatter"}
+
+def default_path(model=None) -> Callable[[Any], bytes]:
+    adapter = TypeAdapter(model) if model is not None else None
+
+    def encode(payload: Any) -> bytes:
+        if adapter is not None:
+            payload = adapter.dump_python(adapter.validate_python(payload), mode="json")
+        content = jsonable_encoder(payload)
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    return encode
+
+def run(repeat: int = 5) -> List[Dict[str, Any]]:
+    cases = [
+        ("chat", chat_payload(), ChatResponse),
+        ("project_list", project_list_payload(), List[Project]),
+        ("visualization", visualization_payload(), None),
+    ]
+    results = []
+    for name, payload, model in cases:
+        for path, encode in (("default", default_path(model)), ("trusted_orjson", serialization.dumps)):
+            size = len(encode(payload))
+            number = max(1, int(0.2 / max(timeit.timeit(lambda: encode(payload), number=1), 1e-6)))
+            best = min(timeit.repeat(lambda: encode(payload), number=number, repeat=repeat)) / number
+            results.append({"payload": name, "path": path, "bytes": size, "seconds": best})
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    baseline = {r["payload"]: r["seconds"] for r in results if r["path"] == "default"}
+    print(f"{'payload':<15}{'path':<17}{'bytes':>10}{'ms':>10}{'speedup':>9}")
+    for r in results:
+        speedup = baseline[r["payload"]] / r["seconds"]
+        print(f"{r['payload']:<15}{r['path']:<17}{r['bytes']:>10}{r['seconds'] * 1000:>10.3f}{speedup:>8.1f}x")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"orjson": serialization.orjson is not None, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
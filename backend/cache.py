@@ -0,0 +1,149 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one in-flight computation
+
+    The computation runs in its own task and every caller, the first one
+    included, waits on it through ``asyncio.shield``.  A cancelled caller
+    therefore never cancels the others; the task is only cancelled once no
+    caller is waiting for it any more.
+    """
+
+    def __init__(self):
+        # key -> [task, number of callers waiting on it]
+        self._inflight: Dict[Hashable, list] = {}
+        self.coalesced: int = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run func for key, or wait for the call already running for the same key"""
+        flight = self._inflight.get(key)
+        if flight is None:
+            task = asyncio.ensure_future(func())
+            flight = self._inflight[key] = [task, 0]
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced += 1
+        task = flight[0]
+        flight[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            flight[1] -= 1
+            if flight[1] == 0 and not task.done():
+                task.cancel()
+
+    def _finish(self, key: Hashable, task: asyncio.Future):
+        flight = self._inflight.get(key)
+        if flight is not None and flight[0] is task:
+            del self._inflight[key]
+        # Mark exceptions as retrieved even when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed"""
+        return len(self._inflight)
+
+class TimeBucketCache:
+    """Response cache keyed by (key, time bucket) with stampede protection
+
+    Entries expire when the wall clock moves into the next bucket, so every
+    key is recomputed at most once per bucket.  ``invalidate`` drops all
+    entries and bumps a generation counter so results of computations that
+    were already running when the data changed are never stored.
+    """
+
+    def __init__(self, bucket_seconds: int = 60, max_entries: int = 256,
+                 clock: Callable[[], float] = time.time):
+        self.bucket_seconds = max(1, bucket_seconds)
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._flight = SingleFlight()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def current_bucket(self) -> int:
+        """Index of the time bucket the clock is currently in"""
+        return int(self._clock() // self.bucket_seconds)
+
+    async def get_or_compute(self, key: Tuple, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key in the current bucket, computing it once if missing"""
+        bucket = self.current_bucket()
+        entry_key = key + (bucket,)
+        if entry_key in self._entries:
+            self._entries.move_to_end(entry_key)
+            self.hits += 1
+            return self._entries[entry_key]
+
+        self.misses += 1
+        generation = self._generation
+        value = await self._flight.do(entry_key + (generation,), compute)
+        if generation == self._generation:
+            self._store(entry_key, bucket, value)
+        return value
+
+    def _store(self, entry_key: Tuple, bucket: int, value: Any):
+        """Insert an entry, dropping expired buckets and the least recently used overflow"""
+        for stale_key in [k for k in self._entries if k[-1] < bucket]:
+            del self._entries[stale_key]
+        self._entries[entry_key] = value
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """Drop every cached entry and ignore results of computations already in flight"""
+        self._generation += 1
+        self._entries.clear()
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for diagnostics"""
+        return {
+            "entries": len(self._entries),
+            "bucket_seconds": self.bucket_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self._flight.coalesced,
+            "in_flight": self._flight.in_flight(),
+            "invalidations": self.invalidations,
+        }
+
+class TTLCache:
+    """LRU cache whose entries expire ``ttl`` seconds after they were stored"""
+
+    def __init__(self, ttl: float, max_entries: int = 256, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self._clock():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any):
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "ttl_seconds": self.ttl, "hits": self.hits, "misses": self.misses}
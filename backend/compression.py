@@ -0,0 +1,200 @@
+import gzip
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from config import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Content types worth compressing; images, archives and event streams are sent as is
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+EXCLUDED_TYPES = ("text/event-stream",)
+
+def available_encodings() -> Tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported coding the client accepts, preferring Brotli over gzip"""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding.strip()] = quality
+    for coding in available_encodings():
+        if weights.get(coding, weights.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if not media_type or media_type.startswith(EXCLUDED_TYPES):
+        return False
+    return media_type.startswith(COMPRESSIBLE_TYPES)
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.compression_brotli_quality)
+    return gzip.compress(body, compresslevel=settings.compression_gzip_level, mtime=0)
+
+class CompressedCache:
+    """LRU of compressed bodies keyed by (ETag, coding), bounded by total bytes"""
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        body = self.entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key: Tuple[str, str], body: bytes):
+        if len(body) > self.max_bytes or key in self.entries:
+            return
+        self.entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self.entries), "bytes": self.size, "hits": self.hits, "misses": self.misses}
+
+class _StreamCompressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.compression_brotli_quality)
+            self.compress, self._finish = self._compressor.process, self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 31)
+            self.compress, self._finish = self._compressor.compress, self._compressor.flush
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+def _cache_key(headers: MutableHeaders, encoding: str) -> Optional[Tuple[str, str]]:
+    """Only validator-carrying shared-cacheable responses reuse compressed bytes"""
+    etag = headers.get("etag")
+    cache_control = headers.get("cache-control", "").lower()
+    if not etag or etag.startswith("W/") or "no-store" in cache_control or "private" in cache_control:
+        return None
+    return etag, encoding
+
+class CompressionMiddleware:
+    """ASGI gzip/Brotli compression with a size threshold and content-type rules
+
+    Responses that carry a strong ETag and are publicly cacheable have their
+    compressed bytes kept in ``cache``, so repeat hits cost a dict lookup
+    instead of a compression pass.  Their ETag is sent weakened, as the coded
+    representation differs byte-for-byte from the identity one.
+    """
+
+    def __init__(self, app, minimum_size: Optional[int] = None, cache: Optional[CompressedCache] = None):
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else settings.compression_minimum_size
+        self.cache = cache or compressed_cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(self, encoding, send))
+
+class _CompressingSend:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Optional[dict] = None
+        self.mode: Optional[str] = None
+        self.stream: Optional[_StreamCompressor] = None
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.mode == "identity":
+            await self.send(message)
+            return
+        if self.mode == "stream":
+            await self._send_chunk(message)
+            return
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+        if "content-encoding" in headers or not is_compressible(headers.get("content-type", "")):
+            self.mode = "identity"
+        elif self.start["status"] in (204, 304) or (not more_body and len(body) < self.middleware.minimum_size):
+            headers.add_vary_header("Accept-Encoding")
+            self.mode = "identity"
+        if self.mode == "identity":
+            await self.send(self.start)
+            await self.send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if not more_body:
+            key = _cache_key(headers, self.encoding)
+            compressed = self.middleware.cache.get(key) if key else None
+            if compressed is None:
+                compressed = compress(body, self.encoding)
+                if key:
+                    self.middleware.cache.put(key, compressed)
+            if "etag" in headers:
+                headers["ETag"] = "W/" + headers["etag"]
+            headers["Content-Length"] = str(len(compressed))
+            self.mode = "done"
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": compressed})
+            return
+
+        # Streaming response: compress chunk by chunk without buffering it all
+        del headers["Content-Length"]
+        if "etag" in headers:
+            headers["ETag"] = "W/" + headers["etag"]
+        self.mode = "stream"
+        self.stream = _StreamCompressor(self.encoding)
+        await self.send(self.start)
+        await self._send_chunk(message)
+
+    async def _send_chunk(self, message):
+        more_body = message.get("more_body", False)
+        chunk = self.stream.compress(message.get("body", b""))
+        if not more_body:
+            chunk += self.stream.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+# Global cache of compressed cacheable responses
+compressed_cache = CompressedCache()
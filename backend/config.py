@@ -1,6 +1,41 @@
 import os
 from typing import Optional
 
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag such as 1/true/yes from the environment"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+# Defaults per deployment profile, overridable one by one through the environment
+PROFILE_DEFAULTS = {
+    "development": {
+        "debug": True,
+        "db_pool_size": 5,
+        "db_max_overflow": 10,
+        "db_pool_timeout": 30,
+        "db_pool_recycle": 300,
+        "db_pool_pre_ping": True,
+    },
+    "production": {
+        "debug": False,
+        "db_pool_size": 10,
+        "db_max_overflow": 20,
+        "db_pool_timeout": 5,
+        "db_pool_recycle": 1800,
+        "db_pool_pre_ping": True,
+    },
+}
+
+def _async_url(url: str) -> str:
+    """Map a sync database URL to its async driver equivalent"""
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url.split("://", 1)[1]
+    return url
+
 class Settings:
     """Simple settings class without pydantic dependency"""
     
@@ -10,10 +45,15 @@ class Settings:
         self.api_version: str = "1.0.0"
         self.api_description: str = "A modern portfolio showcasing data science and AI skills with interactive demos"
         
+        # Deployment profile (APP_ENV=development|production)
+        self.environment: str = os.getenv("APP_ENV", "development").lower()
+        profile = PROFILE_DEFAULTS.get(self.environment, PROFILE_DEFAULTS["development"])
+        self.is_production: bool = self.environment == "production"
+
         # Server Configuration
         self.host: str = "0.0.0.0"
         self.port: int = 8000
-        self.debug: bool = True
+        self.debug: bool = _env_bool("DEBUG", profile["debug"])
         
         # CORS Configuration
         self.allowed_origins: list = ["http://localhost:3000", "http://127.0.0.1:3000"]
@@ -25,9 +65,33 @@ class Settings:
         self.db_user: str = os.getenv("DB_USER", "postgres")
         self.db_password: str = os.getenv("DB_PASSWORD", "postgres")
         
-        # Construct database URLs
-        self.database_url: str = f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
-        self.async_database_url: str = f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+        # Construct database URLs (DATABASE_URL, as set by docker-compose, wins)
+        self.database_url: str = os.getenv(
+            "DATABASE_URL",
+            f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+        )
+        if self.database_url.startswith("postgres://"):
+            self.database_url = "postgresql://" + self.database_url.split("://", 1)[1]
+        self.async_database_url: str = os.getenv("ASYNC_DATABASE_URL", _async_url(self.database_url))
+
+        # Connection pool tuning, applied to both the sync and async engines
+        self.db_echo: bool = _env_bool("DB_ECHO", self.debug and not self.is_production)
+        self.db_pool_size: int = int(os.getenv("DB_POOL_SIZE", profile["db_pool_size"]))
+        self.db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", profile["db_max_overflow"]))
+        self.db_pool_timeout: int = int(os.getenv("DB_POOL_TIMEOUT", profile["db_pool_timeout"]))
+        self.db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", profile["db_pool_recycle"]))
+        self.db_pool_pre_ping: bool = _env_bool("DB_POOL_PRE_PING", profile["db_pool_pre_ping"])
+
+        # Startup database checks run in the background with these bounds (seconds)
+        self.startup_db_timeout: float = float(os.getenv("STARTUP_DB_TIMEOUT", "10"))
+        self.startup_retry_interval: float = float(os.getenv("STARTUP_RETRY_INTERVAL", "5"))
+
+        # Background database health probe (seconds)
+        self.db_health_interval: float = float(os.getenv("DB_HEALTH_INTERVAL", "15"))
+        self.db_health_timeout: float = float(os.getenv("DB_HEALTH_TIMEOUT", "3"))
+
+        # Per-statement timeout applied to every database connection
+        self.db_statement_timeout_ms: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
         
         # Security
         self.secret_key: str = "your-secret-key-change-in-production"
@@ -41,5 +105,59 @@ class Settings:
         # ML Model Configuration
         self.model_cache_dir: str = "./ml_models/cache"
 
+        # Seconds before a worker reloads its project read model from the database
+        self.projects_refresh_seconds: float = float(os.getenv("PROJECTS_REFRESH_SECONDS", "60"))
+
+        # Seconds before a worker rebuilds its blog tag counts from the database
+        self.blog_tags_refresh_seconds: float = float(os.getenv("BLOG_TAGS_REFRESH_SECONDS", "60"))
+
+        # Response compression: bodies below the threshold are sent uncompressed
+        self.compression_minimum_size: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+        self.compression_gzip_level: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+        self.compression_brotli_quality: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+        # Agent tools: sync tools run in a bounded thread pool, each call under a timeout
+        self.tool_thread_pool_size: int = int(os.getenv("TOOL_THREAD_POOL_SIZE", "8"))
+        self.tool_timeout_seconds: float = float(os.getenv("TOOL_TIMEOUT_SECONDS", "5"))
+
+        # Remote text generation; empty INFERENCE_MODEL keeps the chatbot on its local responders
+        self.inference_base_url: str = os.getenv("INFERENCE_BASE_URL", "https://api-inference.huggingface.co/models")
+        self.inference_model: str = os.getenv("INFERENCE_MODEL", "")
+        self.inference_connect_timeout: float = float(os.getenv("INFERENCE_CONNECT_TIMEOUT", "2"))
+        self.inference_read_timeout: float = float(os.getenv("INFERENCE_READ_TIMEOUT", "10"))
+        self.inference_retries: int = int(os.getenv("INFERENCE_RETRIES", "2"))
+        self.inference_max_connections: int = int(os.getenv("INFERENCE_MAX_CONNECTIONS", "20"))
+        self.inference_breaker_failures: int = int(os.getenv("INFERENCE_BREAKER_FAILURES", "5"))
+        self.inference_breaker_reset_seconds: float = float(os.getenv("INFERENCE_BREAKER_RESET_SECONDS", "30"))
+
+        # Extra code-generation snippets (<dir>/<language>/<name>.<ext>), added to the built-in ones
+        self.code_templates_dir: str = os.getenv("CODE_TEMPLATES_DIR", "")
+
+        # Directory (e.g. /dev/shm/portfolio) for memory-mapped agent memory embeddings; empty keeps them in-process
+        self.agent_memory_mmap_dir: str = os.getenv("AGENT_MEMORY_MMAP_DIR", "")
+
+        # Token buckets (requests per second, burst) for chat and the CPU-heavy demo routes
+        self.rate_limit_enabled: bool = _env_bool("RATE_LIMIT_ENABLED", True)
+        self.rate_limit_chat_ip_rate: float = float(os.getenv("RATE_LIMIT_CHAT_IP_RATE", "1"))
+        self.rate_limit_chat_ip_burst: float = float(os.getenv("RATE_LIMIT_CHAT_IP_BURST", "10"))
+        self.rate_limit_chat_session_rate: float = float(os.getenv("RATE_LIMIT_CHAT_SESSION_RATE", "0.5"))
+        self.rate_limit_chat_session_burst: float = float(os.getenv("RATE_LIMIT_CHAT_SESSION_BURST", "5"))
+        self.rate_limit_demo_ip_rate: float = float(os.getenv("RATE_LIMIT_DEMO_IP_RATE", "0.5"))
+        self.rate_limit_demo_ip_burst: float = float(os.getenv("RATE_LIMIT_DEMO_IP_BURST", "5"))
+        self.rate_limit_demo_session_rate: float = float(os.getenv("RATE_LIMIT_DEMO_SESSION_RATE", "0.25"))
+        self.rate_limit_demo_session_burst: float = float(os.getenv("RATE_LIMIT_DEMO_SESSION_BURST", "3"))
+        # Clients are identified by X-Forwarded-For only behind a trusted proxy
+        self.trust_forwarded_for: bool = _env_bool("TRUST_FORWARDED_FOR", False)
+
+        # Load shedding: limited routes get 503 above this many in-flight requests or this event-loop lag
+        self.shed_max_in_flight: int = int(os.getenv("SHED_MAX_IN_FLIGHT", "256"))
+        self.shed_max_loop_lag_ms: float = float(os.getenv("SHED_MAX_LOOP_LAG_MS", "250"))
+
+        # Route modules (comma-separated names) imported on their first request instead of at startup
+        self.lazy_routers: str = os.getenv("LAZY_ROUTERS", "demos")
+
+        # Analytics response cache (seconds per time bucket)
+        self.analytics_cache_bucket_seconds: int = int(os.getenv("ANALYTICS_CACHE_BUCKET_SECONDS", "60"))
+
 # Create settings instance
 settings = Settings() 
\ No newline at end of file
@@ -1,30 +1,152 @@
-from sqlalchemy import create_engine, MetaData, text
+from sqlalchemy import create_engine, MetaData, text, event, select, func, Table, Column, Integer
+from sqlalchemy.exc import OperationalError, ProgrammingError, TimeoutError as PoolTimeout
+from sqlalchemy.pool import NullPool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from config import settings
+from typing import Any, Dict, List, Optional
 import logging
+import time
+import zlib
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """Engine keyword arguments for the configured pool profile and backend"""
+    options: Dict[str, Any] = {
+        "echo": settings.db_echo,  # Log SQL queries only when explicitly enabled
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+    if url.startswith("sqlite"):
+        # SQLite stand-ins (tests, load tests) take no pool sizing or server settings
+        return options
+
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+    )
+    if is_async:
+        options["connect_args"] = {
+            # Client-side timeout per statement, backed by the server-side limit
+            "command_timeout": settings.db_statement_timeout_ms / 1000,
+            "server_settings": {"statement_timeout": str(settings.db_statement_timeout_ms)}
+        }
+    else:
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+    return options
+
 # Create database engine
-engine = create_engine(
-    settings.database_url,
-    echo=settings.debug,  # Log SQL queries in debug mode
-    pool_pre_ping=True,   # Verify connections before use
-    pool_recycle=300      # Recycle connections every 5 minutes
-)
+engine = create_engine(settings.database_url, **_engine_options(settings.database_url))
 
 # Create async engine for async operations
 async_engine = create_async_engine(
-    settings.async_database_url,
-    echo=settings.debug,
-    pool_pre_ping=True,
-    pool_recycle=300
+    settings.async_database_url, **_engine_options(settings.async_database_url, is_async=True)
 )
 
+class PoolMonitor:
+    """Counts pool checkouts, connects and waits for one engine
+
+    A wait is a checkout that found no idle connection and no overflow
+    headroom, so it blocked until a connection was returned or the pool
+    timeout expired; the time spent blocked and the timeouts are kept too.
+    """
+
+    def __init__(self, name: str, sync_engine):
+        self.name = name
+        self.pool = sync_engine.pool
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+        # No event fires before a checkout blocks, so time the pool's own get
+        if hasattr(self.pool, "_do_get") and hasattr(self.pool, "_max_overflow"):
+            self.pool._do_get = self._timed_get(self.pool._do_get)
+        event.listen(sync_engine, "checkout", self._on_checkout)
+        event.listen(sync_engine, "checkin", self._on_checkin)
+        event.listen(sync_engine, "connect", self._on_connect)
+        event.listen(sync_engine, "invalidate", self._on_invalidate)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checkouts += 1
+        checked_out = self._call("checkedout")
+        if checked_out is not None:
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def _timed_get(self, do_get):
+        def get():
+            if not self._must_wait():
+                return do_get()
+            start = time.perf_counter()
+            try:
+                return do_get()
+            except PoolTimeout:
+                self.timeouts += 1
+                raise
+            finally:
+                self.waits += 1
+                self.wait_seconds += time.perf_counter() - start
+        return get
+
+    def _must_wait(self) -> bool:
+        """No idle connection and no overflow headroom: the checkout blocks until one is returned"""
+        max_overflow = self.pool._max_overflow
+        return max_overflow > -1 and self._call("checkedin") == 0 and (self._call("overflow") or 0) >= max_overflow
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        self.checkins += 1
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self.invalidations += 1
+
+    def _call(self, method: str) -> Optional[int]:
+        func = getattr(self.pool, method, None)
+        return func() if callable(func) else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pool_class": type(self.pool).__name__,
+            "size": self._call("size"),
+            "checked_in": self._call("checkedin"),
+            "checked_out": self._call("checkedout"),
+            # QueuePool reports negative overflow until the base pool is full
+            "overflow": max(0, self._call("overflow") or 0),
+            "max_overflow": getattr(self.pool, "_max_overflow", None),
+            "timeout_seconds": getattr(self.pool, "_timeout", None),
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 6),
+            "timeouts": self.timeouts,
+            "peak_checked_out": self.peak_checked_out,
+        }
+
+pool_monitors = [
+    PoolMonitor("sync", engine),
+    PoolMonitor("async", async_engine.sync_engine),
+]
+
+def pool_stats() -> Dict[str, Any]:
+    """Connection pool usage for both engines"""
+    return {
+        "profile": settings.environment,
+        "pre_ping": settings.db_pool_pre_ping,
+        "pools": {monitor.name: monitor.stats() for monitor in pool_monitors},
+    }
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -39,6 +161,32 @@ Base = declarative_base()
 # Metadata for migrations
 db_metadata = MetaData()
 
+# Bump whenever the models change so startup knows to run DDL again
+SCHEMA_VERSION = 5
+
+# Idempotent Postgres-only DDL that create_all cannot express (generated columns, GIN
+# indexes); models append to it and init_db runs it after create_all
+postgres_ddl: List[str] = []
+
+schema_version_table = Table(
+    "schema_version",
+    Base.metadata,
+    Column("version", Integer, nullable=False)
+)
+
+async def lock_for_seeding(session, table: str):
+    """Hold a write lock until the session commits, so only one worker seeds an empty table
+
+    Postgres takes a transaction-scoped advisory lock; SQLite takes its database
+    write lock early with a no-op update.  A second worker blocks here and then
+    sees the rows the first one committed.
+    """
+    if session.bind.dialect.name == "postgresql":
+        await session.execute(text("SELECT pg_advisory_xact_lock(:key)"),
+                              {"key": zlib.crc32(f"seed:{table}".encode("utf-8"))})
+    else:
+        await session.execute(text(f"UPDATE {table} SET id = id WHERE 0"))
+
 def get_db():
     """Dependency to get database session"""
     db = SessionLocal()
@@ -63,11 +211,34 @@ def init_db():
         
         # Create all tables
         Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            if connection.dialect.name == "postgresql":
+                for statement in postgres_ddl:
+                    connection.execute(text(statement))
+            connection.execute(schema_version_table.delete())
+            connection.execute(schema_version_table.insert().values(version=SCHEMA_VERSION))
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
         raise
 
+def current_schema_version() -> Optional[int]:
+    """Schema version stamped in the database, or None if it was never initialized"""
+    try:
+        with engine.connect() as connection:
+            return connection.execute(select(func.max(schema_version_table.c.version))).scalar()
+    except (ProgrammingError, OperationalError):
+        # The schema_version table does not exist yet
+        return None
+
+def ensure_schema() -> bool:
+    """Run DDL only when the stamped schema version is behind; returns True if it ran"""
+    if current_schema_version() == SCHEMA_VERSION:
+        logger.info(f"Database schema is current (version {SCHEMA_VERSION}), skipping DDL")
+        return False
+    init_db()
+    return True
+
 async def init_async_db():
     """Initialize database tables asynchronously"""
     try:
@@ -90,4 +261,19 @@ def test_connection():
             return True
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
-        return False 
\ No newline at end of file
+        return False 
+
+# Dedicated unpooled engine for health probes, so they never hold an app pool connection
+probe_engine = create_engine(
+    settings.database_url,
+    poolclass=NullPool,
+    connect_args={} if settings.database_url.startswith("sqlite")
+    else {"connect_timeout": max(1, int(settings.db_health_timeout))}
+)
+
+def probe_connection() -> float:
+    """Run SELECT 1 on a fresh connection and return the round trip in seconds"""
+    start = time.perf_counter()
+    with probe_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return time.perf_counter() - start
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+class ReadinessState:
+    """Tracks whether startup checks have completed so traffic can be routed here"""
+
+    def __init__(self):
+        self.database_ready = False
+        self.schema_checked = False
+        self.last_error: Optional[str] = None
+        self.attempts = 0
+        self.started_at = time.time()
+        self.ready_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.database_ready and self.schema_checked
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else "not_ready",
+            "database": "ready" if self.database_ready else "unavailable",
+            "schema": "checked" if self.schema_checked else "pending",
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "startup_seconds": round(self.ready_at - self.started_at, 3) if self.ready_at else None,
+        }
+
+async def _run_blocking(func, timeout: float, pending: Dict[Any, asyncio.Future]):
+    """Run a blocking database call in a worker thread, bounded by a timeout
+
+    A thread cannot be stopped when the timeout expires, so the call is kept
+    in ``pending`` and the next attempt waits on it again instead of starting
+    another thread behind the same hung connection.
+    """
+    future = pending.get(func)
+    if future is None:
+        future = pending[func] = asyncio.ensure_future(asyncio.to_thread(func))
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    try:
+        return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+    finally:
+        if future.done():
+            del pending[func]
+
+async def prepare_database(state: "ReadinessState", timeout: float = None, retry_interval: float = None):
+    """Check the database and schema off the event loop, retrying until both succeed"""
+    from database import ensure_schema, test_connection
+
+    timeout = timeout or settings.startup_db_timeout
+    retry_interval = retry_interval or settings.startup_retry_interval
+    pending: Dict[Any, asyncio.Future] = {}
+    while not state.ready:
+        state.attempts += 1
+        try:
+            if not state.database_ready:
+                if not await _run_blocking(test_connection, timeout, pending):
+                    raise ConnectionError("database connection failed")
+                state.database_ready = True
+            if await _run_blocking(ensure_schema, timeout, pending):
+                logger.info("Database schema created or upgraded")
+            state.schema_checked = True
+            state.last_error = None
+            state.ready_at = time.time()
+            logger.info(f"Startup checks completed after {state.attempts} attempt(s)")
+        except asyncio.TimeoutError:
+            state.last_error = f"startup check timed out after {timeout}s"
+        except Exception as e:
+            state.last_error = str(e)
+        if not state.ready:
+            logger.warning(f"Database not ready ({state.last_error}); retrying in {retry_interval}s")
+            await asyncio.sleep(retry_interval)
+
+class DatabaseProbe:
+    """Checks the database on an interval and caches the result for /api/health/db"""
+
+    def __init__(self, interval: float = None, timeout: float = None, check=None):
+        self.interval = interval or settings.db_health_interval
+        self.timeout = timeout or settings.db_health_timeout
+        self._check = check
+        self._pending: Optional[asyncio.Future] = None
+        self.healthy: Optional[bool] = None
+        self.latency_ms: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.consecutive_failures = 0
+
+    def _record(self, healthy: bool, latency: Optional[float] = None, error: Optional[str] = None):
+        self.healthy = healthy
+        self.latency_ms = round(latency * 1000, 2) if latency is not None else None
+        self.error = error
+        self.checked_at = time.time()
+        self.consecutive_failures = 0 if healthy else self.consecutive_failures + 1
+
+    async def probe_once(self):
+        """Run one bounded check in a worker thread"""
+        if self._pending is not None and not self._pending.done():
+            # Never stack threads behind a hung connection attempt
+            self._record(False, error="previous probe still running")
+            return
+        check = self._check
+        if check is None:
+            from database import probe_connection as check
+        self._pending = asyncio.ensure_future(asyncio.to_thread(check))
+        self._pending.add_done_callback(lambda f: f.cancelled() or f.exception())
+        try:
+            latency = await asyncio.wait_for(asyncio.shield(self._pending), self.timeout)
+            self._record(True, latency)
+        except asyncio.TimeoutError:
+            self._record(False, error=f"probe timed out after {self.timeout}s")
+        except Exception as e:
+            self._record(False, error=str(e))
+
+    async def run(self):
+        """Probe forever; cancelled on shutdown"""
+        while True:
+            await self.probe_once()
+            if self.healthy is False:
+                logger.warning(f"Database health probe failed: {self.error}")
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cached status with its age; never touches the database"""
+        if self.healthy is None:
+            status, database = "unknown", "pending"
+        elif self.healthy:
+            status, database = "healthy", "connected"
+        else:
+            status, database = "unhealthy", "disconnected"
+        return {
+            "status": status,
+            "database": database,
+            "latency_ms": self.latency_ms,
+            "age_seconds": round(time.time() - self.checked_at, 3) if self.checked_at else None,
+            "interval_seconds": self.interval,
+            "consecutive_failures": self.consecutive_failures,
+            "message": self.error,
+        }
+
+# Global readiness state
+readiness = ReadinessState()
+
+# Global database health probe
+database_probe = DatabaseProbe()
@@ -1,126 +1,117 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 from pathlib import Path
 import os
+import asyncio
 import logging
 
+from ai_agent.ai_integration import close_ai_integration
+from ai_agent.intents import load_intent_classifier
+from compression import CompressionMiddleware
+from config import settings
+from health import database_probe, prepare_database, readiness
+from metrics import MetricsMiddleware, request_metrics
+from ratelimit import RateLimitMiddleware
+from routers import RouterRegistry, stub_router
+from serialization import FastJSONResponse
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Import routers
-from fastapi import APIRouter
-
-# Create routers
-projects = APIRouter()
-demos = APIRouter()
-blog = APIRouter()
-analytics = APIRouter()
-chatbot = APIRouter()
-contact = APIRouter()
-
-# Try to import actual route modules
-try:
-    import api.routes.projects as projects_module
-    import api.routes.demos as demos_module
-    import api.routes.blog as blog_module
-    import api.routes.analytics as analytics_module
-    import api.routes.chatbot as chatbot_module
-    import api.routes.contact as contact_module
-    
-    # Use the actual routers if import successful
-    projects = projects_module.router
-    demos = demos_module.router
-    blog = blog_module.router
-    analytics = analytics_module.router
-    chatbot = chatbot_module.router
-    contact = contact_module.router
-    print("✓ All route modules imported successfully")
-    print(f"✓ Contact router: {contact}")
-    
-except ImportError as e:
-    print(f"Warning: Could not import some routes: {e}")
-    print("Using basic routers with sample endpoints")
-    
-    # Add basic endpoints to dummy routers
-    @projects.get("/")
-    async def get_projects():
-        return {"projects": []}
-    
-    @demos.get("/")
-    async def get_demos():
-        return {"demos": []}
-    
-    @blog.get("/")
-    async def get_blog():
-        return {"posts": []}
-    
-    @analytics.get("/")
-    async def get_analytics():
-        return {"analytics": "disabled"}
-    
-    @chatbot.get("/")
-    async def get_chatbot():
-        return {"chatbot": "AI assistant ready to help!"}
-    
-    @contact.post("/submit")
-    async def submit_contact():
-        return {"success": True, "message": "Contact form submitted successfully!"}
-
 # Create FastAPI app
 app = FastAPI(
     title="AI-Powered Data Science Portfolio",
     description="A modern portfolio showcasing data science and AI skills with interactive demos",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=FastJSONResponse
 )
 
-# Configure CORS
+# Compress JSON and text bodies; inside metrics so timings include compression
+app.add_middleware(CompressionMiddleware)
+
+# Rate-limit chat and the CPU-heavy demos, shedding them first under overload
+app.add_middleware(RateLimitMiddleware)
+
+# Configure CORS; outside the rate limiter so browsers can read its 429/503 responses
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],  # React dev server
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
-# Include routers
-app.include_router(projects, prefix="/api/projects", tags=["projects"])
-app.include_router(demos, prefix="/api/demos", tags=["demos"])
-app.include_router(blog, prefix="/api/blog", tags=["blog"])
-app.include_router(analytics, prefix="/api/analytics", tags=["analytics"])
-app.include_router(chatbot, prefix="/api/chatbot", tags=["chatbot"])
-app.include_router(contact, prefix="/api/contact", tags=["contact"])
+# Record per-route latency, status codes and in-flight requests
+app.add_middleware(MetricsMiddleware)
+
+# Route modules, each imported on its own so one failure cannot take down the rest
+lazy_routers = {name.strip() for name in settings.lazy_routers.split(",") if name.strip()}
+router_registry = RouterRegistry()
+for name, payload in (
+    ("projects", {"projects": []}),
+    ("demos", {"demos": []}),
+    ("blog", {"posts": []}),
+    ("analytics", {"analytics": "disabled"}),
+    ("chatbot", {"chatbot": "AI assistant ready to help!"}),
+):
+    router_registry.register(
+        name, f"api.routes.{name}", f"/api/{name}", lazy=name in lazy_routers,
+        fallback=lambda payload=payload: stub_router("get", "/", payload),
+    )
+router_registry.register(
+    "contact", "api.routes.contact", "/api/contact", lazy="contact" in lazy_routers,
+    fallback=lambda: stub_router("post", "/submit", {"success": True, "message": "Contact form submitted successfully!"}),
+)
+router_registry.mount(app)
 
 # Health check endpoint
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy", "message": "AI Portfolio API is running!"}
 
-# Debug endpoint to check router status
+# Liveness: the process is up and the event loop is responsive
+@app.get("/api/health/live")
+async def liveness_check():
+    return {"status": "alive"}
+
+# Readiness: startup database checks have completed
+@app.get("/api/health/ready")
+async def readiness_check():
+    snapshot = readiness.snapshot()
+    if not readiness.ready:
+        return JSONResponse(status_code=503, content=snapshot)
+    return snapshot
+
+# Prometheus scrape endpoint
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(request_metrics.prometheus(), media_type="text/plain; version=0.0.4")
+
+# Debug endpoint to check router status and per-module import times
 @app.get("/api/debug/routers")
 async def debug_routers():
     return {
-        "contact_router": str(contact),
-        "contact_routes": [str(route) for route in contact.routes] if hasattr(contact, 'routes') else [],
+        "routers": router_registry.snapshot(),
         "app_routes": [str(route) for route in app.routes]
     }
 
-# Database health check endpoint
+# Database health check endpoint (cached result of the background probe)
 @app.get("/api/health/db")
 async def database_health_check():
-    try:
-        from database import test_connection
-        if test_connection():
-            return {"status": "healthy", "database": "connected"}
-        else:
-            return {"status": "unhealthy", "database": "disconnected"}
-    except Exception as e:
-        logger.error(f"Database health check failed: {e}")
-        return {"status": "unhealthy", "database": "error", "message": str(e)}
+    return database_probe.snapshot()
+
+# Connection pool usage for both database engines
+@app.get("/api/health/db/pool")
+async def database_pool_status():
+    from database import pool_stats
+    return pool_stats()
 
 # Root endpoint
 @app.get("/")
@@ -129,25 +120,27 @@ async def root():
         "message": "Welcome to AI-Powered Data Science Portfolio API",
         "docs": "/api/docs",
         "health": "/api/health",
+        "liveness": "/api/health/live",
+        "readiness": "/api/health/ready",
         "database_health": "/api/health/db"
     }
 
 # Startup event
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
-    try:
-        from database import init_db, test_connection
-        logger.info("Testing database connection...")
-        if test_connection():
-            logger.info("Database connection successful")
-            logger.info("Initializing database tables...")
-            init_db()
-            logger.info("Database initialization completed")
-        else:
-            logger.warning("Database connection failed - some features may not work")
-    except Exception as e:
-        logger.error(f"Database initialization failed: {e}")
+    """Start database checks and the intent model load in the background so the worker can accept traffic at once"""
+    app.state.startup_task = asyncio.create_task(prepare_database(readiness))
+    app.state.db_probe_task = asyncio.create_task(database_probe.run())
+    app.state.intents_task = asyncio.create_task(load_intent_classifier())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background startup checks and the database probe, and close pooled clients"""
+    for name in ("startup_task", "db_probe_task", "intents_task"):
+        task = getattr(app.state, name, None)
+        if task and not task.done():
+            task.cancel()
+    await close_ai_integration()
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -0,0 +1,217 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# 64 exact buckets, then 2**5 linear sub-buckets per power of two: relative error under ~3%
+SUB_BUCKET_BITS = 6
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of durations recorded in microseconds
+
+    Values below 64us are counted exactly; above that every power of two is
+    split into 32 linear sub-buckets.  Recording is a couple of integer ops
+    and a list increment, and the memory use is fixed by ``max_value_us``.
+    """
+
+    def __init__(self, max_value_us: int = 60_000_000):
+        self.max_value_us = max_value_us
+        self.counts: List[int] = [0] * (self._index(max_value_us) + 1)
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    @staticmethod
+    def _index(value: int) -> int:
+        if value < SUB_BUCKET_COUNT:
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        return SUB_BUCKET_COUNT + (shift - 1) * SUB_BUCKET_HALF + ((value >> shift) - SUB_BUCKET_HALF)
+
+    @staticmethod
+    def _bucket_midpoint(index: int) -> float:
+        if index < SUB_BUCKET_COUNT:
+            return float(index)
+        shift = (index - SUB_BUCKET_COUNT) // SUB_BUCKET_HALF + 1
+        mantissa = (index - SUB_BUCKET_COUNT) % SUB_BUCKET_HALF + SUB_BUCKET_HALF
+        low = mantissa << shift
+        return low + ((1 << shift) - 1) / 2
+
+    def record(self, value_us: int):
+        """Record one duration in microseconds"""
+        value_us = min(max(0, int(value_us)), self.max_value_us)
+        self.counts[self._index(value_us)] += 1
+        self.count += 1
+        self.total_us += value_us
+        if self.min_us is None or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def record_seconds(self, seconds: float):
+        """Record one duration given in seconds"""
+        self.record(int(seconds * 1_000_000))
+
+    def percentile(self, percent: float) -> float:
+        """Approximate value in microseconds at the given percentile (0-100)"""
+        return self.percentiles((percent,))[percent]
+
+    def percentiles(self, percents: Tuple[float, ...] = (50, 95, 99)) -> Dict[float, float]:
+        """Several percentiles in one pass over the buckets"""
+        result = {}
+        if self.count == 0:
+            return {p: 0.0 for p in percents}
+        targets = sorted((max(1, int(round(self.count * p / 100.0))), p) for p in percents)
+        seen = 0
+        pending = iter(targets)
+        target, percent = next(pending)
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            seen += bucket_count
+            while seen >= target:
+                result[percent] = min(self._bucket_midpoint(index), float(self.max_us))
+                nxt = next(pending, None)
+                if nxt is None:
+                    return result
+                target, percent = nxt
+        for _, p in targets:
+            result.setdefault(p, float(self.max_us))
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, mean and tail latencies in milliseconds"""
+        p = self.percentiles((50, 95, 99))
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_us / self.count / 1000, 3) if self.count else 0.0,
+            "min_ms": round((self.min_us or 0) / 1000, 3),
+            "max_ms": round(self.max_us / 1000, 3),
+            "p50_ms": round(p[50] / 1000, 3),
+            "p95_ms": round(p[95] / 1000, 3),
+            "p99_ms": round(p[99] / 1000, 3),
+        }
+
+class RouteStats:
+    """Latency histogram and status code counters for one route"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.status_codes: Dict[int, int] = {}
+
+class RequestMetrics:
+    """Per-route request metrics shared by the middleware and the reporting endpoints"""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+        self.in_flight = 0
+        self.started_at = time.time()
+
+    def route_stats(self, method: str, route: str) -> RouteStats:
+        key = (method, route)
+        stats = self.routes.get(key)
+        if stats is None:
+            stats = self.routes[key] = RouteStats()
+        return stats
+
+    def observe(self, method: str, route: str, status: int, seconds: float):
+        """Record a finished request"""
+        stats = self.route_stats(method, route)
+        stats.latency.record_seconds(seconds)
+        stats.status_codes[status] = stats.status_codes.get(status, 0) + 1
+
+    def reset(self):
+        self.routes.clear()
+        self.started_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-friendly view of all route metrics"""
+        routes = []
+        for (method, route), stats in sorted(self.routes.items(), key=lambda item: item[0][1]):
+            routes.append({
+                "method": method,
+                "route": route,
+                **stats.latency.summary(),
+                "status_codes": {str(code): count for code, count in sorted(stats.status_codes.items())},
+            })
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "in_flight": self.in_flight,
+            "routes": routes,
+        }
+
+    def prometheus(self) -> str:
+        """Render metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being served",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_request_duration_seconds Request latency by route",
+            "# TYPE http_request_duration_seconds summary",
+        ]
+        items = sorted(self.routes.items(), key=lambda item: item[0][1])
+        for (method, route), stats in items:
+            labels = f'method="{method}",route="{_escape(route)}"'
+            for percent, value in stats.latency.percentiles((50, 95, 99)).items():
+                lines.append(f'http_request_duration_seconds{{{labels},quantile="{percent / 100}"}} {value / 1_000_000:.6f}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {stats.latency.total_us / 1_000_000:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {stats.latency.count}")
+        lines.append("# HELP http_responses_total Responses by route and status code")
+        lines.append("# TYPE http_responses_total counter")
+        for (method, route), stats in items:
+            for status, count in sorted(stats.status_codes.items()):
+                lines.append(f'http_responses_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+def _route_label(scope) -> str:
+    """Templated route path for a finished request, so labels stay low-cardinality"""
+    # Routes reached through include_router keep their own path; FastAPI records the prefixed one here
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    if getattr(context, "path", None):
+        return scope.get("root_path", "") + context.path
+    route = scope.get("route")
+    if route is not None and hasattr(route, "path"):
+        return scope.get("root_path", "") + route.path
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is not None and app is not None:
+        for candidate in getattr(app, "routes", []):
+            if getattr(candidate, "endpoint", None) is endpoint:
+                return candidate.path
+    return "unmatched"
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status codes and in-flight counts per route"""
+
+    def __init__(self, app, metrics: Optional[RequestMetrics] = None):
+        self.app = app
+        self.metrics = metrics or request_metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.in_flight -= 1
+            metrics.observe(scope["method"], _route_label(scope), status_code, time.perf_counter() - start)
+
+# Global request metrics instance
+request_metrics = RequestMetrics()
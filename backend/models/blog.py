@@ -1,19 +1,50 @@
-from sqlalchemy import Column, String, Text, ARRAY, JSON, Boolean
+from sqlalchemy import Column, Index, String, Text, JSON, Boolean, Integer, literal_column
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from database import postgres_ddl
 from models.base import BaseModel
 
 class BlogPost(BaseModel):
     """Blog post model"""
     __tablename__ = "blog_posts"
+    # Keyset pagination order for list endpoints
+    __table_args__ = (Index("ix_blog_posts_created_at_id", "created_at", "id"),)
     
     title = Column(String(255), nullable=False, index=True)
     content = Column(Text, nullable=False)
+    # Rendered from content when the post is written
+    content_html = Column(Text)
     excerpt = Column(Text)
     slug = Column(String(255), unique=True, index=True)
     author = Column(String(100), default="Admin")
-    tags = Column(ARRAY(String), default=[])
+    # JSON on SQLite so the table also works on local stand-in databases; the Postgres
+    # ARRAY type provides the @> containment operator used by the tag filter
+    tags = Column(ARRAY(String).with_variant(JSON(), "sqlite"), default=[])
     featured_image = Column(String(500))
+    word_count = Column(Integer, default=0)
+    read_time = Column(Integer, default=0)
     published = Column(Boolean, default=False)
     meta_data = Column(JSON, default={})
     
     def __repr__(self):
-        return f"<BlogPost(id={self.id}, title='{self.title}')>" 
\ No newline at end of file
+        return f"<BlogPost(id={self.id}, title='{self.title}')>"
+
+# Weighted search document: title matches (A) rank above content matches (B)
+SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'B')"
+)
+
+# Maintained by Postgres on every write; not mapped so SQLite stand-ins can create the table
+search_vector = literal_column("blog_posts.search_vector", type_=TSVECTOR)
+
+postgres_ddl.extend([
+    "ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS read_time INTEGER DEFAULT 0",
+    "ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS content_html TEXT",
+    "ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS word_count INTEGER DEFAULT 0",
+    f"ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS ({SEARCH_DOCUMENT}) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_blog_posts_search_vector ON blog_posts USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_blog_posts_created_at_id ON blog_posts (created_at, id)",
+    # Serves the tags @> ARRAY[...] filter used by ?tag=
+    "CREATE INDEX IF NOT EXISTS ix_blog_posts_tags ON blog_posts USING GIN (tags)",
+])
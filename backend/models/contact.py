@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, Text, Boolean
+from models.base import BaseModel
+
+class Contact(BaseModel):
+    """Contact form submission model"""
+    __tablename__ = "contacts"
+
+    REQUIRED_FIELDS = ("name", "email", "subject", "message")
+
+    name = Column(String(255), nullable=False)
+    email = Column(String(255), nullable=False, index=True)
+    subject = Column(String(255), nullable=False)
+    message = Column(Text, nullable=False)
+    phone = Column(String(50))
+    company = Column(String(255))
+    source = Column(String(100), default="website", index=True)
+    is_read = Column(Boolean, default=False, index=True)
+
+    def __init__(self, **kwargs):
+        missing = [field for field in self.REQUIRED_FIELDS if not kwargs.get(field)]
+        if missing:
+            raise ValueError(f"Missing required contact fields: {', '.join(missing)}")
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<Contact(id={self.id}, email='{self.email}')>"
@@ -1,19 +1,25 @@
-from sqlalchemy import Column, String, Text, ARRAY, JSON, Boolean
+from sqlalchemy import Column, Index, String, Text, ARRAY, JSON, Boolean
+from database import postgres_ddl
 from models.base import BaseModel
 
 class Project(BaseModel):
     """Project model for portfolio projects"""
     __tablename__ = "projects"
+    # Keyset pagination order for list endpoints
+    __table_args__ = (Index("ix_projects_created_at_id", "created_at", "id"),)
     
     title = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=False)
     image_url = Column(String(500))
     github_url = Column(String(500))
     live_url = Column(String(500))
-    technologies = Column(ARRAY(String), default=[])
+    # JSON on SQLite so the table also works on local stand-in databases
+    technologies = Column(ARRAY(String).with_variant(JSON(), "sqlite"), default=[])
     category = Column(String(100), index=True)
     featured = Column(Boolean, default=False)
     meta_data = Column(JSON, default={})
     
     def __repr__(self):
-        return f"<Project(id={self.id}, title='{self.title}')>" 
\ No newline at end of file
+        return f"<Project(id={self.id}, title='{self.title}')>"
+
+postgres_ddl.append("CREATE INDEX IF NOT EXISTS ix_projects_created_at_id ON projects (created_at, id)")
@@ -0,0 +1,252 @@
+import asyncio
+import json
+import math
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+
+from config import settings
+
+# Bodies larger than this are not read to find a session id
+MAX_PEEK_BYTES = 64 * 1024
+# Retry-After ceiling, also used when a bucket never refills
+MAX_RETRY_AFTER = 3600
+
+class BucketTable:
+    """Token buckets keyed by client, refilled lazily on access
+
+    ``rate`` tokens per second up to ``burst``.  Only the ``max_keys`` most
+    recently seen keys are kept; an evicted key would have refilled to a full
+    bucket anyway once it has been idle for ``burst / rate`` seconds.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 100_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def take(self, key: str, now: float, cost: float = 1.0) -> float:
+        """Spend ``cost`` tokens; returns 0 when allowed, else seconds until enough tokens refill"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        if bucket[0] >= cost:
+            bucket[0] -= cost
+            return 0.0
+        return (cost - bucket[0]) / self.rate if self.rate > 0 else math.inf
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+@dataclass
+class RateLimitRule:
+    """A budget shared by a group of routes, enforced per client IP and per session"""
+    name: str
+    paths: Tuple[str, ...]
+    ip: BucketTable
+    session: BucketTable
+    methods: Tuple[str, ...] = ("POST",)
+    # Look for "session_id" in small JSON bodies when no header or cookie carries one
+    session_from_body: bool = False
+    limited: int = 0
+    shed: int = 0
+
+    def matches(self, method: str, path: str) -> bool:
+        return method in self.methods and path.rstrip("/") in self.paths
+
+class LoopLagMonitor:
+    """Event-loop lag: how long a callback queued now waits before it runs
+
+    Each ``sample`` queues one ``call_soon`` callback and records its delay,
+    so no background task is needed.  Readings older than ``max_age`` seconds
+    count as no lag, so shedding stops once traffic calms down.
+    """
+
+    def __init__(self, max_age: float = 1.0):
+        self.max_age = max_age
+        self._lag = 0.0
+        self._sampled_at = 0.0
+
+    def sample(self):
+        loop = asyncio.get_running_loop()
+        loop.call_soon(self._record, loop, loop.time())
+
+    def _record(self, loop, queued_at: float):
+        late = loop.time() - queued_at
+        # Smooth so one slow tick does not flip shedding on and off
+        self._lag = max(late, self._lag * 0.7 + late * 0.3)
+        self._sampled_at = time.monotonic()
+
+    @property
+    def lag(self) -> float:
+        if time.monotonic() - self._sampled_at > self.max_age:
+            return 0.0
+        return self._lag
+
+def default_rules() -> List[RateLimitRule]:
+    return [
+        RateLimitRule(
+            "chat", ("/api/chatbot/chat",),
+            ip=BucketTable(settings.rate_limit_chat_ip_rate, settings.rate_limit_chat_ip_burst),
+            session=BucketTable(settings.rate_limit_chat_session_rate, settings.rate_limit_chat_session_burst),
+            session_from_body=True,
+        ),
+        RateLimitRule(
+            "demos", ("/api/demos/sentiment-analysis", "/api/demos/data-visualization",
+                      "/api/demos/image-classification"),
+            ip=BucketTable(settings.rate_limit_demo_ip_rate, settings.rate_limit_demo_ip_burst),
+            session=BucketTable(settings.rate_limit_demo_session_rate, settings.rate_limit_demo_session_burst),
+        ),
+    ]
+
+async def _send_error(send, status: int, detail: str, retry_after: float):
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(min(retry_after, MAX_RETRY_AFTER)))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+class RateLimitMiddleware:
+    """Per-IP and per-session token buckets for the expensive routes, plus load shedding
+
+    Requests to a rule's routes spend a token from the client IP's bucket and,
+    when a session id is known (``X-Session-ID`` header, ``session_id`` cookie
+    or, for chat, the JSON body), from the session's bucket.  An empty bucket
+    gets 429 with ``Retry-After``.  While more than ``max_in_flight`` requests
+    are being served or the event loop lags by more than ``max_loop_lag``
+    seconds, those routes get 503 straight away so cheap requests stay fast.
+    """
+
+    def __init__(self, app, rules: Optional[List[RateLimitRule]] = None, max_in_flight: Optional[int] = None,
+                 max_loop_lag: Optional[float] = None, trust_forwarded_for: Optional[bool] = None,
+                 enabled: Optional[bool] = None, clock: Callable[[], float] = time.monotonic):
+        self.app = app
+        self.rules = rules if rules is not None else default_rules()
+        self.max_in_flight = max_in_flight if max_in_flight is not None else settings.shed_max_in_flight
+        self.max_loop_lag = max_loop_lag if max_loop_lag is not None else settings.shed_max_loop_lag_ms / 1000
+        self.trust_forwarded_for = (trust_forwarded_for if trust_forwarded_for is not None
+                                    else settings.trust_forwarded_for)
+        self.enabled = enabled if enabled is not None else settings.rate_limit_enabled
+        self.clock = clock
+        self.in_flight = 0
+        self.lag_monitor = LoopLagMonitor()
+        rate_limiters.add(self)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+        self.lag_monitor.sample()
+        rule = next((r for r in self.rules if r.matches(scope["method"], scope["path"])), None)
+        if rule is not None:
+            if self.in_flight >= self.max_in_flight or self.lag_monitor.lag > self.max_loop_lag:
+                rule.shed += 1
+                await _send_error(send, 503, "Server busy, retry shortly", 1)
+                return
+            headers = Headers(scope=scope)
+            session = _session_from_headers(headers)
+            if session is None and rule.session_from_body:
+                session, receive = await _session_from_body(headers, receive)
+            retry_after = self._take(rule, self._client_ip(scope, headers), session)
+            if retry_after:
+                rule.limited += 1
+                await _send_error(send, 429, "Too many requests", retry_after)
+                return
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    def _take(self, rule: RateLimitRule, ip: str, session: Optional[str]) -> float:
+        now = self.clock()
+        retry_after = rule.ip.take(ip, now)
+        if retry_after:
+            return retry_after
+        if session is not None:
+            return rule.session.take(session, now)
+        return 0.0
+
+    def _client_ip(self, scope, headers: Headers) -> str:
+        if self.trust_forwarded_for:
+            forwarded = headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",", 1)[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "loop_lag_ms": round(self.lag_monitor.lag * 1000, 2),
+            "rules": {
+                rule.name: {"limited": rule.limited, "shed": rule.shed,
+                            "tracked_ips": len(rule.ip), "tracked_sessions": len(rule.session)}
+                for rule in self.rules
+            },
+        }
+
+def _session_from_headers(headers: Headers) -> Optional[str]:
+    session = headers.get("x-session-id")
+    if session:
+        return session
+    for part in headers.get("cookie", "").split(";"):
+        name, _, value = part.strip().partition("=")
+        if name == "session_id" and value:
+            return value
+    return None
+
+async def _session_from_body(headers: Headers, receive) -> Tuple[Optional[str], Any]:
+    """Read a small JSON body for its session_id and hand the app a receive that replays it"""
+    try:
+        length = int(headers.get("content-length", ""))
+    except ValueError:
+        return None, receive
+    if length > MAX_PEEK_BYTES or "json" not in headers.get("content-type", ""):
+        return None, receive
+
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            return None, _replay(message, receive)
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    body = b"".join(chunks)
+    try:
+        session = json.loads(body).get("session_id")
+    except (ValueError, AttributeError):
+        session = None
+    return (str(session) if session else None), _replay({"type": "http.request", "body": body}, receive)
+
+def _replay(message: dict, receive):
+    messages = [message]
+
+    async def replay():
+        if messages:
+            return messages.pop(0)
+        return await receive()
+
+    return replay
+
+# Live middleware instances, for reporting
+rate_limiters: "weakref.WeakSet[RateLimitMiddleware]" = weakref.WeakSet()
@@ -0,0 +1,136 @@
+import html
+import math
+import re
+from typing import Any, Dict, List, Optional
+
+try:
+    import markdown as _markdown
+    from markdown.extensions import Extension
+    from markdown.treeprocessors import Treeprocessor
+except ImportError:
+    _markdown = None
+
+WORDS_PER_MINUTE = 200
+EXCERPT_CHARS = 200
+
+# Link and image targets allowed besides relative URLs; anything else (javascript:, data:, ...) is dropped
+SAFE_SCHEMES = ("http", "https", "mailto")
+_URL_IGNORED = re.compile(r"[\x00-\x20\x7f]+")
+
+def safe_url(url: str) -> Optional[str]:
+    """``url`` if it is relative or uses an allowed scheme, else None"""
+    # Browsers ignore entities, whitespace and control characters inside a scheme
+    cleaned = _URL_IGNORED.sub("", html.unescape(url))
+    scheme, colon, _ = cleaned.partition(":")
+    if not colon or any(c in scheme for c in "/?#"):
+        return url
+    return url if scheme.lower() in SAFE_SCHEMES else None
+
+_FENCE = re.compile(r"^```")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+_LIST_ITEM = re.compile(r"^\s*(?:[-*+]|\d+\.)\s+(.*)$")
+_INLINE = [
+    (re.compile(r"`([^`]+)`"), r"<code>\1</code>"),
+    (re.compile(r"\*\*([^*]+)\*\*"), r"<strong>\1</strong>"),
+    (re.compile(r"\*([^*]+)\*"), r"<em>\1</em>"),
+    (re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)"), lambda m: _link(*m.groups())),
+]
+_MARKUP = re.compile(r"```[^\n]*|[#>*_`]+|!?\[([^\]]*)\]\([^)]*\)")
+
+def _link(label: str, escaped_url: str) -> str:
+    url = safe_url(html.unescape(escaped_url))
+    return f'<a href="{html.escape(url)}">{label}</a>' if url is not None else label
+
+def _inline(text: str) -> str:
+    text = html.escape(text, quote=False)
+    for pattern, replacement in _INLINE:
+        text = pattern.sub(replacement, text)
+    return text
+
+def _render_basic(text: str) -> str:
+    """Small Markdown subset (headings, lists, fenced code, emphasis, links) used without python-markdown"""
+    blocks: List[str] = []
+    paragraph: List[str] = []
+    items: List[str] = []
+    code: Optional[List[str]] = None
+
+    def flush():
+        if paragraph:
+            blocks.append(f"<p>{_inline(' '.join(paragraph))}</p>")
+            paragraph.clear()
+        if items:
+            blocks.append("<ul>" + "".join(f"<li>{_inline(item)}</li>" for item in items) + "</ul>")
+            items.clear()
+
+    for line in text.splitlines():
+        if code is not None:
+            if _FENCE.match(line):
+                blocks.append(f"<pre><code>{html.escape(chr(10).join(code), quote=False)}</code></pre>")
+                code = None
+            else:
+                code.append(line)
+        elif _FENCE.match(line):
+            flush()
+            code = []
+        elif not line.strip():
+            flush()
+        elif _HEADING.match(line):
+            flush()
+            hashes, title = _HEADING.match(line).groups()
+            blocks.append(f"<h{len(hashes)}>{_inline(title)}</h{len(hashes)}>")
+        elif _LIST_ITEM.match(line):
+            if paragraph:
+                flush()
+            items.append(_LIST_ITEM.match(line).group(1))
+        else:
+            if items:
+                flush()
+            paragraph.append(line.strip())
+    if code is not None:
+        blocks.append(f"<pre><code>{html.escape(chr(10).join(code), quote=False)}</code></pre>")
+    flush()
+    return "\n".join(blocks)
+
+if _markdown is not None:
+    class _UnsafeUrls(Treeprocessor):
+        def run(self, root):
+            for element in root.iter():
+                for attribute in ("href", "src"):
+                    value = element.get(attribute)
+                    if value is not None and safe_url(value) is None:
+                        del element.attrib[attribute]
+
+    class _SafeHTML(Extension):
+        """Escape raw HTML instead of passing it through, and drop unsafe link targets"""
+
+        def extendMarkdown(self, md):
+            md.preprocessors.deregister("html_block")
+            md.inlinePatterns.deregister("html")
+            md.treeprocessors.register(_UnsafeUrls(md), "unsafe_urls", 0)
+
+def render_markdown(text: str) -> str:
+    """Render Markdown to HTML; raw HTML in the source is escaped, never passed through"""
+    if _markdown is not None:
+        return _markdown.markdown(text or "", extensions=["fenced_code", "tables", _SafeHTML()], output_format="html")
+    return _render_basic(text or "")
+
+def plain_text(text: str) -> str:
+    """Markdown with the markup stripped, for counting and excerpts"""
+    return " ".join(_MARKUP.sub(lambda m: m.group(1) or " ", text or "").split())
+
+def make_excerpt(text: str, max_chars: int = EXCERPT_CHARS) -> str:
+    """First ``max_chars`` of the plain text, cut at a word boundary"""
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0].rstrip(",.;:") + "…"
+
+def render_post(content: str, excerpt: Optional[str] = None) -> Dict[str, Any]:
+    """Everything derived from a post body, computed once when the post is written"""
+    text = plain_text(content)
+    word_count = len(text.split())
+    return {
+        "content_html": render_markdown(content),
+        "excerpt": excerpt or make_excerpt(text),
+        "word_count": word_count,
+        "read_time": max(1, math.ceil(word_count / WORDS_PER_MINUTE)),
+    }
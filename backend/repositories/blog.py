@@ -0,0 +1,352 @@
+import hashlib
+import html
+import json
+import logging
+import re
+import secrets
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import String, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
+
+from cache import SingleFlight
+from config import settings
+from database import AsyncSessionLocal, lock_for_seeding
+from models.blog import BlogPost, search_vector
+from repositories.pagination import Position, after_position, as_utc, page_from_rows, page_sorted, position
+from repositories.project import DATABASE_ERRORS, RepositoryUnavailable
+from rendering import render_post
+
+logger = logging.getLogger(__name__)
+
+# Must match the configuration used to build blog_posts.search_vector
+SEARCH_CONFIG = cast(literal("english"), REGCONFIG)
+# ts_headline marks matches with these sentinels; its output is escaped before they become <mark> tags
+_MARK_START = f"markstart{secrets.token_hex(8)}"
+_MARK_STOP = f"markstop{secrets.token_hex(8)}"
+HEADLINE_OPTIONS = f"StartSel={_MARK_START}, StopSel={_MARK_STOP}, MaxWords=35, MinWords=15, MaxFragments=2"
+
+SNIPPET_WORDS = 30
+TITLE_WEIGHT = 1.0
+CONTENT_WEIGHT = 0.4
+
+class DuplicatePost(Exception):
+    """Raised when a post with the same slug already exists"""
+
+# Columns served by list endpoints; content and content_html are never loaded for them
+SUMMARY_COLUMNS = (
+    BlogPost.id, BlogPost.title, BlogPost.slug, BlogPost.excerpt, BlogPost.tags, BlogPost.author,
+    BlogPost.featured_image, BlogPost.created_at, BlogPost.updated_at, BlogPost.read_time, BlogPost.word_count,
+)
+SUMMARY_FIELDS = tuple(column.key for column in SUMMARY_COLUMNS)
+
+def post_to_summary(post: BlogPost) -> Dict[str, Any]:
+    """Listing projection; safe on rows loaded with ``load_only(*SUMMARY_COLUMNS)``"""
+    return {
+        "id": post.id,
+        "title": post.title,
+        "slug": post.slug,
+        "excerpt": post.excerpt,
+        "tags": list(post.tags or []),
+        "author": post.author,
+        "featured_image": post.featured_image,
+        "created_at": as_utc(post.created_at),
+        "updated_at": as_utc(post.updated_at or post.created_at),
+        "read_time": post.read_time or 0,
+        "word_count": post.word_count or 0,
+    }
+
+def post_to_dict(post: BlogPost) -> Dict[str, Any]:
+    """Plain dict of the columns exposed by the API"""
+    return {
+        **post_to_summary(post),
+        "content": post.content,
+        "content_html": post.content_html,
+    }
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"\w+", (text or "").lower())
+
+def _highlight(content: str, terms: set) -> str:
+    """Escaped window of content around the first matching term, with matches wrapped in <mark>"""
+    words = (content or "").split()
+    first = next((i for i, word in enumerate(words) if set(_words(word)) & terms), 0)
+    start = max(0, first - SNIPPET_WORDS // 3)
+    fragment = [
+        f"<mark>{html.escape(word)}</mark>" if set(_words(word)) & terms else html.escape(word)
+        for word in words[start:start + SNIPPET_WORDS]
+    ]
+    return ("... " if start else "") + " ".join(fragment)
+
+def _headline_snippet(headline: Optional[str]) -> str:
+    """Escape raw post content from ts_headline, then turn its sentinels into <mark> tags"""
+    return html.escape(headline or "").replace(_MARK_START, "<mark>").replace(_MARK_STOP, "</mark>")
+
+def search_posts_in_memory(posts: List[Dict[str, Any]], q: str,
+                           offset: int, limit: int) -> Tuple[int, List[Dict[str, Any]]]:
+    """Term-frequency search used on SQLite stand-ins and while the database is down"""
+    terms = set(_words(q))
+    if not terms:
+        return 0, []
+    scored = []
+    for post in posts:
+        title_words, content_words = _words(post["title"]), _words(post["content"])
+        if not terms <= set(title_words) | set(content_words):
+            continue
+        rank = (TITLE_WEIGHT * sum(word in terms for word in title_words)
+                + CONTENT_WEIGHT * sum(word in terms for word in content_words)) / len(terms)
+        scored.append((rank, post))
+    scored.sort(key=lambda item: (-item[0], item[1]["id"]))
+    return len(scored), [
+        _search_hit(post, rank, _highlight(post["content"], terms))
+        for rank, post in scored[offset:offset + limit]
+    ]
+
+def _search_hit(post: Dict[str, Any], rank: float, snippet: str) -> Dict[str, Any]:
+    return {
+        "id": post["id"],
+        "title": post["title"],
+        "slug": post["slug"],
+        "excerpt": post["excerpt"],
+        "tags": list(post["tags"] or []),
+        "author": post["author"],
+        "created_at": post["created_at"],
+        "rank": round(float(rank), 6),
+        "snippet": snippet,
+    }
+
+class TagIndex:
+    """Tag to post count, rebuilt from the database and updated in place on writes"""
+
+    def __init__(self, posts_tags: Iterable[Iterable[str]] = ()):
+        self.loaded_at = time.time()
+        self.counts: Dict[str, int] = {}
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._version = ""
+        for tags in posts_tags:
+            self.add(tags)
+
+    def add(self, tags: Iterable[str]):
+        for tag in set(tags or ()):
+            self.counts[tag] = self.counts.get(tag, 0) + 1
+        self._snapshot = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Sorted tag names and their counts, rebuilt only after a change"""
+        if self._snapshot is None:
+            names = sorted(self.counts)
+            self._snapshot = {"tags": names, "counts": {name: self.counts[name] for name in names}}
+            self._version = hashlib.sha256(json.dumps(self._snapshot["counts"]).encode("utf-8")).hexdigest()
+        return self._snapshot
+
+    @property
+    def version(self) -> str:
+        """Content hash of the counts, for ETags"""
+        self.snapshot()
+        return self._version
+
+class BlogRepository:
+    """Blog posts stored in the database, with ranked full-text search
+
+    The seed posts are inserted into an empty table on first use and served
+    read-only while the database cannot be reached.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, seed: Optional[List[Dict[str, Any]]] = None,
+                 tags_refresh_interval: Optional[float] = None):
+        self.session_factory = session_factory
+        # Rendered once here, for seeding and for serving while the database is down
+        self.seed = [{**render_post(row["content"], row.get("excerpt")), **row} for row in seed or []]
+        self.tags_refresh_interval = (tags_refresh_interval if tags_refresh_interval is not None
+                                      else settings.blog_tags_refresh_seconds)
+        self._seeded = False
+        self._flight = SingleFlight()
+        self._tag_index: Optional[TagIndex] = None
+        self._writes = 0
+
+    async def _ensure_seeded(self):
+        if not self._seeded:
+            await self._flight.do("seed", self._seed_if_empty)
+
+    async def _seed_if_empty(self):
+        async with self.session_factory() as session:
+            if self.seed and not (await session.execute(select(func.count(BlogPost.id)))).scalar():
+                await lock_for_seeding(session, BlogPost.__tablename__)
+                # Another worker may have seeded while this one waited for the lock
+                if not (await session.execute(select(func.count(BlogPost.id)))).scalar():
+                    session.add_all(BlogPost(**self._seed_columns(row)) for row in self.seed)
+                    logger.info(f"Seeded {len(self.seed)} blog posts")
+                await session.commit()
+        self._seeded = True
+
+    @staticmethod
+    def _active():
+        return BlogPost.is_active.isnot(False)
+
+    @staticmethod
+    def _has_tag(session, tag: str):
+        if session.bind.dialect.name == "postgresql":
+            return BlogPost.tags.contains([tag])
+        # SQLite stores tags as a JSON array
+        return func.instr(cast(BlogPost.tags, String), json.dumps(tag)) > 0
+
+    def _seed_posts(self, tag: Optional[str] = None) -> List[Dict[str, Any]]:
+        return sorted((post for post in self.seed if tag is None or tag in post["tags"]), key=position)
+
+    async def list(self, tag: Optional[str] = None, limit: Optional[int] = None,
+                   after: Optional[Position] = None,
+                   include_content: bool = False) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One page of posts in (created_at, id) order and the cursor for the next page
+
+        Without ``include_content`` only the summary columns are read from the table.
+        """
+        to_dict = post_to_dict if include_content else post_to_summary
+        try:
+            await self._ensure_seeded()
+            async with self.session_factory() as session:
+                stmt = select(BlogPost).where(self._active()).order_by(BlogPost.created_at, BlogPost.id)
+                if not include_content:
+                    stmt = stmt.options(load_only(*SUMMARY_COLUMNS))
+                if tag:
+                    stmt = stmt.where(self._has_tag(session, tag))
+                if after:
+                    stmt = stmt.where(after_position(BlogPost, after))
+                if limit:
+                    stmt = stmt.limit(limit + 1)
+                posts = [to_dict(post) for post in (await session.execute(stmt)).scalars()]
+        except DATABASE_ERRORS as e:
+            logger.warning(f"Blog database unavailable, serving seed data: {e}")
+            posts = self._seed_posts(tag)
+            if not include_content:
+                posts = [{field: post[field] for field in SUMMARY_FIELDS if field in post} for post in posts]
+            return page_sorted(posts, after, limit or len(posts))
+        return page_from_rows(posts, limit) if limit else (posts, None)
+
+    async def list_version(self) -> Tuple[int, Optional[datetime]]:
+        """Active post count and latest update: one aggregate query that changes with every write"""
+        try:
+            await self._ensure_seeded()
+            async with self.session_factory() as session:
+                count, latest = (await session.execute(
+                    select(func.count(BlogPost.id), func.max(BlogPost.updated_at)).where(self._active())
+                )).one()
+                return count, as_utc(latest) if latest else None
+        except DATABASE_ERRORS as e:
+            logger.warning(f"Blog database unavailable, serving seed data: {e}")
+            return len(self.seed), max((post["updated_at"] for post in self.seed), default=None)
+
+    async def get(self, slug: str) -> Optional[Dict[str, Any]]:
+        try:
+            await self._ensure_seeded()
+            async with self.session_factory() as session:
+                post = (await session.execute(
+                    select(BlogPost).where(BlogPost.slug == slug, self._active())
+                )).scalar_one_or_none()
+                return post_to_dict(post) if post else None
+        except DATABASE_ERRORS as e:
+            logger.warning(f"Blog database unavailable, serving seed data: {e}")
+            return next((post for post in self.seed if post["slug"] == slug), None)
+
+    async def tag_index(self) -> TagIndex:
+        """Tag counts, reloaded when missing or older than the refresh interval"""
+        index = self._tag_index
+        if index is None or time.time() - index.loaded_at >= self.tags_refresh_interval:
+            index = await self._flight.do("tags", self._load_tag_index)
+        return index
+
+    async def _load_tag_index(self) -> TagIndex:
+        writes = self._writes
+        try:
+            await self._ensure_seeded()
+            async with self.session_factory() as session:
+                index = TagIndex((await session.execute(select(BlogPost.tags).where(self._active()))).scalars())
+        except DATABASE_ERRORS as e:
+            logger.warning(f"Blog database unavailable, counting seed tags: {e}")
+            index = TagIndex(post["tags"] for post in self.seed)
+        if writes != self._writes:
+            # A post was created while loading and may be missing; reload on next use
+            index.loaded_at = 0
+        self._tag_index = index
+        return index
+
+    async def search(self, q: str, page: int = 1, page_size: int = 10) -> Dict[str, Any]:
+        """Ranked full-text search with highlighted snippets, one page at a time"""
+        offset = (page - 1) * page_size
+        try:
+            await self._ensure_seeded()
+            async with self.session_factory() as session:
+                if session.bind.dialect.name == "postgresql":
+                    total, hits = await self._search_postgres(session, q, offset, page_size)
+                else:
+                    posts = [post_to_dict(p) for p in (await session.execute(
+                        select(BlogPost).where(self._active())
+                    )).scalars()]
+                    total, hits = search_posts_in_memory(posts, q, offset, page_size)
+        except DATABASE_ERRORS as e:
+            logger.warning(f"Blog database unavailable, searching seed data: {e}")
+            total, hits = search_posts_in_memory(self.seed, q, offset, page_size)
+        return {"query": q, "page": page, "page_size": page_size, "total": total, "results": hits}
+
+    def search_statements(self, q: str, offset: int, limit: int):
+        """Postgres statements for one page of ranked hits and for the total match count"""
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        rank = func.ts_rank(search_vector, query)
+        matches = (self._active(), search_vector.op("@@")(query))
+        # Rank and page on the GIN index first so ts_headline only runs for the rows returned
+        page = (
+            select(BlogPost.id, rank.label("rank"), func.count().over().label("total"))
+            .where(*matches)
+            .order_by(rank.desc(), BlogPost.id)
+            .offset(offset)
+            .limit(limit)
+            .subquery()
+        )
+        hits = (
+            select(BlogPost, page.c.rank, page.c.total,
+                   func.ts_headline(SEARCH_CONFIG, BlogPost.content, query, HEADLINE_OPTIONS).label("snippet"))
+            .join(page, page.c.id == BlogPost.id)
+            .order_by(page.c.rank.desc(), BlogPost.id)
+            .options(load_only(*SUMMARY_COLUMNS))
+        )
+        return hits, select(func.count()).where(*matches)
+
+    async def _search_postgres(self, session, q: str, offset: int, limit: int):
+        hits, count = self.search_statements(q, offset, limit)
+        rows = (await session.execute(hits)).all()
+        if rows:
+            total = rows[0].total
+        else:
+            # Past the last page the window count is not available
+            total = (await session.execute(count)).scalar() if offset else 0
+        return total, [_search_hit(post_to_summary(row.BlogPost), row.rank, _headline_snippet(row.snippet)) for row in rows]
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a post; raises DuplicatePost if the slug is taken"""
+        try:
+            await self._ensure_seeded()
+            async with self.session_factory() as session:
+                # Microsecond timestamps from Python on every backend keep keyset cursors exact
+                post = BlogPost(published=True, created_at=datetime.now(timezone.utc), **data)
+                session.add(post)
+                await session.commit()
+                await session.refresh(post)
+                created = post_to_dict(post)
+        except IntegrityError as e:
+            raise DuplicatePost(data.get("slug")) from e
+        except DATABASE_ERRORS as e:
+            raise RepositoryUnavailable(str(e)) from e
+        self._writes += 1
+        if self._tag_index is not None:
+            self._tag_index.add(created["tags"])
+        return created
+
+    @staticmethod
+    def _seed_columns(row: Dict[str, Any]) -> Dict[str, Any]:
+        columns = {key: value for key, value in row.items() if key not in ("id", "updated_at")}
+        columns["created_at"] = as_utc(columns.get("created_at") or datetime.now(timezone.utc))
+        columns.setdefault("published", True)
+        return columns
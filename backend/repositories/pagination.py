@@ -0,0 +1,53 @@
+import base64
+import json
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+# Position in the (created_at, id) ordering shared by every list endpoint
+Position = Tuple[datetime, int]
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded"""
+
+def as_utc(value: datetime) -> datetime:
+    """Naive timestamps (SQLite stand-ins, old rows) are taken as UTC so they compare with aware ones"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque token for the position after (created_at, id)"""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Position:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return as_utc(datetime.fromisoformat(created_at)), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+
+def position(row: Dict[str, Any]) -> Position:
+    return as_utc(row["created_at"]), row["id"]
+
+def after_position(model, after: Position):
+    """Row-value predicate that seeks the (created_at, id) composite index"""
+    return tuple_(model.created_at, model.id) > tuple_(*after)
+
+def page_from_rows(rows: List[Dict[str, Any]], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Trim a ``limit + 1`` fetch to one page and the cursor for the next"""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(*position(rows[-1]))
+    return rows, None
+
+def page_sorted(rows: List[Dict[str, Any]], after: Optional[Position], limit: int,
+                key: Callable[[Dict[str, Any]], Position] = position) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Keyset page over rows already sorted by (created_at, id), found by binary search"""
+    start = bisect_right(rows, (as_utc(after[0]), after[1]), key=key) if after else 0
+    return page_from_rows(rows[start:start + limit + 1], limit)
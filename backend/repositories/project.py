@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from cache import SingleFlight
+from config import settings
+from database import AsyncSessionLocal, lock_for_seeding
+from models.project import Project
+from repositories.pagination import DEFAULT_PAGE_SIZE, Position, as_utc, page_sorted, position
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the database is unreachable rather than the request being wrong
+DATABASE_ERRORS = (SQLAlchemyError, OSError, asyncio.TimeoutError)
+
+class RepositoryUnavailable(Exception):
+    """Raised when a write needs the database and it cannot be reached"""
+
+class ProjectReadModel:
+    """In-process snapshot of the projects table indexed by id, category and featured"""
+
+    def __init__(self, rows: Iterable[Dict[str, Any]] = (), source: str = "database"):
+        self.source = source
+        self.loaded_at = time.time()
+        self.all: List[Dict[str, Any]] = sorted(rows, key=position)
+        self.by_id: Dict[int, Dict[str, Any]] = {row["id"]: row for row in self.all}
+        self.by_category: Dict[str, List[Dict[str, Any]]] = {}
+        self.featured: List[Dict[str, Any]] = []
+        for row in self.all:
+            self.by_category.setdefault(row["category"], []).append(row)
+            if row.get("featured"):
+                self.featured.append(row)
+        self.category_names: List[str] = sorted(self.by_category)
+        # Content hash used for strong ETags; changes whenever any served field changes
+        self.version: str = hashlib.sha256(
+            json.dumps(self.all, default=str, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        self.last_modified: Optional[datetime] = max(
+            (row["updated_at"] or row["created_at"] for row in self.all), default=None
+        )
+
+    def get(self, project_id: int) -> Optional[Dict[str, Any]]:
+        return self.by_id.get(project_id)
+
+    def list(self, category: Optional[str] = None, featured: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """Projects in creation order, filtered through the prebuilt indexes"""
+        rows = self.by_category.get(category, []) if category else self.all
+        if featured is True:
+            rows = [row for row in rows if row.get("featured")] if category else self.featured
+        elif featured is False:
+            rows = [row for row in rows if not row.get("featured")]
+        return rows
+
+    def page(self, category: Optional[str] = None, featured: Optional[bool] = None,
+             after: Optional[Position] = None, limit: int = DEFAULT_PAGE_SIZE):
+        """Keyset page of ``list()`` found by binary search, and the cursor for the next page"""
+        return page_sorted(self.list(category=category, featured=featured), after, limit)
+
+    def categories(self) -> List[str]:
+        return self.category_names
+
+def project_to_dict(project: Project) -> Dict[str, Any]:
+    """Plain dict of the columns exposed by the API"""
+    return {
+        "id": project.id,
+        "title": project.title,
+        "description": project.description,
+        "technologies": list(project.technologies or []),
+        "github_url": project.github_url,
+        "live_url": project.live_url,
+        "image_url": project.image_url,
+        "category": project.category,
+        "featured": bool(project.featured),
+        "created_at": as_utc(project.created_at),
+        "updated_at": as_utc(project.updated_at or project.created_at),
+    }
+
+class ProjectRepository:
+    """Projects stored in the database and served from an in-memory read model
+
+    The read model is rebuilt after every write made through this process and
+    reloaded every ``refresh_interval`` seconds to pick up writes made by
+    other workers.  If the database cannot be reached, the seed projects are
+    served read-only until it comes back.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, seed: Optional[List[Dict[str, Any]]] = None,
+                 refresh_interval: Optional[float] = None):
+        self.session_factory = session_factory
+        self.seed = seed or []
+        self.refresh_interval = refresh_interval if refresh_interval is not None else settings.projects_refresh_seconds
+        self._read_model: Optional[ProjectReadModel] = None
+        self._flight = SingleFlight()
+        self._load_seq = 0
+        self._installed_seq = 0
+
+    async def read_model(self) -> ProjectReadModel:
+        """Current read model, reloading it when missing or older than the refresh interval"""
+        model = self._read_model
+        if model is None or time.time() - model.loaded_at >= self.refresh_interval:
+            model = await self._flight.do("refresh", self.refresh)
+        return model
+
+    async def refresh(self) -> ProjectReadModel:
+        """Rebuild the read model from the database, seeding an empty table"""
+        self._load_seq += 1
+        seq = self._load_seq
+        try:
+            async with self.session_factory() as session:
+                if self.seed and not (await session.execute(select(func.count(Project.id)))).scalar():
+                    await lock_for_seeding(session, Project.__tablename__)
+                    # Another worker may have seeded while this one waited for the lock
+                    if not (await session.execute(select(func.count(Project.id)))).scalar():
+                        session.add_all(Project(**self._seed_columns(row)) for row in self.seed)
+                        logger.info(f"Seeded {len(self.seed)} projects")
+                    await session.commit()
+                result = await session.execute(
+                    select(Project).where(Project.is_active.isnot(False)).order_by(Project.created_at, Project.id)
+                )
+                model = ProjectReadModel(project_to_dict(p) for p in result.scalars())
+        except DATABASE_ERRORS as e:
+            logger.warning(f"Project database unavailable, serving seed data: {e}")
+            model = ProjectReadModel(self.seed, source="seed")
+        # A slower load that started before a write must not replace a newer snapshot
+        if seq > self._installed_seq:
+            self._read_model, self._installed_seq = model, seq
+        return self._read_model
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a project and refresh the read model"""
+        try:
+            async with self.session_factory() as session:
+                # Microsecond timestamps from Python on every backend keep keyset cursors exact
+                project = Project(created_at=datetime.now(timezone.utc), **data)
+                session.add(project)
+                await session.commit()
+                await session.refresh(project)
+                created = project_to_dict(project)
+        except DATABASE_ERRORS as e:
+            raise RepositoryUnavailable(str(e)) from e
+        await self.refresh()
+        return created
+
+    @staticmethod
+    def _seed_columns(row: Dict[str, Any]) -> Dict[str, Any]:
+        columns = {key: value for key, value in row.items() if key not in ("id", "updated_at")}
+        columns["created_at"] = as_utc(columns.get("created_at") or datetime.now(timezone.utc))
+        return columns
@@ -0,0 +1,160 @@
+import asyncio
+import importlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import APIRouter, FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+
+logger = logging.getLogger(__name__)
+
+def stub_router(method: str, path: str, payload: Dict[str, Any]) -> APIRouter:
+    """Router with one endpoint returning ``payload``, served when the real module fails to import"""
+    router = APIRouter()
+
+    async def endpoint():
+        return payload
+
+    router.add_api_route(path, endpoint, methods=[method.upper()])
+    return router
+
+@dataclass
+class RouterEntry:
+    """One route module: where it lives, where it is mounted and how its import went"""
+    name: str
+    module: str
+    prefix: str
+    lazy: bool = False
+    fallback: Optional[Callable[[], APIRouter]] = None
+    status: str = "pending"
+    import_seconds: Optional[float] = None
+    error: Optional[str] = None
+    routes: int = 0
+    _lock: Optional[asyncio.Lock] = field(default=None, repr=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "module": self.module,
+            "prefix": self.prefix,
+            "lazy": self.lazy,
+            "status": self.status,
+            "import_ms": round(self.import_seconds * 1000, 2) if self.import_seconds is not None else None,
+            "routes": self.routes,
+            "error": self.error,
+        }
+
+class _LazyMount(BaseRoute):
+    """Placeholder for a lazy module's routes: the first request under its prefix imports it"""
+
+    def __init__(self, registry: "RouterRegistry", app: FastAPI, entry: RouterEntry):
+        self.registry = registry
+        self.app = app
+        self.entry = entry
+
+    def matches(self, scope) -> tuple:
+        if scope["type"] != "http":
+            return Match.NONE, {}
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        prefix = self.entry.prefix
+        if path == prefix or path.startswith(prefix + "/"):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params: Any):
+        # The module's route names are unknown until it is imported; let the router try the others
+        raise NoMatchFound(name, path_params)
+
+    async def handle(self, scope, receive, send):
+        await self.registry.load(self.app, self.entry.name)
+        # The placeholder is gone now, so routing again reaches the module's own routes
+        await self.app.router(scope, receive, send)
+
+class RouterRegistry:
+    """Route modules imported one by one, each with its own fallback
+
+    A module that fails to import is replaced by its fallback router (or
+    nothing) without affecting the others.  Lazy modules are imported in a
+    worker thread on the first request under their prefix, so a slow import
+    does not hold up startup; the OpenAPI schema imports any still pending
+    so the docs are complete.  Until then ``url_path_for`` cannot resolve
+    their route names.  Import times are kept for ``snapshot``.
+    """
+
+    def __init__(self):
+        self.entries: Dict[str, RouterEntry] = {}
+
+    def register(self, name: str, module: str, prefix: str, lazy: bool = False,
+                 fallback: Optional[Callable[[], APIRouter]] = None):
+        self.entries[name] = RouterEntry(name, module, prefix, lazy, fallback)
+
+    def mount(self, app: FastAPI):
+        """Include every eager module now and a placeholder for each lazy one"""
+        for entry in self.entries.values():
+            if entry.lazy:
+                app.router.routes.append(_LazyMount(self, app, entry))
+            else:
+                self._include(app, entry, self._import(entry))
+        if any(entry.lazy for entry in self.entries.values()):
+            openapi = app.openapi
+
+            def openapi_with_lazy_routes() -> Dict[str, Any]:
+                self.load_pending(app)
+                return openapi()
+
+            app.openapi = openapi_with_lazy_routes
+
+    def load_pending(self, app: FastAPI):
+        """Import every lazy module not loaded yet, blocking; modules already loading are skipped"""
+        for entry in self.entries.values():
+            if entry.status == "pending" and entry.lazy and not (entry._lock and entry._lock.locked()):
+                self._install(app, entry, self._import(entry))
+
+    async def load(self, app: FastAPI, name: str):
+        """Import a lazy module (once, even under concurrent first requests) and swap in its routes"""
+        entry = self.entries[name]
+        if entry._lock is None:
+            entry._lock = asyncio.Lock()
+        async with entry._lock:
+            if entry.status != "pending":
+                return
+            self._install(app, entry, await asyncio.to_thread(self._import, entry))
+
+    def _install(self, app: FastAPI, entry: RouterEntry, router: Optional[APIRouter]):
+        """Swap a lazy module's placeholder for its routes"""
+        app.router.routes[:] = [
+            route for route in app.router.routes
+            if not (isinstance(route, _LazyMount) and route.entry is entry)
+        ]
+        self._include(app, entry, router)
+        # Regenerate the OpenAPI schema so the docs list the new routes
+        app.openapi_schema = None
+
+    def _import(self, entry: RouterEntry) -> Optional[APIRouter]:
+        start = time.perf_counter()
+        try:
+            router = importlib.import_module(entry.module).router
+        except Exception as e:
+            entry.status = "fallback" if entry.fallback else "failed"
+            entry.error = f"{type(e).__name__}: {e}"
+            logger.warning("Could not import %s (%s); %s", entry.module, entry.error,
+                           "serving fallback routes" if entry.fallback else "its routes are disabled")
+            router = entry.fallback() if entry.fallback else None
+        else:
+            entry.status = "loaded"
+        entry.import_seconds = time.perf_counter() - start
+        logger.info("Router %s ready in %.1f ms (%s)", entry.name, entry.import_seconds * 1000, entry.status)
+        return router
+
+    def _include(self, app: FastAPI, entry: RouterEntry, router: Optional[APIRouter]):
+        if router is None:
+            return
+        app.include_router(router, prefix=entry.prefix, tags=[entry.name])
+        entry.routes = len(router.routes)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: entry.snapshot() for name, entry in self.entries.items()}
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from models.blog import BlogPost
+from models.project import Project
+import api.routes.blog as blog_routes
+import api.routes.projects as project_routes
+
+def _sqlite_sessions(path, model) -> async_sessionmaker:
+    """Session factory on a SQLite file stand-in for Postgres, with the model's table created"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(model.__table__.create)
+
+    asyncio.run(setup())
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+@pytest.fixture
+def project_sessions(tmp_path) -> async_sessionmaker:
+    return _sqlite_sessions(tmp_path / "projects.db", Project)
+
+@pytest.fixture
+def blog_sessions(tmp_path) -> async_sessionmaker:
+    return _sqlite_sessions(tmp_path / "blog.db", BlogPost)
+
+class _UnreachableSession:
+    async def __aenter__(self):
+        raise ConnectionRefusedError("database is down")
+
+    async def __aexit__(self, *exc):
+        return False
+
+@pytest.fixture
+def unreachable_sessions():
+    """Session factory whose sessions fail as if the database were down"""
+    return _UnreachableSession
+
+def _router_client(monkeypatch, module, attribute: str, repository, prefix: str) -> TestClient:
+    monkeypatch.setattr(module, attribute, repository)
+    app = FastAPI()
+    app.include_router(module.router, prefix=prefix)
+    return TestClient(app)
+
+@pytest.fixture
+def make_client(monkeypatch):
+    """Projects router served from the given repository"""
+    def factory(repository) -> TestClient:
+        return _router_client(monkeypatch, project_routes, "project_repository", repository, "/api/projects")
+    return factory
+
+@pytest.fixture
+def make_blog_client(monkeypatch):
+    """Blog router served from the given repository"""
+    def factory(repository) -> TestClient:
+        return _router_client(monkeypatch, blog_routes, "blog_repository", repository, "/api/blog")
+    return factory
@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from models.contact import Contact
+import api.routes.analytics as analytics_routes
+
+@pytest.fixture
+def client(monkeypatch):
+    """Analytics router served from an in-memory SQLite stand-in for Postgres"""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Contact.__table__.create)
+        async with session_factory() as session:
+            session.add_all([
+                Contact(name="A", email="a@example.com", subject="Hi", message="One", source="website"),
+                Contact(name="B", email="b@example.com", subject="Hi", message="Two", source="website", is_read=True),
+                Contact(name="C", email="c@example.com", subject="Hi", message="Three", source="linkedin"),
+            ])
+            await session.commit()
+
+    asyncio.run(setup())
+
+    monkeypatch.setattr(analytics_routes, "session_factory", session_factory)
+    app = FastAPI()
+    app.include_router(analytics_routes.router, prefix="/api/analytics")
+    analytics_routes.invalidate_analytics_cache()
+    yield TestClient(app)
+    analytics_routes.invalidate_analytics_cache()
+    asyncio.run(engine.dispose())
+
+class TestAnalyticsRoutes:
+    """Test analytics queries on the async session path"""
+
+    def test_overview_counts(self, client):
+        response = client.get("/api/analytics/overview?time_range=30d")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["time_range"] == "30d"
+        assert data["metrics"]["total_contacts"] == 3
+        assert data["metrics"]["read_contacts"] == 1
+        assert data["metrics"]["unread_contacts"] == 2
+        assert {s["source"]: s["count"] for s in data["sources"]} == {"website": 2, "linkedin": 1}
+
+    def test_overview_is_served_from_cache(self, client):
+        cache = analytics_routes.analytics_cache
+        client.get("/api/analytics/overview")
+        hits = cache.hits
+        client.get("/api/analytics/overview")
+        assert cache.hits == hits + 1
+
+    def test_unknown_time_range_defaults_to_7d(self, client):
+        data = client.get("/api/analytics/overview?time_range=bogus").json()
+        assert data["time_range"] == "7d"
+
+    def test_contact_analytics(self, client):
+        data = client.get("/api/analytics/contacts").json()
+        assert len(data["recent_contacts"]) == 3
+        assert sum(row["count"] for row in data["hourly_distribution"]) == 3
+
+    def test_performance_reports_cache_stats(self, client):
+        data = client.get("/api/analytics/performance").json()
+        assert "routes" in data
+        assert "analytics_cache" in data
+
+    def test_cancelled_leader_does_not_fail_coalesced_viewers(self, client, monkeypatch):
+        sessions, released = [], asyncio.Event()
+        original_build = analytics_routes._build_overview
+
+        async def gated_build(db, time_range):
+            sessions.append(db)
+            await released.wait()
+            return await original_build(db, time_range)
+
+        monkeypatch.setattr(analytics_routes, "_build_overview", gated_build)
+
+        async def run():
+            leader = asyncio.create_task(analytics_routes.get_analytics_overview("30d"))
+            await asyncio.sleep(0.01)
+            follower = asyncio.create_task(analytics_routes.get_analytics_overview("30d"))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            await asyncio.sleep(0.01)
+            released.set()
+            return await follower
+
+        data = asyncio.run(run())
+        assert data["metrics"]["total_contacts"] == 3
+        assert len(sessions) == 1
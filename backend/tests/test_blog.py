@@ -0,0 +1,149 @@
+import asyncio
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from repositories.blog import _MARK_START, _MARK_STOP, BlogRepository, _headline_snippet
+import api.routes.blog as blog_routes
+
+def _post(title: str, content: str, tags=("python",)):
+    return {"title": title, "content": content, "excerpt": title, "author": "Divyansh", "tags": list(tags)}
+
+class TestBlogRoutes:
+    """Test DB-backed blog routes"""
+
+    def test_seeds_lists_and_filters(self, blog_sessions, make_blog_client):
+        client = make_blog_client(BlogRepository(blog_sessions, seed=blog_routes.sample_posts))
+
+        posts = client.get("/api/blog").json()
+        assert [p["slug"] for p in posts] == [p["slug"] for p in blog_routes.sample_posts]
+        assert [p["read_time"] for p in posts] == [8, 12, 15]
+
+        assert [p["id"] for p in client.get("/api/blog?tag=nlp").json()] == [3]
+        assert len(client.get("/api/blog?limit=2").json()) == 2
+        assert client.get(f"/api/blog/{posts[1]['slug']}").json()["title"] == posts[1]["title"]
+        assert client.get("/api/blog/missing").status_code == 404
+        assert "plotly" in client.get("/api/blog/tags/list").json()["tags"]
+
+    def test_concurrent_workers_seed_once(self, blog_sessions):
+        # One engine per worker, all on the same database file
+        workers = [
+            BlogRepository(async_sessionmaker(create_async_engine(blog_sessions.kw["bind"].url),
+                                              class_=AsyncSession, expire_on_commit=False),
+                           seed=blog_routes.sample_posts)
+            for _ in range(4)
+        ]
+
+        async def run():
+            return await asyncio.gather(*(worker.list() for worker in workers))
+
+        pages = asyncio.run(run())
+        assert [len(posts) for posts, _ in pages] == [len(blog_routes.sample_posts)] * 4
+        # Served from the database, not from the seed fallback after a failed duplicate insert
+        assert all(worker._seeded for worker in workers)
+
+    def test_create_and_duplicate_slug(self, blog_sessions, make_blog_client):
+        client = make_blog_client(BlogRepository(blog_sessions, seed=blog_routes.sample_posts))
+        created = client.post("/api/blog", json=_post("Vector Search", "Embeddings and indexes"))
+        assert created.status_code == 200
+        assert created.json()["slug"] == "vector-search"
+        assert client.get("/api/blog/vector-search").status_code == 200
+        assert client.post("/api/blog", json=_post("Vector Search", "Again")).status_code == 409
+
+    def test_create_renders_once_and_lists_skip_content(self, blog_sessions, make_blog_client):
+        client = make_blog_client(BlogRepository(blog_sessions, seed=blog_routes.sample_posts))
+        created = client.post("/api/blog", json={
+            **_post("Rendering", "## Why\n\nRender **once** at write time. " + "word " * 400), "excerpt": "",
+        }).json()
+        assert "<h2>Why</h2>" in created["content_html"]
+        assert created["word_count"] == 406 and created["read_time"] == 3
+        assert created["excerpt"].startswith("Why Render once")
+
+        statements = []
+        event.listen(blog_sessions.kw["bind"].sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        summaries = client.get("/api/blog").json()
+        assert "content" not in summaries[-1] and summaries[-1]["word_count"] == 406
+        listing = [sql for sql in statements if "FROM blog_posts" in sql]
+        assert listing and all("blog_posts.content" not in sql for sql in listing)
+
+        full = client.get("/api/blog", params={"include_content": True}).json()
+        assert full[-1]["content_html"] == created["content_html"]
+        assert client.get("/api/blog/rendering").json()["content_html"] == created["content_html"]
+
+    def test_tag_counts_follow_writes(self, blog_sessions, make_blog_client):
+        repository = BlogRepository(blog_sessions, seed=blog_routes.sample_posts)
+        client = make_blog_client(repository)
+
+        counts = client.get("/api/blog/tags/list").json()["counts"]
+        assert counts["python"] == 3 and counts["nlp"] == 1
+        etag = client.get("/api/blog/tags/list").headers["etag"]
+
+        loaded = repository._tag_index
+        client.post("/api/blog", json=_post("HTTP caching", "ETags", tags=("python", "http", "http")))
+        data = client.get("/api/blog/tags/list", headers={"If-None-Match": etag})
+        assert data.status_code == 200
+        assert data.json()["counts"]["python"] == 4 and data.json()["counts"]["http"] == 1
+        assert "http" in data.json()["tags"]
+        # Updated in place rather than rebuilt from the table
+        assert repository._tag_index is loaded
+
+        # Another worker picks the write up from the database on refresh
+        other = BlogRepository(blog_sessions, seed=blog_routes.sample_posts, tags_refresh_interval=0)
+        assert asyncio.run(other.tag_index()).counts["http"] == 1
+
+    def test_postgres_tag_filter_uses_containment(self):
+        class _Session:
+            bind = type("Bind", (), {"dialect": postgresql.dialect()})()
+
+        sql = str(BlogRepository._has_tag(_Session(), "nlp").compile(dialect=postgresql.dialect()))
+        assert "blog_posts.tags @>" in sql
+
+    def test_search_ranks_highlights_and_paginates(self, blog_sessions, make_blog_client):
+        client = make_blog_client(BlogRepository(blog_sessions))
+        client.post("/api/blog", json=_post("Pandas tips", "Grouping data with pandas is fast"))
+        client.post("/api/blog", json=_post("Plotting", "Charts built from pandas frames"))
+        client.post("/api/blog", json=_post("Rust", "Ownership and borrowing"))
+
+        data = client.get("/api/blog/search", params={"q": "pandas"}).json()
+        assert data["total"] == 2
+        # Title matches outrank content-only matches
+        assert [hit["title"] for hit in data["results"]] == ["Pandas tips", "Plotting"]
+        assert "<mark>pandas</mark>" in data["results"][1]["snippet"]
+
+        second = client.get("/api/blog/search", params={"q": "pandas", "page": 2, "page_size": 1}).json()
+        assert second["total"] == 2
+        assert [hit["title"] for hit in second["results"]] == ["Plotting"]
+
+        assert client.get("/api/blog/search", params={"q": "pandas charts"}).json()["total"] == 1
+        assert client.get("/api/blog/search", params={"q": "haskell"}).json()["results"] == []
+        assert client.get("/api/blog/search", params={"q": ""}).status_code == 422
+
+    def test_search_snippets_escape_post_content(self, blog_sessions, make_blog_client):
+        client = make_blog_client(BlogRepository(blog_sessions))
+        client.post("/api/blog", json=_post("Images", "Broken <img src=x onerror=alert(1)> images"))
+
+        snippet = client.get("/api/blog/search", params={"q": "images"}).json()["results"][0]["snippet"]
+        assert "<img" not in snippet
+        assert "&lt;img" in snippet
+        assert "<mark>images</mark>" in snippet
+
+    def test_postgres_headline_is_escaped_around_marks(self):
+        headline = f"<script>x</script> {_MARK_START}pandas{_MARK_STOP} & more"
+        assert _headline_snippet(headline) == "&lt;script&gt;x&lt;/script&gt; <mark>pandas</mark> &amp; more"
+
+    def test_search_falls_back_to_seed_when_database_is_down(self, unreachable_sessions, make_blog_client):
+        client = make_blog_client(BlogRepository(unreachable_sessions, seed=blog_routes.sample_posts))
+        data = client.get("/api/blog/search", params={"q": "plotly"}).json()
+        assert [hit["id"] for hit in data["results"]] == [2]
+        assert client.get("/api/blog").status_code == 200
+        assert client.post("/api/blog", json=_post("New", "Post")).status_code == 503
+
+    def test_postgres_search_uses_tsvector_index(self):
+        hits, count = BlogRepository().search_statements("neural networks", offset=20, limit=10)
+        sql = str(hits.compile(dialect=postgresql.dialect()))
+        assert "blog_posts.search_vector @@ websearch_to_tsquery" in sql
+        assert "ts_rank(blog_posts.search_vector" in sql
+        assert "ts_headline" in sql
+        assert "count(*) OVER ()" in sql
+        assert "@@" in str(count.compile(dialect=postgresql.dialect()))
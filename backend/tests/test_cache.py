@@ -0,0 +1,182 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from cache import SingleFlight, TimeBucketCache
+from models.contact import Contact
+import api.routes.analytics as analytics_routes
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+class TestSingleFlight:
+    """Test request coalescing"""
+
+    def test_concurrent_calls_share_one_computation(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        async def run():
+            return await asyncio.gather(*(flight.do("key", compute) for _ in range(10)))
+
+        results = asyncio.run(run())
+        assert results == ["value"] * 10
+        assert len(calls) == 1
+        assert flight.coalesced == 9
+        assert flight.in_flight() == 0
+
+    def test_errors_propagate_to_all_waiters(self):
+        flight = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def run():
+            return await asyncio.gather(*(flight.do("key", compute) for _ in range(3)),
+                                        return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, ValueError) for r in results)
+
+    def test_cancelled_leader_does_not_cancel_waiters(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return "value"
+
+        async def run():
+            leader = asyncio.ensure_future(flight.do("key", compute))
+            await asyncio.sleep(0)
+            waiters = [asyncio.ensure_future(flight.do("key", compute)) for _ in range(3)]
+            await asyncio.sleep(0)
+            leader.cancel()
+            results = await asyncio.gather(*waiters)
+            return leader, results
+
+        leader, results = asyncio.run(run())
+        assert leader.cancelled()
+        assert results == ["value"] * 3
+        assert len(calls) == 1
+        assert flight.in_flight() == 0
+
+    def test_computation_cancelled_when_every_caller_is(self):
+        flight = SingleFlight()
+        finished = []
+
+        async def compute():
+            await asyncio.sleep(1)
+            finished.append(1)
+
+        async def run():
+            callers = [asyncio.ensure_future(flight.do("key", compute)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            for caller in callers:
+                caller.cancel()
+            await asyncio.gather(*callers, return_exceptions=True)
+            await asyncio.sleep(0)
+            return flight.in_flight()
+
+        assert asyncio.run(run()) == 0
+        assert finished == []
+
+class TestTimeBucketCache:
+    """Test time-bucketed caching and invalidation"""
+
+    def test_hits_within_bucket_and_expires_on_next_bucket(self):
+        clock = FakeClock(0)
+        cache = TimeBucketCache(bucket_seconds=60, clock=clock)
+        counter = {"n": 0}
+
+        async def compute():
+            counter["n"] += 1
+            return counter["n"]
+
+        async def run():
+            first = await cache.get_or_compute(("overview", "7d"), compute)
+            clock.now = 59
+            second = await cache.get_or_compute(("overview", "7d"), compute)
+            clock.now = 61
+            third = await cache.get_or_compute(("overview", "7d"), compute)
+            return first, second, third
+
+        assert asyncio.run(run()) == (1, 1, 2)
+        assert cache.stats()["entries"] == 1
+
+    def test_keys_are_independent(self):
+        cache = TimeBucketCache(clock=FakeClock(0))
+
+        async def run():
+            a = await cache.get_or_compute(("overview", "7d"), lambda: asyncio.sleep(0, "a"))
+            b = await cache.get_or_compute(("overview", "30d"), lambda: asyncio.sleep(0, "b"))
+            return a, b
+
+        assert asyncio.run(run()) == ("a", "b")
+
+    def test_invalidate_discards_in_flight_result(self):
+        cache = TimeBucketCache(clock=FakeClock(0))
+
+        async def slow():
+            await asyncio.sleep(0.01)
+            return "stale"
+
+        async def run():
+            task = asyncio.ensure_future(cache.get_or_compute(("k",), slow))
+            await asyncio.sleep(0)
+            cache.invalidate()
+            assert await task == "stale"
+            return await cache.get_or_compute(("k",), lambda: asyncio.sleep(0, "fresh"))
+
+        assert asyncio.run(run()) == "fresh"
+
+    def test_max_entries_bound(self):
+        cache = TimeBucketCache(max_entries=2, clock=FakeClock(0))
+
+        async def run():
+            for i in range(5):
+                await cache.get_or_compute((i,), lambda i=i: asyncio.sleep(0, i))
+
+        asyncio.run(run())
+        assert cache.stats()["entries"] == 2
+
+class TestAnalyticsInvalidation:
+    """Test that contact writes invalidate the analytics cache"""
+
+    @pytest.fixture
+    def session(self):
+        engine = create_engine("sqlite://")
+        Contact.__table__.create(engine)
+        db = sessionmaker(bind=engine)()
+        yield db
+        db.close()
+
+    def test_insert_and_mark_read_invalidate(self, session):
+        cache = analytics_routes.analytics_cache
+        before = cache.invalidations
+
+        contact = Contact(name="Test User", email="test@example.com",
+                          subject="Hello", message="Test message")
+        session.add(contact)
+        session.commit()
+        assert cache.invalidations == before + 1
+
+        contact.subject = "Updated"
+        session.commit()
+        assert cache.invalidations == before + 1
+
+        contact.is_read = True
+        session.commit()
+        assert cache.invalidations == before + 2
@@ -0,0 +1,65 @@
+import asyncio
+
+from ai_agent.ai_integration import AIIntegration
+from ai_agent.code_templates import CodeTemplate, CodeTemplateRegistry, SNIPPETS_DIR, parse_template
+
+class TestCodeTemplates:
+    """Test the indexed code template registry"""
+
+    def test_builtin_precedence(self):
+        registry = CodeTemplateRegistry.load(SNIPPETS_DIR)
+        expected = {
+            "Generate a fibonacci sequence": "fibonacci",
+            "bubble sort in python": "sort",
+            "Train an ML model": "ml",
+            "sort by model score": "sort",
+            "a FastAPI endpoint": "fastapi",
+            "api that uses machine learning": "ml",
+            "hello world": "hello_world",
+            "math helper": "calculator",
+            # Overlapping keywords: "hello" inside "mathello" still outranks "math"
+            "mathello": "hello_world",
+            # Substring matches as before: "ml" in "html"
+            "an html page": "ml",
+        }
+        assert {prompt: registry.match(prompt).name for prompt in expected} == expected
+        assert registry.match("parse a csv file") is None
+
+    def test_payloads_are_precomputed_and_hits_counted(self):
+        integration = AIIntegration(model="", templates=CodeTemplateRegistry.load(SNIPPETS_DIR))
+        template = integration.templates.match("fibonacci")
+        first = asyncio.run(integration.generate_code("Write fibonacci"))
+        asyncio.run(integration.generate_code("fibonacci please"))
+        asyncio.run(integration.generate_code("hello"))
+        asyncio.run(integration.generate_code("a linked list"))
+
+        assert first["code"] == template.code and first["code"].startswith("def fibonacci(n):")
+        assert first["model"] == "enhanced-knowledge-base" and first["timestamp"]
+        stats = integration.get_model_info()["code_templates"]
+        assert stats["most_used"][0] == {"language": "python", "name": "fibonacci", "hits": 3}
+        assert stats["misses"] == 1
+
+    def test_templates_load_from_files(self, tmp_path):
+        (tmp_path / "rust").mkdir()
+        (tmp_path / "rust" / "fib.rs").write_text(
+            "# keywords: fibonacci, Sequence\n# priority: 5\n\nfn fib(n: u64) -> u64 {\n    n\n}\n")
+        (tmp_path / "python").mkdir()
+        (tmp_path / "python" / "queue.py").write_text("# keywords: queue\n\nfrom collections import deque\n")
+
+        template = parse_template(tmp_path / "rust" / "fib.rs", "rust")
+        assert template.keywords == ("fibonacci", "sequence")
+        assert template.code == "fn fib(n: u64) -> u64 {\n    n\n}"
+
+        registry = CodeTemplateRegistry.load(SNIPPETS_DIR, tmp_path)
+        assert registry.match("fibonacci", "Rust").language == "rust"
+        assert registry.match("fibonacci", "python").name == "fibonacci"
+        assert registry.match("a task queue").code == "from collections import deque"
+        # Languages without templates use the Python ones
+        assert registry.match("fibonacci", "go").language == "python"
+
+    def test_added_template_overrides_keyword_by_priority(self):
+        registry = CodeTemplateRegistry([
+            CodeTemplate("generic_sort", "python", ("sort",), "sorted(x)", priority=50),
+            CodeTemplate("merge_sort", "python", ("sort", "merge"), "def merge_sort(x): ...", priority=10),
+        ])
+        assert registry.match("sort a list").name == "merge_sort"
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+import compression
+from api.conditional import CACHE_SHORT, conditional_response, content_etag
+from compression import CompressedCache, CompressionMiddleware, choose_encoding
+
+PAYLOAD = {"rows": [{"x": i, "label": f"point {i}"} for i in range(500)]}
+
+def _client(cache: CompressedCache) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, cache=cache)
+
+    @app.get("/chart")
+    async def chart(request: Request):
+        return conditional_response(request, PAYLOAD, etag=content_etag("chart"), cache_control=CACHE_SHORT)
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" + b"\0" * 4096, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(50):
+                yield f"line {i}\n" * 20
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/text")
+    async def text():
+        return PlainTextResponse("hello " * 500)
+
+    return TestClient(app)
+
+def _get(client, path, encoding="gzip", **headers):
+    return client.get(path, headers={"Accept-Encoding": encoding, **headers})
+
+class TestChooseEncoding:
+    """Test Accept-Encoding negotiation"""
+
+    def test_negotiation(self, monkeypatch):
+        assert choose_encoding("gzip, deflate") == "gzip"
+        assert choose_encoding("identity") is None
+        assert choose_encoding("gzip;q=0") is None
+        assert choose_encoding("*") == compression.available_encodings()[0]
+        monkeypatch.setattr(compression, "brotli", object())
+        assert choose_encoding("gzip, br") == "br"
+        assert choose_encoding("br;q=0, gzip") == "gzip"
+
+class TestCompressionMiddleware:
+    """Test gzip compression rules and the compressed-bytes cache"""
+
+    def test_compresses_large_json_and_caches_bytes(self):
+        cache = CompressedCache()
+        client = _client(cache)
+        response = _get(client, "/chart")
+        assert response.headers["content-encoding"] == "gzip"
+        assert "accept-encoding" in response.headers["vary"].lower()
+        assert response.headers["etag"].startswith('W/"')
+        assert response.json() == PAYLOAD
+        assert int(response.headers["content-length"]) < len(json.dumps(PAYLOAD)) / 3
+        assert cache.stats()["misses"] == 1 and cache.stats()["entries"] == 1
+
+        assert _get(client, "/chart").json() == PAYLOAD
+        assert cache.stats()["hits"] == 1
+
+        # The weakened ETag still validates against the identity representation
+        revalidated = _get(client, "/chart", **{"If-None-Match": response.headers["etag"]})
+        assert revalidated.status_code == 304
+
+    def test_skips_small_uncompressible_and_unaccepted(self):
+        client = _client(CompressedCache())
+        assert "content-encoding" not in _get(client, "/small").headers
+        assert "content-encoding" not in _get(client, "/image").headers
+        assert "content-encoding" not in _get(client, "/chart", encoding="identity").headers
+
+    def test_uncached_and_streaming_bodies(self):
+        cache = CompressedCache()
+        client = _client(cache)
+        text = _get(client, "/text")
+        assert text.headers["content-encoding"] == "gzip"
+        assert text.text == "hello " * 500
+
+        stream = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert stream.headers["content-encoding"] == "gzip"
+        assert stream.text == "".join(f"line {i}\n" * 20 for i in range(50))
+        assert cache.stats()["entries"] == 0
+
+    def test_cache_is_bounded_by_bytes(self):
+        cache = CompressedCache(max_bytes=10)
+        cache.put(("a", "gzip"), b"12345")
+        cache.put(("b", "gzip"), b"123456")
+        assert cache.get(("a", "gzip")) is None
+        assert cache.stats()["bytes"] == 6
+
+    @pytest.mark.skipif(compression.brotli is None, reason="brotli not installed")
+    def test_brotli(self):
+        response = _get(_client(CompressedCache()), "/chart", encoding="br")
+        assert response.headers["content-encoding"] == "br"
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import api.routes.blog as blog_routes
+import api.routes.chatbot as chatbot_routes
+import api.routes.demos as demo_routes
+import api.routes.projects as project_routes
+from repositories.blog import BlogRepository
+from repositories.project import ProjectRepository
+
+def _static_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(blog_routes.router, prefix="/api/blog")
+    app.include_router(chatbot_routes.router, prefix="/api/chatbot")
+    app.include_router(demo_routes.router, prefix="/api/demos")
+    return TestClient(app)
+
+class TestConditionalGet:
+    """Test ETag and Last-Modified validators on read-mostly routes"""
+
+    def test_static_routes_return_304_for_matching_etag(self):
+        client = _static_client()
+        for path in ("/api/demos/", "/api/demos/sample-data",
+                     "/api/chatbot/suggestions", "/api/chatbot/capabilities"):
+            first = client.get(path)
+            assert first.status_code == 200
+            assert "max-age=3600" in first.headers["cache-control"]
+            etag = first.headers["etag"]
+
+            cached = client.get(path, headers={"If-None-Match": etag})
+            assert cached.status_code == 304
+            assert cached.content == b""
+            assert cached.headers["etag"] == etag
+
+            assert client.get(path, headers={"If-None-Match": f'W/{etag}, "other"'}).status_code == 304
+            assert client.get(path, headers={"If-None-Match": '"stale"'}).status_code == 200
+
+    def test_blog_etag_changes_after_create(self, blog_sessions, monkeypatch):
+        repository = BlogRepository(blog_sessions, seed=blog_routes.sample_posts)
+        monkeypatch.setattr(blog_routes, "blog_repository", repository)
+        client = _static_client()
+
+        first = client.get("/api/blog")
+        etag = first.headers["etag"]
+        assert client.get("/api/blog", headers={"If-None-Match": etag}).status_code == 304
+
+        client.post("/api/blog", json={
+            "title": "Caching", "content": "Validators", "excerpt": "ETags", "author": "Divyansh", "tags": ["http"],
+        })
+        refreshed = client.get("/api/blog", headers={"If-None-Match": etag})
+        assert refreshed.status_code == 200
+        assert refreshed.headers["etag"] != etag
+        assert len(refreshed.json()) == len(first.json()) + 1
+
+    def test_blog_revalidation_skips_loading_the_page(self, blog_sessions, monkeypatch):
+        repository = BlogRepository(blog_sessions, seed=blog_routes.sample_posts)
+        monkeypatch.setattr(blog_routes, "blog_repository", repository)
+        client = _static_client()
+        first = client.get("/api/blog", params={"limit": 2})
+        assert first.headers["etag"] != client.get("/api/blog", params={"limit": 3}).headers["etag"]
+
+        loads = []
+        original_list = repository.list
+
+        async def counting_list(*args, **kwargs):
+            loads.append(1)
+            return await original_list(*args, **kwargs)
+
+        monkeypatch.setattr(repository, "list", counting_list)
+        response = client.get("/api/blog", params={"limit": 2}, headers={"If-None-Match": first.headers["etag"]})
+        assert response.status_code == 304
+        assert response.headers["etag"] == first.headers["etag"]
+        assert loads == []
+
+    def test_projects_etag_and_last_modified(self, project_sessions, make_client):
+        client = make_client(ProjectRepository(project_sessions, seed=project_routes.sample_projects))
+
+        first = client.get("/api/projects?category=nlp")
+        etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+        assert client.get("/api/projects?category=nlp", headers={"If-None-Match": etag}).status_code == 304
+        assert client.get("/api/projects?category=computer-vision").headers["etag"] != etag
+
+        since = {"If-Modified-Since": last_modified}
+        assert client.get("/api/projects?category=nlp", headers=since).status_code == 304
+        older = format_datetime(datetime.now().astimezone() - timedelta(days=365), usegmt=True)
+        assert client.get("/api/projects?category=nlp", headers={"If-Modified-Since": older}).status_code == 200
+
+        client.post("/api/projects", json={
+            "title": "Summarizer", "description": "Abstractive", "technologies": ["Python"], "category": "nlp",
+        })
+        changed = client.get("/api/projects?category=nlp", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert len(changed.json()) == 2
+
+    def test_naive_if_modified_since_forms_are_gmt(self, project_sessions, make_client):
+        client = make_client(ProjectRepository(project_sessions, seed=project_routes.sample_projects))
+        # asctime form and the -0000 zone both parse to naive datetimes
+        for since in ("Sun Nov  6 08:49:37 2050", "Sun, 06 Nov 2050 08:49:37 -0000"):
+            assert client.get("/api/projects", headers={"If-Modified-Since": since}).status_code == 304
+        for since in ("Sun Nov  6 08:49:37 1994", "Sun, 06 Nov 1994 08:49:37 -0000"):
+            assert client.get("/api/projects", headers={"If-Modified-Since": since}).status_code == 200
+
+    def test_blog_list_accepts_asctime_if_modified_since(self, blog_sessions, monkeypatch):
+        repository = BlogRepository(blog_sessions, seed=blog_routes.sample_posts)
+        monkeypatch.setattr(blog_routes, "blog_repository", repository)
+        client = _static_client()
+
+        response = client.get("/api/blog", headers={"If-Modified-Since": "Sun Nov  6 08:49:37 2050"})
+        assert response.status_code == 304
@@ -96,5 +96,80 @@ class TestEnvironmentVariables:
             # These are optional, so we just check they exist or are None
             assert value is None or len(value) > 0
 
+class TestSettingsProfile:
+    """Test environment-driven settings profiles"""
+
+    def test_production_profile_disables_debug_and_echo(self, monkeypatch):
+        monkeypatch.setenv("APP_ENV", "production")
+        from config import Settings
+        production = Settings()
+        assert production.debug is False
+        assert production.db_echo is False
+        assert production.db_pool_size == 10
+
+    def test_pool_settings_can_be_overridden(self, monkeypatch):
+        monkeypatch.setenv("APP_ENV", "production")
+        monkeypatch.setenv("DB_POOL_SIZE", "3")
+        monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+        monkeypatch.setenv("DATABASE_URL", "postgres://user:pw@db:5432/app")
+        from config import Settings
+        custom = Settings()
+        assert custom.db_pool_size == 3
+        assert custom.db_pool_pre_ping is False
+        assert custom.database_url == "postgresql://user:pw@db:5432/app"
+        assert custom.async_database_url == "postgresql+asyncpg://user:pw@db:5432/app"
+
+class TestPoolMonitor:
+    """Test connection pool instrumentation"""
+
+    def test_counts_checkouts_and_connects(self, tmp_path):
+        from sqlalchemy import create_engine, text
+        from sqlalchemy.pool import QueuePool
+        from database import PoolMonitor
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=1)
+        monitor = PoolMonitor("test", engine)
+        for _ in range(3):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        stats = monitor.stats()
+        assert stats["checkouts"] == 3
+        assert stats["checkins"] == 3
+        assert stats["connects"] == 1
+        assert stats["checked_out"] == 0
+        engine.dispose()
+
+    def test_counts_only_checkouts_that_block(self, tmp_path):
+        import threading
+        from sqlalchemy import create_engine
+        from sqlalchemy.exc import TimeoutError as PoolTimeout
+        from sqlalchemy.pool import QueuePool
+        from database import PoolMonitor
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool,
+                               pool_size=1, max_overflow=0, pool_timeout=0.1)
+        monitor = PoolMonitor("test", engine)
+
+        held = engine.connect()
+        assert monitor.stats()["waits"] == 0
+        with pytest.raises(PoolTimeout):
+            engine.connect()
+        stats = monitor.stats()
+        assert (stats["waits"], stats["timeouts"]) == (1, 1)
+        assert stats["wait_seconds"] >= 0.1
+        assert (stats["max_overflow"], stats["timeout_seconds"]) == (0, 0.1)
+
+        threading.Timer(0.02, held.close).start()
+        engine.connect().close()
+        stats = monitor.stats()
+        assert (stats["waits"], stats["timeouts"]) == (2, 1)
+
+        engine.connect().close()
+        assert monitor.stats()["waits"] == 2
+        engine.dispose()
+
+    def test_pool_stats_covers_both_engines(self):
+        from database import pool_stats
+        stats = pool_stats()
+        assert set(stats["pools"]) == {"sync", "async"}
+
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file
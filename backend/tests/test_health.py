@@ -0,0 +1,124 @@
+import asyncio
+import time
+from fastapi.testclient import TestClient
+
+import database
+from health import DatabaseProbe, ReadinessState, prepare_database
+from main import app
+
+class TestPrepareDatabase:
+    """Test background startup checks"""
+
+    def test_skips_ddl_when_schema_is_current(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(database, "test_connection", lambda: True)
+        monkeypatch.setattr(database, "current_schema_version", lambda: database.SCHEMA_VERSION)
+        monkeypatch.setattr(database, "init_db", lambda: calls.append("ddl"))
+
+        state = ReadinessState()
+        asyncio.run(prepare_database(state, timeout=1, retry_interval=0.01))
+        assert state.ready
+        assert calls == []
+
+    def test_runs_ddl_when_schema_is_behind(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(database, "test_connection", lambda: True)
+        monkeypatch.setattr(database, "current_schema_version", lambda: None)
+        monkeypatch.setattr(database, "init_db", lambda: calls.append("ddl"))
+
+        state = ReadinessState()
+        asyncio.run(prepare_database(state, timeout=1, retry_interval=0.01))
+        assert state.ready
+        assert calls == ["ddl"]
+
+    def test_retries_after_timeout(self, monkeypatch):
+        attempts = []
+
+        def slow_then_fast():
+            attempts.append(1)
+            if len(attempts) == 1:
+                time.sleep(0.2)
+            return True
+
+        monkeypatch.setattr(database, "test_connection", slow_then_fast)
+        monkeypatch.setattr(database, "current_schema_version", lambda: database.SCHEMA_VERSION)
+
+        state = ReadinessState()
+        asyncio.run(prepare_database(state, timeout=0.05, retry_interval=0.01))
+        assert state.ready
+        assert state.attempts >= 2
+        # Retries waited on the hung call instead of starting another thread
+        assert len(attempts) == 1
+
+    def test_retries_after_failure_start_a_new_call(self, monkeypatch):
+        attempts = []
+
+        def failing_then_ok():
+            attempts.append(1)
+            return len(attempts) > 1
+
+        monkeypatch.setattr(database, "test_connection", failing_then_ok)
+        monkeypatch.setattr(database, "current_schema_version", lambda: database.SCHEMA_VERSION)
+
+        state = ReadinessState()
+        asyncio.run(prepare_database(state, timeout=1, retry_interval=0.01))
+        assert state.ready
+        assert state.attempts == 2
+        assert len(attempts) == 2
+
+class TestDatabaseProbe:
+    """Test the cached background database probe"""
+
+    def test_snapshot_before_first_probe(self):
+        snapshot = DatabaseProbe(check=lambda: 0.001).snapshot()
+        assert snapshot["status"] == "unknown"
+        assert snapshot["age_seconds"] is None
+
+    def test_records_latency(self):
+        probe = DatabaseProbe(timeout=1, check=lambda: 0.0042)
+        asyncio.run(probe.probe_once())
+        snapshot = probe.snapshot()
+        assert snapshot["status"] == "healthy"
+        assert snapshot["database"] == "connected"
+        assert snapshot["latency_ms"] == 4.2
+        assert snapshot["age_seconds"] >= 0
+
+    def test_failure_and_timeout(self):
+        def failing():
+            raise ConnectionError("refused")
+
+        probe = DatabaseProbe(timeout=1, check=failing)
+        asyncio.run(probe.probe_once())
+        assert probe.snapshot()["status"] == "unhealthy"
+        assert probe.snapshot()["message"] == "refused"
+
+        slow = DatabaseProbe(timeout=0.05, check=lambda: time.sleep(0.2) or 0.2)
+        asyncio.run(slow.probe_once())
+        assert slow.snapshot()["status"] == "unhealthy"
+        assert "timed out" in slow.snapshot()["message"]
+
+    def test_endpoint_serves_cached_status(self, monkeypatch):
+        import main
+        calls = []
+        monkeypatch.setattr(main.database_probe, "_check", lambda: calls.append(1) or 0.001)
+        client = TestClient(app)
+        for _ in range(3):
+            data = client.get("/api/health/db").json()
+            assert "status" in data and "age_seconds" in data
+        assert calls == []
+
+class TestProbes:
+    """Test liveness and readiness endpoints"""
+
+    def test_liveness_is_independent_of_database(self):
+        with TestClient(app) as client:
+            response = client.get("/api/health/live")
+            assert response.status_code == 200
+            assert response.json()["status"] == "alive"
+
+    def test_readiness_reports_not_ready_without_database(self, monkeypatch):
+        monkeypatch.setattr(database, "test_connection", lambda: False)
+        with TestClient(app) as client:
+            response = client.get("/api/health/ready")
+            assert response.status_code == 503
+            assert response.json()["status"] == "not_ready"
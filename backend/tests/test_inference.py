@@ -0,0 +1,220 @@
+import asyncio
+import httpx
+
+from ai_agent.ai_integration import AIIntegration, context_key, normalize_prompt
+from ai_agent.inference import CircuitBreaker, InferenceClient, InferenceUnavailable
+from ai_agent.mock_inference import create_mock_inference_app
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+def _client(app, **options) -> InferenceClient:
+    options.setdefault("backoff", 0)
+    return InferenceClient("http://inference", transport=httpx.ASGITransport(app=app), **options)
+
+class TestInferenceClient:
+    """Test the pooled inference client against the mock server"""
+
+    def test_generates_and_reuses_the_pool(self):
+        client = _client(create_mock_inference_app())
+
+        async def run():
+            first = await client.generate("mock", "hello")
+            pool = client._client()
+            await client.generate("mock", "again")
+            assert client._client() is pool
+            await client.aclose()
+            return first
+
+        assert asyncio.run(run()) == "[mock] hello"
+
+    def test_retries_transient_failures(self):
+        app = create_mock_inference_app(fail_first=2)
+        client = _client(app, retries=2)
+        assert asyncio.run(client.generate("mock", "hi")) == "[mock] hi"
+        assert app.state.requests == 3
+        assert client.stats()["retried"] == 2
+
+    def test_client_errors_are_not_retried(self):
+        app = create_mock_inference_app(fail_first=5, status_code=400)
+        client = _client(app, retries=3)
+
+        async def run():
+            try:
+                await client.generate("mock", "hi")
+            except InferenceUnavailable as e:
+                return str(e)
+
+        assert asyncio.run(run()) == "HTTP 400"
+        assert app.state.requests == 1
+
+    def test_breaker_opens_and_recovers(self):
+        clock = FakeClock()
+        app = create_mock_inference_app(fail_first=2)
+        client = _client(app, retries=0, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock))
+
+        async def attempt():
+            try:
+                return await client.generate("mock", "hi")
+            except InferenceUnavailable as e:
+                return str(e)
+
+        assert asyncio.run(attempt()) == "HTTP 503"
+        assert asyncio.run(attempt()) == "HTTP 503"
+        assert client.breaker.state == "open"
+        # Open: refused without touching the server
+        assert asyncio.run(attempt()) == "Circuit open"
+        assert app.state.requests == 2
+
+        clock.now = 31
+        assert client.breaker.state == "half_open"
+        assert asyncio.run(attempt()) == "[mock] hi"
+        assert client.breaker.state == "closed"
+
+    def test_non_json_success_is_unavailable(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, text="<html>Maintenance</html>", headers={"Content-Type": "text/html"})
+
+        client = InferenceClient("http://inference", transport=httpx.MockTransport(handler), retries=2, backoff=0)
+
+        async def run():
+            try:
+                await client.generate("mock", "hi")
+            except InferenceUnavailable as e:
+                return str(e)
+
+        assert asyncio.run(run()) == "Invalid JSON"
+        assert len(requests) == 1
+        assert client.breaker.stats()["consecutive_failures"] == 1
+
+class TestAIIntegrationRemote:
+    """Test remote generation with local fallback"""
+
+    def test_uses_remote_model(self):
+        integration = AIIntegration(model="mock", inference=_client(create_mock_inference_app()))
+        context = {"conversation_history": [
+            {"sender": "user", "message": "Hi"},
+            {"sender": "assistant", "message": "Hello!"},
+            {"sender": "user", "message": "Explain pandas"},
+        ]}
+        result = asyncio.run(integration.generate_response("Explain pandas", context))
+        assert result["model"] == "mock"
+        assert result["response"] == "[mock] User: Hi\nAssistant: Hello!\nUser: Explain pandas\nAssistant:"
+        assert "mock" in integration.get_model_info()["models"]
+
+    def test_falls_back_to_local_responders(self):
+        app = create_mock_inference_app(fail_first=100)
+        integration = AIIntegration(model="mock", inference=_client(
+            app, retries=1, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60)))
+
+        for _ in range(3):
+            result = asyncio.run(integration.generate_response("What technologies do you use?"))
+            assert result["model"] != "mock" and result["response"]
+        # The breaker opened after the first call, so later calls skipped the network
+        assert app.state.requests == 2
+
+    def test_html_response_falls_back_to_local_responders(self):
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, text="<html></html>"))
+        integration = AIIntegration(model="mock", inference=InferenceClient(
+            "http://inference", transport=transport, retries=0, backoff=0))
+
+        result = asyncio.run(integration.generate_response("What technologies do you use?"))
+        assert result["model"] != "mock" and result["response"]
+        assert "error" not in result
+
+    def test_local_only_without_a_model(self):
+        integration = AIIntegration(model="")
+        assert integration.inference is None
+        assert asyncio.run(integration.generate_response("hello"))["response"]
+
+class TestCoalescing:
+    """Test single-flight generation"""
+
+    def test_identical_prompts_share_one_remote_call(self):
+        app = create_mock_inference_app(delay=0.02)
+        integration = AIIntegration(model="mock", inference=_client(app))
+
+        async def run():
+            prompts = ["Tell me about pandas", "  tell me ABOUT pandas ", "Tell me about numpy"]
+            return await asyncio.gather(*(
+                integration.generate_response(prompts[i % 3], {"session_id": f"s{i}", "conversation_history": []})
+                for i in range(9)
+            ))
+
+        results = asyncio.run(run())
+        assert app.state.requests == 2
+        assert results[0] == results[1] and results[0] is not results[1]
+        assert integration._flight.coalesced == 7
+
+    def test_disconnected_first_request_does_not_fail_the_others(self):
+        app = create_mock_inference_app(delay=0.05)
+        integration = AIIntegration(model="mock", inference=_client(app))
+        context = {"conversation_history": []}
+
+        async def run():
+            first = asyncio.ensure_future(integration.generate_response("Tell me about pandas", context))
+            await asyncio.sleep(0.01)
+            others = [asyncio.ensure_future(integration.generate_response("tell me about pandas", context))
+                      for _ in range(3)]
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return first, await asyncio.gather(*others)
+
+        first, results = asyncio.run(run())
+        assert first.cancelled()
+        assert all(result["model"] == "mock" for result in results)
+        assert app.state.requests == 1
+
+    def test_context_is_part_of_the_key(self):
+        first = {"conversation_history": [{"sender": "user", "message": "Hi", "session_id": "a"}]}
+        second = {"conversation_history": [{"sender": "user", "message": "hi ", "session_id": "b"}]}
+        third = {"conversation_history": [{"sender": "user", "message": "Bye"}]}
+        assert context_key("Next", first) == context_key("Next", second)
+        assert context_key("Next", first) != context_key("Next", third)
+        assert normalize_prompt("  Write   Fibonacci ") == "write fibonacci"
+
+    def test_key_covers_the_turns_sent_in_the_prompt(self):
+        def chat(oldest: str):
+            turns = [{"sender": "user", "message": oldest}]
+            turns += [{"sender": "user", "message": f"turn {i}"} for i in range(5)]
+            return {"conversation_history": turns + [{"sender": "user", "message": "Next"}]}
+
+        # The current message is dropped from history, so the prompt reaches back to the oldest turn
+        assert context_key("Next", chat("pandas")) != context_key("Next", chat("numpy"))
+
+        app = create_mock_inference_app()
+        integration = AIIntegration(model="mock", inference=_client(app))
+
+        async def run():
+            return await asyncio.gather(integration.generate_response("Next", chat("pandas")),
+                                        integration.generate_response("Next", chat("numpy")))
+
+        pandas, numpy = asyncio.run(run())
+        assert "pandas" in pandas["response"] and "numpy" in numpy["response"]
+        assert app.state.requests == 2
+
+    def test_generate_code_coalesces(self):
+        integration = AIIntegration(model="")
+        calls = []
+        original = integration._compute_code
+
+        async def counted(prompt, language="python"):
+            calls.append(prompt)
+            await asyncio.sleep(0.01)
+            return await original(prompt, language)
+
+        integration._compute_code = counted
+
+        async def run():
+            return await asyncio.gather(*(integration.generate_code("Write fibonacci", "Python") for _ in range(5)))
+
+        results = asyncio.run(run())
+        assert len(calls) == 1
+        assert all("fibonacci" in result["code"] for result in results)
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import threading
+import numpy as np
+import pytest
+
+from ai_agent.ai_integration import AIIntegration, INTENT_RESPONDERS
+import ai_agent.intents as intents
+from ai_agent.intents import (EXAMPLES_PATH, WEIGHTS_PATH, IntentClassifier, examples_digest,
+                              get_intent_classifier, load_intent_classifier)
+
+SUGGESTIONS = {
+    "Tell me about your projects": "projects",
+    "What technologies do you use?": "technologies",
+    "Show me your machine learning demos": "ml_demos",
+    "How can I contact you?": "contact",
+    "What's your experience with Python?": "python_experience",
+    "Tell me about your data science work": "data_science_work",
+    "Career advice for tech": "career_tech",
+    "Learning resources": "learning_resources",
+}
+
+class TestIntentClassifier:
+    """Test the hashed n-gram intent classifier"""
+
+    def test_stored_weights_match_examples(self):
+        examples = json.loads(EXAMPLES_PATH.read_text())
+        with np.load(WEIGHTS_PATH) as data:
+            assert str(data["digest"]) == examples_digest(examples)
+        assert set(get_intent_classifier().labels) == set(examples) == set(INTENT_RESPONDERS)
+
+    @pytest.mark.parametrize("message, label", [
+        *SUGGESTIONS.items(),
+        ("hey there", "greeting"),
+        ("what is kubernetes", "explanation"),
+        ("compare rust and go", "comparison"),
+        ("why is python so popular?", "reasoning"),
+    ])
+    def test_classifies_messages(self, message, label):
+        intent = get_intent_classifier().classify(message)
+        assert intent.label == label
+        assert 0.4 < intent.confidence <= 1.0
+
+    def test_batch_matches_single(self):
+        classifier = get_intent_classifier()
+        messages = list(SUGGESTIONS) + ["asdf", "", "Explain neural networks"]
+        batch = classifier.classify_batch(messages)
+        for message, intent in zip(messages, batch):
+            single = classifier.classify(message)
+            assert single.label == intent.label
+            assert single.confidence == pytest.approx(intent.confidence, abs=1e-5)
+        assert classifier.classify_batch([]) == []
+
+    def test_trains_when_weights_are_missing_or_stale(self, tmp_path):
+        examples = {"hello": ["hi", "hello there", "hey"], "bye": ["goodbye", "see you later", "bye now"]}
+        examples_path = tmp_path / "intents.json"
+        examples_path.write_text(json.dumps(examples))
+        weights_path = tmp_path / "weights.npz"
+
+        trained = IntentClassifier.load(weights_path, examples_path)
+        assert trained.classify("hello friend").label == "hello"
+        trained.save(weights_path)
+        assert IntentClassifier.load(weights_path, examples_path).weights.shape == trained.weights.shape
+
+        examples["thanks"] = ["thank you", "thanks a lot", "much appreciated"]
+        examples_path.write_text(json.dumps(examples))
+        assert "thanks" in IntentClassifier.load(weights_path, examples_path).labels
+
+    def test_stale_weights_are_retrained_off_the_event_loop(self, monkeypatch):
+        threads = []
+        trained = get_intent_classifier()
+
+        def counting_load():
+            threads.append(threading.current_thread())
+            return trained
+
+        monkeypatch.setattr(intents, "_classifier", None)
+        monkeypatch.setattr(IntentClassifier, "load", staticmethod(counting_load))
+
+        async def run():
+            return await asyncio.gather(load_intent_classifier(), load_intent_classifier()), threading.current_thread()
+
+        (first, second), loop_thread = asyncio.run(run())
+        assert first is second is trained
+        assert len(threads) == 1 and threads[0] is not loop_thread
+
+    def test_dynamic_response_uses_intent(self):
+        integration = AIIntegration(model="")
+        response = asyncio.run(integration._generate_dynamic_response("How can I contact you?", {}))
+        assert response["intent"] == "contact" and response["category"] == "contact"
+        assert response["confidence"] > 0.9
+        # Messages that contain "hi" no longer count as greetings
+        assert asyncio.run(integration._generate_dynamic_response("Explain machine learning", {}))["category"] != "greeting"
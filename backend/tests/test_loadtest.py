@@ -0,0 +1,43 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import api.routes.demos as demo_routes
+from benchmarks.loadtest import compare_to_baseline, parse_mix, run_load
+
+def _demo_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(demo_routes.router, prefix="/api/demos")
+    return app
+
+class TestLoadHarness:
+    """Test the load generator against an in-process app"""
+
+    def test_run_load_reports_percentiles(self):
+        async def run():
+            transport = httpx.ASGITransport(app=_demo_app())
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await run_load(client, parse_mix("demos=1"), duration=0.3, concurrency=4)
+
+        report = asyncio.run(run())
+        demos = report["scenarios"]["demos"]
+        assert demos["requests"] > 0 and demos["errors"] == 0
+        assert demos["rps"] > 0
+        assert 0 < demos["p50_ms"] <= demos["p95_ms"] <= demos["p99_ms"]
+        assert report["total"]["requests"] == demos["requests"]
+
+    def test_parse_mix(self):
+        assert [(s.name, w) for s, w in parse_mix("chat=4, analytics")] == [("chat", 4.0), ("analytics", 1.0)]
+        with pytest.raises(ValueError):
+            parse_mix("checkout=1")
+
+    def test_baseline_regressions(self):
+        row = {"requests": 100, "errors": 0, "rps": 100.0, "p50_ms": 5.0, "p95_ms": 10.0, "p99_ms": 20.0}
+        baseline = {"scenarios": {"chat": row}, "total": row}
+        assert compare_to_baseline(baseline, baseline, tolerance=0.2) == []
+
+        slower = {**row, "rps": 70.0, "p95_ms": 13.0}
+        regressions = compare_to_baseline({"scenarios": {"chat": slower}, "total": row}, baseline, tolerance=0.2)
+        assert regressions == ["chat: rps 70.0 < baseline 100.0", "chat: p95_ms 13.0 > baseline 10.0"]
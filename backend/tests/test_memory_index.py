@@ -0,0 +1,65 @@
+import gc
+from datetime import datetime
+import numpy as np
+
+from ai_agent.agent import AIAgent, Memory
+from ai_agent.memory_index import EMBEDDING_DIM, MemoryIndex, embed
+
+class TestMemoryIndex:
+    """Test embedding-based memory recall"""
+
+    def test_recalls_paraphrases(self):
+        agent = AIAgent("Test")
+        agent.add_memory("User asked about deploying FastAPI to AWS")
+        agent.add_memory("User likes pandas dataframes")
+        agent.add_memory("Discussed resume tips for interviews")
+
+        assert [m.content for m in agent.get_relevant_memories("deployment of fastapi apps", 1)] == [
+            "User asked about deploying FastAPI to AWS"]
+        assert agent.get_relevant_memories("dataframe tricks", 1)[0].content == "User likes pandas dataframes"
+        assert agent.get_relevant_memories("quantum chromodynamics") == []
+        assert agent.get_relevant_memories("") == []
+
+    def test_importance_breaks_ties(self):
+        agent = AIAgent("Test")
+        agent.add_memory("User likes python", importance=0.1)
+        agent.add_memory("User likes python", importance=0.9)
+        assert [m.importance for m in agent.get_relevant_memories("python", 2)] == [0.9, 0.1]
+
+    def test_top_k_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        index = MemoryIndex(capacity=4)
+        vectors = rng.normal(size=(500, EMBEDDING_DIM)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        for vector in vectors:
+            index.add(vector, 0.0)
+        query = vectors[42]
+        expected = np.argsort(-(vectors @ query))[:5]
+        assert [row for row, _ in index.search(query, 5, min_similarity=-1)] == expected.tolist()
+        assert len(index.vectors) == 512
+
+    def test_index_follows_memory_list_changes(self):
+        agent = AIAgent("Test")
+        for i in range(101):
+            agent.add_memory(f"note {i} about docker", importance=i / 100)
+        # Trimmed to the 50 most important, and the index rebuilt to match
+        assert len(agent.memory) == 50 and agent.memory_index.size == 50
+        assert all(m.importance >= 0.51 for m in agent.get_relevant_memories("docker notes", 10))
+
+        agent.memory.clear()
+        assert agent.get_relevant_memories("docker") == []
+        agent.memory = [Memory("User enjoys kubernetes", datetime.now(), 0.5, {}, "fact")]
+        assert agent.get_relevant_memories("kubernetes")[0].content == "User enjoys kubernetes"
+
+    def test_memory_mapped_matrix(self, tmp_path):
+        index = MemoryIndex(capacity=2, mmap_dir=str(tmp_path))
+        assert isinstance(index.vectors, np.memmap)
+        for text in ["alpha", "beta", "gamma"]:
+            index.add(embed(text), 0.5)
+        assert len(index.vectors) == 4
+        assert index.search(embed("gamma"), 1)[0][0] == 2
+        path = index.path
+        assert (tmp_path / path.split("/")[-1]).exists()
+        del index
+        gc.collect()
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,105 @@
+import random
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from metrics import LatencyHistogram, MetricsMiddleware, RequestMetrics
+
+class TestLatencyHistogram:
+    """Test histogram recording and percentile accuracy"""
+
+    def test_small_values_are_exact(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 51):
+            histogram.record(value)
+        assert histogram.percentile(50) == 25
+        assert histogram.count == 50
+
+    def test_percentiles_within_relative_error(self):
+        histogram = LatencyHistogram()
+        values = sorted(random.Random(42).randint(100, 5_000_000) for _ in range(10_000))
+        for value in values:
+            histogram.record(value)
+        for percent in (50, 95, 99):
+            exact = values[int(len(values) * percent / 100) - 1]
+            assert abs(histogram.percentile(percent) - exact) / exact < 0.05
+
+    def test_values_above_max_are_clamped(self):
+        histogram = LatencyHistogram(max_value_us=1000)
+        histogram.record(10_000_000)
+        assert histogram.max_us == 1000
+        assert histogram.percentile(99) <= 1000
+
+    def test_empty_summary(self):
+        summary = LatencyHistogram().summary()
+        assert summary["count"] == 0
+        assert summary["p99_ms"] == 0.0
+
+class TestMetricsMiddleware:
+    """Test per-route request recording"""
+
+    def _client(self, metrics: RequestMetrics) -> TestClient:
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: int):
+            if item_id == 0:
+                raise HTTPException(status_code=404, detail="missing")
+            return {"id": item_id}
+
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+        return TestClient(app)
+
+    def test_routes_are_labelled_by_template(self):
+        metrics = RequestMetrics()
+        client = self._client(metrics)
+        for item_id in (1, 2, 3, 0):
+            client.get(f"/items/{item_id}")
+        client.get("/nowhere")
+
+        snapshot = metrics.snapshot()
+        routes = {(r["method"], r["route"]): r for r in snapshot["routes"]}
+        item_route = routes[("GET", "/items/{item_id}")]
+        assert item_route["count"] == 4
+        assert item_route["status_codes"] == {"200": 3, "404": 1}
+        assert ("GET", "unmatched") in routes
+        assert snapshot["in_flight"] == 0
+
+    def test_prometheus_output(self):
+        metrics = RequestMetrics()
+        self._client(metrics).get("/items/1")
+        text = metrics.prometheus()
+        assert 'http_request_duration_seconds{method="GET",route="/items/{item_id}",quantile="0.99"}' in text
+        assert 'http_responses_total{method="GET",route="/items/{item_id}",status="200"} 1' in text
+        assert "http_requests_in_flight 0" in text
+
+    def test_included_routers_are_labelled_with_their_prefix(self):
+        projects, demos = APIRouter(), APIRouter()
+
+        @projects.get("/")
+        async def list_projects():
+            return []
+
+        @projects.get("/{project_id}")
+        async def get_project(project_id: int):
+            return {"id": project_id}
+
+        @demos.get("/")
+        async def list_demos():
+            return []
+
+        app = FastAPI()
+
+        @app.get("/")
+        async def root():
+            return {}
+
+        app.include_router(projects, prefix="/api/projects")
+        app.include_router(demos, prefix="/api/demos")
+        metrics = RequestMetrics()
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+        client = TestClient(app)
+        for path in ("/", "/api/projects/", "/api/projects/1", "/api/demos/"):
+            client.get(path)
+
+        routes = {r["route"]: r["count"] for r in metrics.snapshot()["routes"]}
+        assert routes == {"/": 1, "/api/projects/": 1, "/api/projects/{project_id}": 1, "/api/demos/": 1}
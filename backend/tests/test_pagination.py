@@ -0,0 +1,104 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from models.blog import BlogPost
+from repositories.blog import BlogRepository
+from repositories.pagination import (
+    InvalidCursor, after_position, decode_cursor, encode_cursor, page_sorted
+)
+from repositories.project import ProjectRepository
+import api.routes.blog as blog_routes
+import api.routes.projects as project_routes
+
+def _walk(client, path: str, **filters):
+    """Follow X-Next-Cursor until the last page, returning the pages' ids"""
+    pages, params = [], {**filters, "limit": 2}
+    while True:
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        pages.append([row["id"] for row in response.json()])
+        next_cursor = response.headers.get("x-next-cursor")
+        if next_cursor is None:
+            assert "link" not in response.headers
+            return pages
+        assert 'rel="next"' in response.headers["link"]
+        params = {**filters, "limit": 2, "cursor": next_cursor}
+
+class TestCursor:
+    """Test opaque cursor encoding"""
+
+    def test_round_trip(self):
+        created_at = datetime(2026, 10, 19, 8, 30, 15, 123456, tzinfo=timezone.utc)
+        cursor = encode_cursor(created_at, 42)
+        assert "=" not in cursor and "42" not in cursor
+        assert decode_cursor(cursor) == (created_at, 42)
+
+    def test_rejects_garbage(self):
+        for cursor in ("not-a-cursor", encode_cursor(datetime.now(), 1)[:-3], "W10"):
+            with pytest.raises(InvalidCursor):
+                decode_cursor(cursor)
+
+    def test_page_sorted_uses_position(self):
+        base = datetime(2026, 1, 1)
+        rows = [{"id": i, "created_at": base} for i in range(1, 6)]
+        page, next_cursor = page_sorted(rows, None, 2)
+        assert [row["id"] for row in page] == [1, 2]
+        page, next_cursor = page_sorted(rows, decode_cursor(next_cursor), 2)
+        assert [row["id"] for row in page] == [3, 4]
+        page, next_cursor = page_sorted(rows, decode_cursor(next_cursor), 2)
+        assert [row["id"] for row in page] == [5] and next_cursor is None
+
+    def test_naive_and_aware_timestamps_compare(self):
+        naive = datetime(2026, 1, 1, 12)
+        rows = [{"id": 1, "created_at": naive}, {"id": 2, "created_at": naive.replace(tzinfo=timezone.utc)},
+                {"id": 3, "created_at": datetime(2026, 1, 2)}]
+        page, next_cursor = page_sorted(rows, None, 1)
+        assert decode_cursor(next_cursor)[0].tzinfo is not None
+        page, next_cursor = page_sorted(rows, decode_cursor(next_cursor), 2)
+        assert [row["id"] for row in page] == [2, 3]
+        page, _ = page_sorted(rows, (naive, 2), 2)
+        assert [row["id"] for row in page] == [3]
+
+    def test_postgres_predicate_is_a_row_comparison(self):
+        stmt = select(BlogPost.id).where(after_position(BlogPost, (datetime(2026, 1, 1), 7)))
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "(blog_posts.created_at, blog_posts.id) > (" in sql
+        index_columns = {
+            index.name: [column.name for column in index.columns] for index in BlogPost.__table__.indexes
+        }
+        assert index_columns["ix_blog_posts_created_at_id"] == ["created_at", "id"]
+
+class TestKeysetPagination:
+    """Test cursor pagination on list endpoints"""
+
+    def test_blog_pages(self, blog_sessions, make_blog_client):
+        client = make_blog_client(BlogRepository(blog_sessions, seed=blog_routes.sample_posts))
+        for i in range(2):
+            client.post("/api/blog", json={
+                "title": f"Post {i}", "content": "Body", "excerpt": "", "author": "Divyansh", "tags": ["python"],
+            })
+        pages = _walk(client, "/api/blog")
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [post_id for page in pages for post_id in page] == [1, 2, 3, 4, 5]
+
+        assert [len(page) for page in _walk(client, "/api/blog", tag="python")] == [2, 2, 1]
+        assert _walk(client, "/api/blog", tag="nlp") == [[3]]
+        assert client.get("/api/blog", params={"cursor": "bogus"}).status_code == 400
+        assert client.get("/api/blog", params={"limit": 0}).status_code == 422
+
+    def test_blog_pages_from_seed_when_database_is_down(self, unreachable_sessions, make_blog_client):
+        client = make_blog_client(BlogRepository(unreachable_sessions, seed=blog_routes.sample_posts))
+        assert _walk(client, "/api/blog") == [[1, 2], [3]]
+
+    def test_project_pages(self, project_sessions, make_client):
+        client = make_client(ProjectRepository(project_sessions, seed=project_routes.sample_projects))
+        client.get("/api/projects")
+        client.post("/api/projects", json={
+            "title": "Forecasting", "description": "Time series", "technologies": ["Prophet"], "category": "nlp",
+        })
+        assert _walk(client, "/api/projects") == [[1, 2], [3, 4]]
+        assert _walk(client, "/api/projects", category="nlp") == [[2, 4]]
+        assert client.get("/api/projects", params={"cursor": "bogus"}).status_code == 400
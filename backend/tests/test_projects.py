@@ -0,0 +1,72 @@
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from repositories.project import ProjectRepository
+import api.routes.projects as project_routes
+
+class TestProjectRoutes:
+    """Test DB-backed project routes and their read model"""
+
+    def test_seeds_empty_table_and_indexes(self, project_sessions, make_client):
+        repository = ProjectRepository(project_sessions, seed=project_routes.sample_projects)
+        client = make_client(repository)
+
+        projects = client.get("/api/projects").json()
+        assert [p["title"] for p in projects] == [p["title"] for p in project_routes.sample_projects]
+
+        first_id = projects[0]["id"]
+        assert client.get(f"/api/projects/{first_id}").json()["title"] == projects[0]["title"]
+        assert client.get("/api/projects/9999").status_code == 404
+
+        nlp = client.get("/api/projects?category=nlp").json()
+        assert [p["category"] for p in nlp] == ["nlp"]
+        featured = client.get("/api/projects?featured=true").json()
+        assert all(p["featured"] for p in featured) and len(featured) == 1
+
+        categories = client.get("/api/projects/categories/list").json()["categories"]
+        assert categories == sorted({p["category"] for p in project_routes.sample_projects})
+
+    def test_create_refreshes_read_model_and_persists(self, project_sessions, make_client):
+        client = make_client(ProjectRepository(project_sessions, seed=project_routes.sample_projects))
+        client.get("/api/projects")
+
+        response = client.post("/api/projects", json={
+            "title": "Recommendation Engine",
+            "description": "Collaborative filtering",
+            "technologies": ["Python", "PyTorch"],
+            "category": "recommender-systems",
+        })
+        assert response.status_code == 200
+        created = response.json()
+        assert client.get(f"/api/projects/{created['id']}").json()["title"] == "Recommendation Engine"
+        assert "recommender-systems" in client.get("/api/projects/categories/list").json()["categories"]
+
+        # A fresh repository (another worker or a restart) sees the same rows
+        restarted = make_client(ProjectRepository(project_sessions, seed=project_routes.sample_projects))
+        assert len(restarted.get("/api/projects").json()) == len(project_routes.sample_projects) + 1
+
+    def test_serves_seed_when_database_is_down(self, unreachable_sessions, make_client):
+        client = make_client(ProjectRepository(unreachable_sessions, seed=project_routes.sample_projects))
+        assert len(client.get("/api/projects").json()) == len(project_routes.sample_projects)
+        assert client.get("/api/projects/1").status_code == 200
+
+        response = client.post("/api/projects", json={
+            "title": "New", "description": "New", "technologies": [], "category": "nlp",
+        })
+        assert response.status_code == 503
+
+    def test_concurrent_workers_seed_once(self, project_sessions):
+        # One engine per worker, all on the same database file
+        workers = [
+            ProjectRepository(async_sessionmaker(create_async_engine(project_sessions.kw["bind"].url),
+                                                 class_=AsyncSession, expire_on_commit=False),
+                              seed=project_routes.sample_projects)
+            for _ in range(4)
+        ]
+
+        async def run():
+            return await asyncio.gather(*(worker.refresh() for worker in workers))
+
+        models = asyncio.run(run())
+        assert {len(model.all) for model in models} == {len(project_routes.sample_projects)}
+
@@ -0,0 +1,202 @@
+import math
+import time
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from ratelimit import BucketTable, RateLimitMiddleware, RateLimitRule, rate_limiters
+from main import app as main_app
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def _rules():
+    return [
+        RateLimitRule("chat", ("/chat",), ip=BucketTable(1, 3), session=BucketTable(1, 2), session_from_body=True),
+        RateLimitRule("demos", ("/demo",), ip=BucketTable(0.5, 2), session=BucketTable(0.5, 2)),
+    ]
+
+def _client(clock=None, **options):
+    app = FastAPI()
+    options.setdefault("max_in_flight", 100)
+    options.setdefault("max_loop_lag", 10.0)
+    app.add_middleware(RateLimitMiddleware, rules=options.pop("rules", None) or _rules(),
+                       enabled=options.pop("enabled", True), trust_forwarded_for=True,
+                       clock=clock or FakeClock(), **options)
+
+    @app.post("/chat")
+    async def chat(request: Request):
+        return {"echo": await request.json()}
+
+    @app.post("/demo")
+    async def demo():
+        return {"ok": True}
+
+    @app.get("/chat")
+    async def chat_history():
+        return {"history": []}
+
+    @app.post("/cheap")
+    async def cheap():
+        return {"ok": True}
+
+    return TestClient(app)
+
+class TestBucketTable:
+    """Lazy token-bucket refill and retry hints"""
+
+    def test_burst_then_retry_after(self):
+        table = BucketTable(rate=2, burst=3)
+        assert [table.take("a", 0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert table.take("a", 0.0) == pytest.approx(0.5)
+        assert table.take("a", 0.5) == 0.0
+
+    def test_refill_is_capped_at_burst(self):
+        table = BucketTable(rate=1, burst=2)
+        table.take("a", 0.0)
+        table.take("a", 0.0)
+        assert table.take("a", 100.0) == 0.0
+        assert table.take("a", 100.0) == 0.0
+        assert table.take("a", 100.0) > 0
+
+    def test_keys_are_independent_and_bounded(self):
+        table = BucketTable(rate=1, burst=1, max_keys=2)
+        assert table.take("a", 0.0) == 0.0
+        assert table.take("b", 0.0) == 0.0
+        assert table.take("a", 0.0) > 0
+        table.take("c", 0.0)
+        assert len(table) == 2
+
+    def test_zero_rate_never_refills(self):
+        table = BucketTable(rate=0, burst=1)
+        table.take("a", 0.0)
+        assert math.isinf(table.take("a", 10.0))
+
+class TestRateLimitMiddleware:
+    """429 and 503 responses on limited routes only"""
+
+    def test_ip_limit_returns_429_with_retry_after(self):
+        clock = FakeClock()
+        client = _client(clock)
+        for _ in range(2):
+            assert client.post("/demo").status_code == 200
+        response = client.post("/demo")
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "2"
+        assert response.json() == {"detail": "Too many requests"}
+
+        clock.now += 2
+        assert client.post("/demo").status_code == 200
+
+    def test_routes_have_separate_budgets(self):
+        client = _client()
+        for _ in range(2):
+            client.post("/demo")
+        assert client.post("/demo").status_code == 429
+        assert client.post("/chat", json={"message": "hi"}).status_code == 200
+
+    def test_clients_are_limited_by_ip(self):
+        client = _client()
+        for _ in range(2):
+            client.post("/demo", headers={"X-Forwarded-For": "10.0.0.1"})
+        assert client.post("/demo", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 429
+        assert client.post("/demo", headers={"X-Forwarded-For": "10.0.0.2, 10.0.0.9"}).status_code == 200
+
+    def test_session_header_and_cookie(self):
+        client = _client()
+        assert client.post("/demo", headers={"X-Session-ID": "s1"}).status_code == 200
+        assert client.post("/demo", headers={"Cookie": "theme=dark; session_id=s1"}).status_code == 200
+        response = client.post("/demo", headers={"X-Session-ID": "s1", "X-Forwarded-For": "10.0.0.3"})
+        assert response.status_code == 429
+
+    def test_session_from_chat_body_is_replayed_to_route(self):
+        client = _client()
+        for i in range(2):
+            response = client.post("/chat", json={"message": f"hi {i}", "session_id": "abc"},
+                                   headers={"X-Forwarded-For": f"10.0.1.{i}"})
+            assert response.status_code == 200
+            assert response.json() == {"echo": {"message": f"hi {i}", "session_id": "abc"}}
+        response = client.post("/chat", json={"message": "again", "session_id": "abc"},
+                               headers={"X-Forwarded-For": "10.0.1.9"})
+        assert response.status_code == 429
+
+    def test_unlimited_routes_and_methods_pass_through(self):
+        client = _client()
+        for _ in range(10):
+            assert client.post("/cheap").status_code == 200
+            assert client.get("/chat").status_code == 200
+
+    def test_sheds_when_in_flight_limit_reached(self):
+        client = _client(max_in_flight=0)
+        response = client.post("/demo")
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        assert client.post("/cheap").status_code == 200
+
+    def test_sheds_on_event_loop_lag(self):
+        client = _client(max_loop_lag=0.05)
+        assert client.post("/demo").status_code == 200
+
+        limiter = next(limiter for limiter in list(rate_limiters) if limiter.max_loop_lag == 0.05)
+        limiter.lag_monitor._lag = 0.2
+        limiter.lag_monitor._sampled_at = time.monotonic()
+        assert client.post("/demo").status_code == 503
+
+    def test_disabled_passes_everything(self):
+        client = _client(enabled=False)
+        for _ in range(10):
+            assert client.post("/demo").status_code == 200
+
+    def test_stats(self):
+        rules = _rules()
+        client = _client(max_in_flight=0, rules=rules)
+        client.post("/demo")
+        limiter = next(limiter for limiter in list(rate_limiters) if limiter.rules is rules)
+        stats = limiter.stats()
+        assert stats["rules"]["demos"]["shed"] == 1
+        assert stats["rules"]["chat"] == {"limited": 0, "shed": 0, "tracked_ips": 0, "tracked_sessions": 0}
+
+    def test_bucket_that_never_refills_caps_retry_after(self):
+        rules = [RateLimitRule("demos", ("/demo",), ip=BucketTable(0, 1), session=BucketTable(0, 1))]
+        client = _client(rules=rules)
+        client.post("/demo")
+        response = client.post("/demo")
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "3600"
+
+def _main_rate_limiter() -> RateLimitMiddleware:
+    TestClient(main_app).get("/api/health")
+    layer = main_app.middleware_stack
+    while not isinstance(layer, RateLimitMiddleware):
+        layer = layer.app
+    return layer
+
+class TestMainAppRateLimits:
+    """Rate-limit responses as the browser frontend sees them"""
+
+    ORIGIN = {"Origin": "http://localhost:3000"}
+
+    def test_429_carries_cors_headers(self, monkeypatch):
+        limiter = _main_rate_limiter()
+        monkeypatch.setattr(limiter, "rules", [
+            RateLimitRule("chat", ("/api/chatbot/chat",), ip=BucketTable(0.001, 1), session=BucketTable(1, 1)),
+        ])
+        client = TestClient(main_app)
+        client.post("/api/chatbot/chat", json={"message": "hi"}, headers=self.ORIGIN)
+        response = client.post("/api/chatbot/chat", json={"message": "hi"}, headers=self.ORIGIN)
+        assert response.status_code == 429
+        assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+        assert "retry-after" in response.headers["access-control-expose-headers"].lower()
+        assert int(response.headers["retry-after"]) >= 1
+
+    def test_503_carries_cors_headers(self, monkeypatch):
+        monkeypatch.setattr(_main_rate_limiter(), "max_in_flight", 0)
+        response = TestClient(main_app).post("/api/demos/sentiment-analysis", json={"text": "great"},
+                                             headers=self.ORIGIN)
+        assert response.status_code == 503
+        assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
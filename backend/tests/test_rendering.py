@@ -0,0 +1,68 @@
+import pytest
+
+import rendering
+from rendering import _render_basic, make_excerpt, plain_text, render_markdown, render_post, safe_url
+
+UNSAFE_POST = (
+    "<script>alert(1)</script>\n\n"
+    "Hi <img src=x onerror=alert(1)> [a](javascript:alert(1)) [b](JaVa&#09;script:alert(1)) "
+    "[c](/posts/next) [d](https://x.dev) [e](mailto:me@x.dev) ![f](data:text/html,boom)"
+)
+
+class TestRendering:
+    """Test write-time rendering of blog content"""
+
+    def test_basic_markdown(self):
+        html = _render_basic(
+            "# Title\n\nSome **bold** and *soft* text with `code` and [a link](https://x.dev).\n\n"
+            "- one\n- two\n\n```\nx = 1 < 2\n```"
+        )
+        assert "<h1>Title</h1>" in html
+        assert "<strong>bold</strong>" in html and "<em>soft</em>" in html
+        assert "<code>code</code>" in html
+        assert '<a href="https://x.dev">a link</a>' in html
+        assert "<ul><li>one</li><li>two</li></ul>" in html
+        assert "<pre><code>x = 1 &lt; 2</code></pre>" in html
+
+    def test_escapes_raw_html(self):
+        assert "<script>" not in _render_basic("<script>alert(1)</script>")
+
+    def test_safe_url(self):
+        for url in ("/p", "p/q", "#top", "?page=2", "https://x.dev", "HTTP://x.dev", "mailto:me@x.dev", "a/b:c"):
+            assert safe_url(url) == url
+        for url in ("javascript:alert(1)", " JavaScript:x", "java\tscript:x", "javascript&#58;x", "data:text/html,x",
+                    "vbscript:x"):
+            assert safe_url(url) is None
+
+    def _assert_sanitized(self, html):
+        assert "<script" not in html and "<img src=x" not in html
+        assert "&lt;script&gt;" in html
+        assert "javascript" not in html.lower() and "data:" not in html
+        assert 'href="/posts/next"' in html
+        assert 'href="https://x.dev"' in html
+        assert 'href="mailto:me@x.dev"' in html
+
+    def test_basic_renderer_sanitizes_post(self, monkeypatch):
+        monkeypatch.setattr(rendering, "_markdown", None)
+        self._assert_sanitized(render_post(UNSAFE_POST)["content_html"])
+        assert 'href="a&quot;onmouseover' in _render_basic('[x](a"onmouseover="alert(1))')
+
+    def test_markdown_renderer_sanitizes_post(self):
+        pytest.importorskip("markdown")
+        html = render_post(UNSAFE_POST)["content_html"]
+        self._assert_sanitized(html)
+        assert "&lt;img src=x onerror=alert(1)&gt;" in html
+        assert "<table>" in render_markdown("|a|b|\n|-|-|\n|1|2|")
+
+    def test_plain_text_and_excerpt(self):
+        assert plain_text("## Intro\n\nRead **this** [post](/p)") == "Intro Read this post"
+        excerpt = make_excerpt("word " * 100, max_chars=22)
+        assert excerpt == "word word word word…"
+
+    def test_render_post(self):
+        rendered = render_post("# Heading\n\n" + "token " * 450)
+        assert rendered["word_count"] == 451
+        assert rendered["read_time"] == 3
+        assert rendered["excerpt"].startswith("Heading token")
+        assert render_post("Short", excerpt="Given")["excerpt"] == "Given"
+        assert render_post("")["read_time"] == 1
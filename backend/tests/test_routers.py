@@ -0,0 +1,157 @@
+import sys
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.routing import NoMatchFound
+
+from routers import RouterRegistry, stub_router
+
+GOOD_MODULE = '''
+from fastapi import APIRouter
+
+router = APIRouter()
+
+@router.get("/")
+async def index():
+    return {"module": __name__}
+
+@router.get("/items/{item_id}")
+async def item(item_id: int):
+    return {"item": item_id}
+'''
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch):
+    """Write route modules under unique names into a package on sys.path"""
+    package = f"routes_{uuid.uuid4().hex[:8]}"
+    (tmp_path / package).mkdir()
+    (tmp_path / package / "__init__.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    def write(name: str, source: str) -> str:
+        (tmp_path / package / f"{name}.py").write_text(source)
+        return f"{package}.{name}"
+
+    yield write
+    for name in [m for m in sys.modules if m.startswith(package)]:
+        del sys.modules[name]
+
+class TestRouterRegistry:
+    """Independent, timed and optionally lazy route module imports"""
+
+    def test_broken_module_does_not_disable_others(self, modules):
+        registry = RouterRegistry()
+        registry.register("good", modules("good", GOOD_MODULE), "/api/good")
+        registry.register("broken", modules("broken", "import does_not_exist\n"), "/api/broken",
+                          fallback=lambda: stub_router("get", "/", {"broken": True}))
+        registry.register("missing", "no.such.module", "/api/missing")
+        app = FastAPI()
+        registry.mount(app)
+        client = TestClient(app)
+
+        assert client.get("/api/good/items/3").json() == {"item": 3}
+        assert client.get("/api/broken/").json() == {"broken": True}
+        assert client.get("/api/missing/").status_code == 404
+
+        snapshot = registry.snapshot()
+        assert snapshot["good"]["status"] == "loaded"
+        assert snapshot["good"]["routes"] == 2
+        assert snapshot["good"]["import_ms"] >= 0
+        assert snapshot["broken"]["status"] == "fallback"
+        assert "ModuleNotFoundError" in snapshot["broken"]["error"]
+        assert snapshot["missing"]["status"] == "failed"
+
+    def test_lazy_module_is_imported_on_first_request(self, modules):
+        module = modules("heavy", GOOD_MODULE)
+        registry = RouterRegistry()
+        registry.register("heavy", module, "/api/heavy", lazy=True)
+        app = FastAPI()
+
+        @app.get("/api/other")
+        async def other():
+            return {"ok": True}
+
+        registry.mount(app)
+        client = TestClient(app)
+
+        assert client.get("/api/other").json() == {"ok": True}
+        assert module not in sys.modules
+        assert registry.snapshot()["heavy"]["status"] == "pending"
+        assert registry.snapshot()["heavy"]["import_ms"] is None
+
+        assert client.get("/api/heavy/items/7").json() == {"item": 7}
+        assert module in sys.modules
+        snapshot = registry.snapshot()["heavy"]
+        assert snapshot["status"] == "loaded"
+        assert snapshot["import_ms"] is not None
+        assert client.get("/api/heavy/").json() == {"module": module}
+        assert "/api/heavy/items/{item_id}" in app.openapi()["paths"]
+
+    def test_lazy_prefix_does_not_capture_similar_paths(self, modules):
+        module = modules("lazy", GOOD_MODULE)
+        registry = RouterRegistry()
+        registry.register("lazy", module, "/api/lazy", lazy=True)
+        app = FastAPI()
+        registry.mount(app)
+        client = TestClient(app)
+
+        assert client.get("/api/lazyish").status_code == 404
+        assert module not in sys.modules
+
+    def test_url_path_for_works_before_lazy_load(self, modules):
+        module = modules("later", GOOD_MODULE)
+        registry = RouterRegistry()
+        registry.register("later", module, "/api/later", lazy=True)
+        app = FastAPI()
+        registry.mount(app)
+
+        @app.get("/api/health")
+        async def health_check():
+            return {"ok": True}
+
+        assert app.url_path_for("health_check") == "/api/health"
+        with pytest.raises(NoMatchFound):
+            app.url_path_for("item", item_id=1)
+
+        TestClient(app).get("/api/later/")
+        assert app.url_path_for("item", item_id=1) == "/api/later/items/1"
+        assert app.url_path_for("health_check") == "/api/health"
+
+    def test_openapi_schema_loads_pending_modules(self, modules):
+        module = modules("documented", GOOD_MODULE)
+        registry = RouterRegistry()
+        registry.register("documented", module, "/api/documented", lazy=True)
+        app = FastAPI()
+        registry.mount(app)
+        client = TestClient(app)
+
+        paths = client.get("/openapi.json").json()["paths"]
+        assert "/api/documented/items/{item_id}" in paths
+        assert registry.snapshot()["documented"]["status"] == "loaded"
+        assert client.get("/api/documented/items/2").json() == {"item": 2}
+
+    def test_lazy_module_failure_serves_fallback(self, modules):
+        registry = RouterRegistry()
+        registry.register("bad", modules("bad", "raise RuntimeError('boom')\n"), "/api/bad", lazy=True,
+                          fallback=lambda: stub_router("get", "/", {"bad": "stub"}))
+        app = FastAPI()
+        registry.mount(app)
+        client = TestClient(app)
+
+        assert client.get("/api/bad/").json() == {"bad": "stub"}
+        assert registry.snapshot()["bad"]["error"] == "RuntimeError: boom"
+
+class TestDebugRouters:
+    """Registry status reported by the application"""
+
+    def test_debug_endpoint_reports_each_module(self):
+        from main import app
+
+        routers = TestClient(app).get("/api/debug/routers").json()["routers"]
+        assert set(routers) == {"projects", "demos", "blog", "analytics", "chatbot", "contact"}
+        assert routers["projects"]["status"] == "loaded"
+        assert routers["contact"]["status"] == "fallback"
+        for name in ("projects", "blog", "analytics", "chatbot"):
+            assert routers[name]["import_ms"] is not None
@@ -0,0 +1,66 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from benchmarks.serialization import default_path, project_list_payload
+from api.routes.projects import Project
+from main import app
+from serialization import FastJSONResponse, dumps, loads, trusted
+
+class Item(BaseModel):
+    name: str
+
+class TestSerialization:
+    """Test the orjson response path"""
+
+    def test_dumps_handles_app_types(self):
+        payload = {
+            "when": datetime(2026, 10, 19, 8, 30, tzinfo=timezone.utc),
+            "array": np.arange(3),
+            "matrix": np.eye(2),
+            "scalar": np.float32(0.5),
+            "count": np.int64(7),
+            "price": Decimal("1.25"),
+            "tags": {"ml"},
+            "item": Item(name="x"),
+            1: "int key",
+        }
+        assert loads(dumps(payload)) == {
+            "when": "2026-10-19T08:30:00+00:00",
+            "array": [0, 1, 2],
+            "matrix": [[1.0, 0.0], [0.0, 1.0]],
+            "scalar": 0.5,
+            "count": 7,
+            "price": 1.25,
+            "tags": ["ml"],
+            "item": {"name": "x"},
+            "1": "int key",
+        }
+
+    def test_matches_default_encoder_output(self):
+        rows = project_list_payload(copies=2)
+        assert json.loads(dumps(rows)) == json.loads(default_path(List[Project])(rows))
+
+    def test_default_response_class(self):
+        assert app.router.default_response_class is FastJSONResponse
+
+    def test_trusted_skips_response_model_validation(self):
+        test_app = FastAPI(default_response_class=FastJSONResponse)
+
+        @test_app.get("/validated", response_model=Item)
+        async def validated():
+            return {"name": "x", "extra": np.int64(1)}
+
+        @test_app.get("/trusted", response_model=Item)
+        async def trusted_route():
+            return trusted({"name": "x", "extra": np.int64(1)})
+
+        client = TestClient(test_app)
+        assert client.get("/validated").json() == {"name": "x"}
+        assert client.get("/trusted").json() == {"name": "x", "extra": 1}
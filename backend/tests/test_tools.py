@@ -0,0 +1,180 @@
+import asyncio
+import threading
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ai_agent.calculator import ExpressionError, evaluate
+from ai_agent.tools import ToolRegistry, execute_tool, tool_registry
+from cache import TTLCache
+import api.routes.chatbot as chatbot_routes
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = ToolRegistry()
+    monkeypatch.setattr("ai_agent.tools.tool_registry", registry)
+    return registry
+
+class TestTools:
+    """Test the async tool executor"""
+
+    def test_sync_tools_run_off_the_event_loop(self, registry):
+        threads = []
+        registry.register_tool("where", lambda: threads.append(threading.current_thread().name) or {"ok": True},
+                               "Thread name", {})
+
+        async def run():
+            return await execute_tool("where"), threading.current_thread().name
+
+        result, loop_thread = asyncio.run(run())
+        assert result == {"ok": True}
+        assert threads and threads[0] != loop_thread
+
+    def test_async_tools_are_awaited(self, registry):
+        async def echo(text: str):
+            await asyncio.sleep(0)
+            return {"text": text}
+
+        tool = registry.register_tool("echo", echo, "Echo", {"text": "string"})
+        assert tool.is_async
+        assert asyncio.run(execute_tool("echo", text="hi")) == {"text": "hi"}
+
+    def test_timeout_returns_error(self, registry):
+        async def slow():
+            await asyncio.sleep(1)
+
+        registry.register_tool("slow", slow, "Slow", {}, timeout=0.05)
+        result = asyncio.run(execute_tool("slow"))
+        assert "timed out" in result["error"]
+        assert registry.get_tool("slow").stats()["timeouts"] == 1
+
+    def test_timed_out_thread_keeps_its_slot(self, registry):
+        release = threading.Event()
+        registry.register_tool("stuck", lambda: release.wait(1) and {}, "Stuck", {},
+                               timeout=0.05, max_concurrency=1)
+        tool = registry.get_tool("stuck")
+
+        async def run():
+            first = await execute_tool("stuck")
+            # The worker thread is still running, so the only slot stays taken
+            in_flight = tool.stats()["in_flight"]
+            second = await execute_tool("stuck")
+            release.set()
+            while tool.stats()["in_flight"]:
+                await asyncio.sleep(0.01)
+            return first, in_flight, second
+
+        first, in_flight, second = asyncio.run(run())
+        assert "timed out" in first["error"] and "timed out" in second["error"]
+        assert in_flight == 1
+        assert tool.stats()["latency"]["count"] == 1
+
+    def test_concurrency_is_capped(self, registry):
+        running = peak = 0
+
+        async def work():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {}
+
+        registry.register_tool("work", work, "Work", {}, max_concurrency=2)
+
+        async def run():
+            await asyncio.gather(*(execute_tool("work") for _ in range(8)))
+
+        asyncio.run(run())
+        assert peak == 2
+        assert registry.get_tool("work").stats()["latency"]["count"] == 8
+
+    def test_results_are_cached_per_arguments(self, registry):
+        calls = []
+        registry.register_tool("lookup", lambda city: calls.append(city) or {"city": city}, "Lookup",
+                               {"city": "string"}, cache_ttl=60)
+
+        async def run():
+            await asyncio.gather(*(execute_tool("lookup", city="Pune") for _ in range(5)))
+            await execute_tool("lookup", city="Pune")
+            await execute_tool("lookup", city="Delhi")
+
+        asyncio.run(run())
+        assert calls == ["Pune", "Delhi"]
+        assert registry.get_tool("lookup").stats()["cache"]["hits"] >= 1
+
+    def test_errors_are_not_cached(self, registry):
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            raise RuntimeError("down")
+
+        registry.register_tool("flaky", flaky, "Flaky", {}, cache_ttl=60)
+        for _ in range(2):
+            assert "down" in asyncio.run(execute_tool("flaky"))["error"]
+        assert len(calls) == 2
+        assert registry.get_tool("flaky").stats()["errors"] == 2
+
+    def test_default_tools_and_endpoints(self):
+        app = FastAPI()
+        app.include_router(chatbot_routes.router, prefix="/api/chatbot")
+        client = TestClient(app)
+        response = client.post("/api/chatbot/tools/execute",
+                               json={"tool_name": "get_weather", "parameters": {"city": "Paris"}})
+        assert response.json()["city"] == "Paris"
+        assert client.post("/api/chatbot/tools/execute", json={"tool_name": "missing"}).json()["error"]
+        metrics = {tool["name"]: tool for tool in client.get("/api/chatbot/tools/metrics").json()["tools"]}
+        assert metrics["get_weather"]["cache"]["ttl_seconds"] == 600
+        assert metrics["get_weather"]["calls"] >= 1
+        assert tool_registry.get_tool("get_time_info").cache is None
+
+class TestTTLCache:
+    """Test the expiring LRU cache"""
+
+    def test_entries_expire(self):
+        now = [0.0]
+        cache = TTLCache(ttl=10, clock=lambda: now[0])
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+        now[0] = 10
+        assert cache.get("a") is None
+        assert cache.stats() == {"entries": 0, "ttl_seconds": 10, "hits": 1, "misses": 1}
+
+    def test_lru_bound(self):
+        cache = TTLCache(ttl=10, max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert cache.get("b") is None and cache.get("a") == 1
+
+class TestCalculator:
+    """Test the bounded expression evaluator"""
+
+    @pytest.mark.parametrize("expression, expected", [
+        ("2 + 2 * 3", 8), ("(1 + 2) / 4", 0.75), ("-3 ** 2", -9), ("2 ** -1", 0.5), ("7 // 2", 3), ("2 ** 10", 1024),
+    ])
+    def test_arithmetic(self, expression, expected):
+        assert evaluate(expression) == expected
+
+    @pytest.mark.parametrize("expression", [
+        "9**9**9", "2 ** 100000", "10 ** 100 * 10 ** 100", "1e308 * 10", "1 / 0", "1" + "+1" * 100,
+        "__import__('os')", "(1).__class__", "x + 1", "9" * 300,
+    ])
+    def test_rejects_hostile_input_quickly(self, expression):
+        start = time.perf_counter()
+        with pytest.raises(ExpressionError):
+            evaluate(expression)
+        assert time.perf_counter() - start < 0.1
+
+    def test_tool_reports_errors(self):
+        assert asyncio.run(execute_tool("calculate", expression="9**9**9"))["error"].startswith("Calculation error")
+        assert asyncio.run(execute_tool("calculate", expression="6 * 7"))["result"] == 42
+
+    def test_repeated_expressions_are_cached(self):
+        evaluate.cache_clear()
+        evaluate("40 + 2")
+        evaluate("40 + 2")
+        assert evaluate.cache_info().hits == 1